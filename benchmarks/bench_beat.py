@@ -0,0 +1,30 @@
+'''
+Benchmarks for mir_eval.beat
+'''
+
+import mir_eval
+
+from .synthetic import event_pair
+
+
+class Beat(object):
+    params = [100, 500, 2000]
+    param_names = ['n_events']
+
+    def setup(self, n_events):
+        self.reference, self.estimated = event_pair(n_events)
+
+    def time_evaluate(self, n_events):
+        mir_eval.beat.evaluate(self.reference, self.estimated)
+
+    def peakmem_evaluate(self, n_events):
+        mir_eval.beat.evaluate(self.reference, self.estimated)
+
+    def time_continuity(self, n_events):
+        mir_eval.beat.continuity(self.reference, self.estimated)
+
+    def time_information_gain(self, n_events):
+        mir_eval.beat.information_gain(self.reference, self.estimated)
+
+    def time_p_score(self, n_events):
+        mir_eval.beat.p_score(self.reference, self.estimated)
@@ -0,0 +1,32 @@
+'''
+Benchmarks for mir_eval.chord
+'''
+
+import mir_eval
+
+from .synthetic import labeled_interval_pair, CHORD_LABELS
+
+
+class Chord(object):
+    params = [100, 1000, 5000]
+    param_names = ['n_intervals']
+
+    def setup(self, n_intervals):
+        (self.ref_intervals, self.ref_labels,
+         self.est_intervals, self.est_labels) = labeled_interval_pair(
+             n_intervals, labels=CHORD_LABELS)
+
+    def time_evaluate(self, n_intervals):
+        mir_eval.chord.evaluate(self.ref_intervals, self.ref_labels,
+                                self.est_intervals, self.est_labels)
+
+    def peakmem_evaluate(self, n_intervals):
+        mir_eval.chord.evaluate(self.ref_intervals, self.ref_labels,
+                                self.est_intervals, self.est_labels)
+
+    def time_encode_many(self, n_intervals):
+        mir_eval.chord.encode_many(self.ref_labels)
+
+    def time_directional_hamming_distance(self, n_intervals):
+        mir_eval.chord.directional_hamming_distance(self.ref_intervals,
+                                                    self.est_intervals)
@@ -0,0 +1,33 @@
+'''
+Benchmarks for the import time of mir_eval and its submodules
+'''
+
+import os
+import subprocess
+import sys
+
+import mir_eval
+
+
+class Import(object):
+    # '' only starts the interpreter, as a baseline
+    params = ['', 'mir_eval', 'mir_eval.beat', 'mir_eval.onset',
+              'mir_eval.melody', 'mir_eval.segment', 'mir_eval.separation']
+    param_names = ['module']
+    timeout = 120
+
+    def setup(self, module):
+        self.env = dict(os.environ)
+        self.env['PYTHONPATH'] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(mir_eval.__file__))] +
+            [p for p in [os.environ.get('PYTHONPATH')] if p])
+        if module in ('', 'mir_eval'):
+            self.code = 'import {}'.format(module or 'sys')
+        else:
+            # Attribute access, as in ``import mir_eval; mir_eval.beat``
+            self.code = 'import mir_eval; {}'.format(module)
+
+    def time_import(self, module):
+        # Run each import in a fresh interpreter
+        subprocess.check_call([sys.executable, '-c', self.code],
+                              env=self.env)
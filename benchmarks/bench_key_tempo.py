@@ -0,0 +1,46 @@
+'''
+Benchmarks for mir_eval.key and mir_eval.tempo
+'''
+
+import numpy as np
+import mir_eval
+
+
+class KeyTempo(object):
+    params = [100, 1000, 10000]
+    param_names = ['n_tracks']
+
+    def setup(self, n_tracks):
+        rng = np.random.RandomState(0)
+        tonics = ['C', 'C#', 'D', 'Eb', 'E', 'F', 'F#', 'G', 'Ab', 'A', 'Bb',
+                  'B']
+        modes = ['major', 'minor']
+        self.keys = [('{} {}'.format(tonics[rng.randint(12)],
+                                     modes[rng.randint(2)]),
+                      '{} {}'.format(tonics[rng.randint(12)],
+                                     modes[rng.randint(2)]))
+                     for _ in range(n_tracks)]
+        reference = np.sort(rng.uniform(60, 180, (n_tracks, 2)), axis=1)
+        estimated = reference * rng.choice([.5, 1., 1.02, 2., 3.],
+                                           (n_tracks, 2))
+        weights = rng.rand(n_tracks)
+        self.tempi = list(zip(reference, weights, estimated))
+
+    def time_key_evaluate(self, n_tracks):
+        for reference, estimated in self.keys:
+            mir_eval.key.evaluate(reference, estimated)
+
+    def time_tempo_evaluate(self, n_tracks):
+        for reference, weight, estimated in self.tempi:
+            mir_eval.tempo.evaluate(reference, weight, estimated)
+
+    def time_key_batch(self, n_tracks):
+        reference, estimated = zip(*self.keys)
+        mir_eval.key.weighted_score_batch(
+            *(mir_eval.key.encode_keys(reference) +
+              mir_eval.key.encode_keys(estimated)))
+
+    def time_tempo_batch(self, n_tracks):
+        reference, weights, estimated = zip(*self.tempi)
+        mir_eval.tempo.detection_batch(np.array(reference), np.array(weights),
+                                       np.array(estimated))
@@ -0,0 +1,70 @@
+'''
+Benchmarks for mir_eval.melody
+'''
+
+import numpy as np
+
+import mir_eval
+
+from .synthetic import melody_pair
+
+
+class Melody(object):
+    # 5.8ms hop: 10**5 frames is roughly a ten minute track
+    params = [1000, 10000, 100000]
+    param_names = ['n_frames']
+
+    def setup(self, n_frames):
+        (self.ref_time, self.ref_freq,
+         self.est_time, self.est_freq) = melody_pair(n_frames)
+        (self.ref_voicing, self.ref_cent,
+         self.est_voicing, self.est_cent) = mir_eval.melody.to_cent_voicing(
+             self.ref_time, self.ref_freq, self.est_time, self.est_freq)
+        self.est_freq_cent, self.est_freq_voicing = \
+            mir_eval.melody.freq_to_voicing(self.est_freq)
+
+    def time_evaluate(self, n_frames):
+        mir_eval.melody.evaluate(self.ref_time, self.ref_freq,
+                                 self.est_time, self.est_freq)
+
+    def peakmem_evaluate(self, n_frames):
+        mir_eval.melody.evaluate(self.ref_time, self.ref_freq,
+                                 self.est_time, self.est_freq)
+
+    def time_to_cent_voicing(self, n_frames):
+        mir_eval.melody.to_cent_voicing(self.ref_time, self.ref_freq,
+                                        self.est_time, self.est_freq)
+
+    def time_resample_melody_series(self, n_frames):
+        mir_eval.melody.resample_melody_series(
+            self.est_time, self.est_freq_cent, self.est_freq_voicing,
+            self.ref_time)
+
+    def time_raw_chroma_accuracy(self, n_frames):
+        mir_eval.melody.raw_chroma_accuracy(self.ref_voicing, self.ref_cent,
+                                            self.est_voicing, self.est_cent)
+
+    def time_evaluate_cent_voicing(self, n_frames):
+        mir_eval.melody.evaluate_cent_voicing(self.ref_voicing, self.ref_cent,
+                                              self.est_voicing, self.est_cent)
+
+
+class MelodyBatch(object):
+    # Many estimates of the same reference, e.g. a hyperparameter grid
+    params = [[10, 100], [10000]]
+    param_names = ['n_estimates', 'n_frames']
+
+    def setup(self, n_estimates, n_frames):
+        (self.ref_time, self.ref_freq,
+         self.est_time, est_freq) = melody_pair(n_frames)
+        self.est_freqs = np.array([est_freq * (1 + .01 * n)
+                                   for n in range(n_estimates)])
+
+    def time_evaluate_batch(self, n_estimates, n_frames):
+        mir_eval.melody.evaluate_batch(self.ref_time, self.ref_freq,
+                                       self.est_time, self.est_freqs)
+
+    def time_evaluate_loop(self, n_estimates, n_frames):
+        for est_freq in self.est_freqs:
+            mir_eval.melody.evaluate(self.ref_time, self.ref_freq,
+                                     self.est_time, est_freq)
@@ -0,0 +1,49 @@
+'''
+Benchmarks for mir_eval.multipitch
+'''
+
+import mir_eval
+
+from .synthetic import multipitch_pair
+
+
+class Multipitch(object):
+    # 10ms hop: 10**5 frames is roughly a 17 minute track
+    params = [1000, 10000, 100000]
+    param_names = ['n_frames']
+
+    def setup(self, n_frames):
+        (self.ref_time, self.ref_freqs,
+         self.est_time, self.est_freqs) = multipitch_pair(n_frames)
+        self.ref_midi = mir_eval.multipitch.frequencies_to_midi(
+            self.ref_freqs)
+        self.est_midi = mir_eval.multipitch.frequencies_to_midi(
+            self.est_freqs)
+        self.ref_flat = mir_eval.multipitch.flatten_frequencies(
+            self.ref_freqs)
+        self.est_flat = mir_eval.multipitch.flatten_frequencies(
+            self.est_freqs)
+
+    def time_evaluate(self, n_frames):
+        mir_eval.multipitch.evaluate(self.ref_time, self.ref_freqs,
+                                     self.est_time, self.est_freqs)
+
+    def peakmem_evaluate(self, n_frames):
+        mir_eval.multipitch.evaluate(self.ref_time, self.ref_freqs,
+                                     self.est_time, self.est_freqs)
+
+    def time_evaluate_flat(self, n_frames):
+        mir_eval.multipitch.evaluate(self.ref_time, self.ref_flat,
+                                     self.est_time, self.est_flat)
+
+    def time_compute_num_true_positives(self, n_frames):
+        mir_eval.multipitch.compute_num_true_positives(self.ref_midi,
+                                                       self.est_midi)
+
+    def time_resample_multipitch(self, n_frames):
+        mir_eval.multipitch.resample_multipitch(
+            self.est_time, self.est_freqs, self.ref_time * 1.01)
+
+    def time_resample_multipitch_flat(self, n_frames):
+        mir_eval.multipitch.resample_multipitch(
+            self.est_time, self.est_flat, self.ref_time * 1.01)
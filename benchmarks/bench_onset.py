@@ -0,0 +1,22 @@
+'''
+Benchmarks for mir_eval.onset
+'''
+
+import mir_eval
+
+from .synthetic import event_pair
+
+
+class Onset(object):
+    params = [100, 1000, 10000]
+    param_names = ['n_events']
+
+    def setup(self, n_events):
+        self.reference, self.estimated = event_pair(n_events, period=.1,
+                                                    jitter=.02)
+
+    def time_evaluate(self, n_events):
+        mir_eval.onset.evaluate(self.reference, self.estimated)
+
+    def peakmem_evaluate(self, n_events):
+        mir_eval.onset.evaluate(self.reference, self.estimated)
@@ -0,0 +1,30 @@
+'''
+Benchmarks for mir_eval.pattern
+'''
+
+import mir_eval
+
+from .synthetic import pattern_pair
+
+
+class Pattern(object):
+    params = [2, 5, 10]
+    param_names = ['n_patterns']
+
+    def setup(self, n_patterns):
+        self.reference, self.estimated = pattern_pair(n_patterns)
+
+    def time_evaluate(self, n_patterns):
+        mir_eval.pattern.evaluate(self.reference, self.estimated)
+
+    def peakmem_evaluate(self, n_patterns):
+        mir_eval.pattern.evaluate(self.reference, self.estimated)
+
+    def time_compute_score_matrix(self, n_patterns):
+        for ref_pattern in self.reference:
+            for est_pattern in self.estimated:
+                mir_eval.pattern._compute_score_matrix(ref_pattern,
+                                                       est_pattern)
+
+    def time_three_layer_FPR(self, n_patterns):
+        mir_eval.pattern.three_layer_FPR(self.reference, self.estimated)
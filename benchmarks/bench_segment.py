@@ -0,0 +1,62 @@
+'''
+Benchmarks for mir_eval.segment and mir_eval.hierarchy
+'''
+
+import mir_eval
+
+from .synthetic import labeled_interval_pair, hierarchy_pair
+
+
+class Segment(object):
+    params = [10, 100, 1000]
+    param_names = ['n_intervals']
+
+    def setup(self, n_intervals):
+        (self.ref_intervals, self.ref_labels,
+         self.est_intervals, self.est_labels) = labeled_interval_pair(
+             n_intervals, duration=20. * n_intervals)
+
+    def time_evaluate(self, n_intervals):
+        mir_eval.segment.evaluate(self.ref_intervals, self.ref_labels,
+                                  self.est_intervals, self.est_labels)
+
+    def peakmem_evaluate(self, n_intervals):
+        mir_eval.segment.evaluate(self.ref_intervals, self.ref_labels,
+                                  self.est_intervals, self.est_labels)
+
+    def time_pairwise(self, n_intervals):
+        mir_eval.segment.pairwise(self.ref_intervals, self.ref_labels,
+                                  self.est_intervals, self.est_labels)
+
+    def time_nce(self, n_intervals):
+        mir_eval.segment.nce(self.ref_intervals, self.ref_labels,
+                             self.est_intervals, self.est_labels)
+
+
+class Hierarchy(object):
+    # Track duration in seconds, at the default 0.1s frame size
+    params = [30., 60., 120.]
+    param_names = ['duration']
+
+    def setup(self, duration):
+        (self.ref_intervals, self.ref_labels,
+         self.est_intervals, self.est_labels) = hierarchy_pair(3, duration)
+        self.ref_lca = mir_eval.hierarchy._lca(self.ref_intervals, .1)
+        self.est_lca = mir_eval.hierarchy._lca(self.est_intervals, .1)
+
+    def time_evaluate(self, duration):
+        mir_eval.hierarchy.evaluate(self.ref_intervals, self.ref_labels,
+                                    self.est_intervals, self.est_labels)
+
+    def peakmem_evaluate(self, duration):
+        mir_eval.hierarchy.evaluate(self.ref_intervals, self.ref_labels,
+                                    self.est_intervals, self.est_labels)
+
+    def time_lca(self, duration):
+        mir_eval.hierarchy._lca(self.ref_intervals, .1)
+
+    def time_meet(self, duration):
+        mir_eval.hierarchy._meet(self.ref_intervals, self.ref_labels, .1)
+
+    def time_gauc(self, duration):
+        mir_eval.hierarchy._gauc(self.ref_lca, self.est_lca, False, 150)
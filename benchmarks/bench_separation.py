@@ -0,0 +1,55 @@
+'''
+Benchmarks for mir_eval.separation
+'''
+
+import mir_eval
+
+from .synthetic import source_pair
+
+
+class Sources(object):
+    params = [[2, 4], [44100, 4 * 44100]]
+    param_names = ['n_sources', 'n_samples']
+
+    def setup(self, n_sources, n_samples):
+        self.reference, self.estimated = source_pair(n_sources, n_samples)
+
+    def time_bss_eval_sources(self, n_sources, n_samples):
+        mir_eval.separation.bss_eval_sources(self.reference, self.estimated)
+
+    def peakmem_bss_eval_sources(self, n_sources, n_samples):
+        mir_eval.separation.bss_eval_sources(self.reference, self.estimated)
+
+    def time_bss_eval_sources_no_permutation(self, n_sources, n_samples):
+        mir_eval.separation.bss_eval_sources(self.reference, self.estimated,
+                                             compute_permutation=False)
+
+
+class Images(object):
+    params = [[2, 4], [44100, 4 * 44100]]
+    param_names = ['n_sources', 'n_samples']
+
+    def setup(self, n_sources, n_samples):
+        self.reference, self.estimated = source_pair(n_sources, n_samples,
+                                                     n_channels=2)
+
+    def time_bss_eval_images(self, n_sources, n_samples):
+        mir_eval.separation.bss_eval_images(self.reference, self.estimated,
+                                            compute_permutation=False)
+
+    def peakmem_bss_eval_images(self, n_sources, n_samples):
+        mir_eval.separation.bss_eval_images(self.reference, self.estimated,
+                                            compute_permutation=False)
+
+    def time_bss_eval_images_permutation(self, n_sources, n_samples):
+        mir_eval.separation.bss_eval_images(self.reference, self.estimated)
+
+    def time_bss_eval_images_blocks(self, n_sources, n_samples):
+        mir_eval.separation.bss_eval_images(self.reference, self.estimated,
+                                            compute_permutation=False,
+                                            block_size=8192)
+
+    def peakmem_bss_eval_images_blocks(self, n_sources, n_samples):
+        mir_eval.separation.bss_eval_images(self.reference, self.estimated,
+                                            compute_permutation=False,
+                                            block_size=8192)
@@ -0,0 +1,53 @@
+'''
+Benchmarks for mir_eval.sonify
+'''
+
+import numpy as np
+import mir_eval
+
+from .synthetic import event_pair, labeled_interval_pair, CHORD_LABELS
+
+
+class Sonify(object):
+    # Duration of the synthesized signal in seconds
+    params = [10., 60., 300.]
+    param_names = ['duration']
+    fs = 22050
+
+    def setup(self, duration):
+        self.times = event_pair(int(duration * 4), period=.25)[0]
+        self.times = self.times[self.times < duration]
+        self.intervals, self.labels, _, _ = labeled_interval_pair(
+            int(duration / 2), labels=CHORD_LABELS, duration=duration)
+        self.contour_times = np.arange(0, duration, .01)
+        self.contour = 220. * 2**np.sin(self.contour_times)
+        self.short_click = np.hanning(32)
+
+    def time_clicks(self, duration):
+        mir_eval.sonify.clicks(self.times, self.fs)
+
+    def time_chords(self, duration):
+        mir_eval.sonify.chords(self.labels, self.intervals, self.fs)
+
+    def peakmem_chords(self, duration):
+        mir_eval.sonify.chords(self.labels, self.intervals, self.fs)
+
+    def time_pitch_contour(self, duration):
+        mir_eval.sonify.pitch_contour(self.contour_times, self.contour,
+                                      self.fs)
+
+    def time_iter_chords(self, duration):
+        for _ in mir_eval.sonify.iter_chords(self.labels, self.intervals,
+                                             self.fs, normalize=False):
+            pass
+
+    def peakmem_iter_chords(self, duration):
+        for _ in mir_eval.sonify.iter_chords(self.labels, self.intervals,
+                                             self.fs, normalize=False):
+            pass
+
+    def time_clicks_sum(self, duration):
+        mir_eval.sonify.clicks(self.times, self.fs, overlap='sum')
+
+    def time_clicks_short(self, duration):
+        mir_eval.sonify.clicks(self.times, self.fs, click=self.short_click)
@@ -0,0 +1,36 @@
+'''
+Benchmarks for mir_eval.transcription and mir_eval.transcription_velocity
+'''
+
+import mir_eval
+
+from .synthetic import note_pair
+
+
+class Transcription(object):
+    params = [100, 1000, 5000]
+    param_names = ['n_notes']
+
+    def setup(self, n_notes):
+        (self.ref_intervals, self.ref_pitches, self.ref_velocities,
+         self.est_intervals, self.est_pitches,
+         self.est_velocities) = note_pair(n_notes)
+
+    def time_evaluate(self, n_notes):
+        mir_eval.transcription.evaluate(self.ref_intervals, self.ref_pitches,
+                                        self.est_intervals, self.est_pitches)
+
+    def peakmem_evaluate(self, n_notes):
+        mir_eval.transcription.evaluate(self.ref_intervals, self.ref_pitches,
+                                        self.est_intervals, self.est_pitches)
+
+    def time_match_notes(self, n_notes):
+        mir_eval.transcription.match_notes(self.ref_intervals,
+                                           self.ref_pitches,
+                                           self.est_intervals,
+                                           self.est_pitches)
+
+    def time_velocity_evaluate(self, n_notes):
+        mir_eval.transcription_velocity.evaluate(
+            self.ref_intervals, self.ref_pitches, self.ref_velocities,
+            self.est_intervals, self.est_pitches, self.est_velocities)
@@ -0,0 +1,64 @@
+'''
+Benchmarks for the shared kernels in mir_eval.util
+'''
+
+import numpy as np
+import mir_eval
+
+from .synthetic import event_pair, labeled_interval_pair
+
+
+class MatchEvents(object):
+    params = [100, 1000, 10000]
+    param_names = ['n_events']
+
+    def setup(self, n_events):
+        self.reference, self.estimated = event_pair(n_events, period=.1)
+        hits = mir_eval.util._fast_hit_windows(self.reference,
+                                               self.estimated, .05)
+        self.graph = {}
+        for ref_i, est_i in zip(*hits):
+            self.graph.setdefault(est_i, []).append(ref_i)
+
+    def time_match_events(self, n_events):
+        mir_eval.util.match_events(self.reference, self.estimated, .05)
+
+    def time_fast_hit_windows(self, n_events):
+        mir_eval.util._fast_hit_windows(self.reference, self.estimated, .05)
+
+    def time_bipartite_match(self, n_events):
+        mir_eval.util._bipartite_match(self.graph)
+
+
+class LabeledIntervals(object):
+    params = [100, 1000, 10000]
+    param_names = ['n_intervals']
+
+    def setup(self, n_intervals):
+        (self.ref_intervals, self.ref_labels,
+         self.est_intervals, self.est_labels) = labeled_interval_pair(
+             n_intervals)
+        self.time_points = np.arange(0, self.ref_intervals.max(), .1)
+
+    def time_merge_labeled_intervals(self, n_intervals):
+        mir_eval.util.merge_labeled_intervals(
+            self.ref_intervals, self.ref_labels,
+            self.est_intervals, self.est_labels)
+
+    def time_interpolate_intervals(self, n_intervals):
+        mir_eval.util.interpolate_intervals(
+            self.ref_intervals, self.ref_labels, self.time_points)
+
+    def time_intervals_to_samples(self, n_intervals):
+        mir_eval.util.intervals_to_samples(self.ref_intervals,
+                                           self.ref_labels)
+
+    def time_intervals_to_samples_index(self, n_intervals):
+        mir_eval.util.intervals_to_samples(self.ref_intervals,
+                                           self.ref_labels,
+                                           return_index=True)
+
+    def time_index_labels(self, n_intervals):
+        labels = mir_eval.util.interpolate_intervals(
+            self.ref_intervals, self.ref_labels, self.time_points)
+        mir_eval.util.index_labels(labels)
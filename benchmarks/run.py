@@ -0,0 +1,144 @@
+'''
+Standalone runner for the benchmarks in this directory.
+
+The benchmark classes follow the conventions of airspeed velocity (asv), so
+they can be run with ``asv run`` using the ``asv.conf.json`` at the top of the
+repository.  When asv is not available, this script runs every ``time_*``
+and ``peakmem_*`` method of every benchmark class for each of its parameter
+values.  ``time_*`` benchmarks report the best wall time over several repeats
+together with the peak memory allocated by one call, ``peakmem_*`` benchmarks
+only the peak memory.  Peak memory is measured with ``tracemalloc``, and is
+not reported on Python versions which do not provide it.
+
+Usage, from the top of the repository::
+
+    python -m benchmarks.run [--repeat N] [--json results.json] [pattern]
+
+where ``pattern`` is a regular expression matched against the benchmark
+names, e.g. ``Melody`` or ``time_gauc``.
+'''
+
+from __future__ import print_function
+
+import argparse
+import glob
+import importlib
+import inspect
+import itertools
+import json
+import os
+import re
+import timeit
+import warnings
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+# Prefixes of the benchmark methods which are run, as in asv
+_PREFIXES = ('time_', 'peakmem_')
+
+
+def _benchmark_classes():
+    '''Yield (name, class) for all benchmark classes in this package.'''
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__),
+                                              'bench_*.py'))):
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        module = importlib.import_module('benchmarks.' + module_name)
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__:
+                yield '{}.{}'.format(module_name, name), cls
+
+
+def _param_grid(cls):
+    '''List the parameter combinations of a benchmark class, following the
+    asv convention that ``params`` is either a list of values (one parameter)
+    or a list of lists of values (several parameters).'''
+    params = getattr(cls, 'params', None)
+    if params is None:
+        return [()]
+    if len(getattr(cls, 'param_names', [])) > 1:
+        return list(itertools.product(*params))
+    return [(p,) for p in params]
+
+
+def _peak_memory(func, *args):
+    '''Call ``func(*args)`` and return the peak memory in bytes allocated
+    during the call, or ``None`` when ``tracemalloc`` is not available.'''
+    if tracemalloc is None:
+        func(*args)
+        return None
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run(pattern='', repeat=3):
+    '''Run all benchmarks whose name matches ``pattern``.
+
+    Returns
+    -------
+    results : list of dict
+        One entry per (benchmark, parameters), with the best wall time in
+        seconds over ``repeat`` calls (``None`` for ``peakmem_*``
+        benchmarks) and the peak memory in bytes (``None`` when it can't be
+        measured).
+    '''
+    matcher = re.compile(pattern)
+    results = []
+    for class_name, cls in _benchmark_classes():
+        methods = [m for m in sorted(vars(cls)) if m.startswith(_PREFIXES)
+                   and matcher.search('{}.{}'.format(class_name, m))]
+        if not methods:
+            continue
+        for params in _param_grid(cls):
+            bench = cls()
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                if hasattr(bench, 'setup'):
+                    bench.setup(*params)
+                for method in methods:
+                    func = getattr(bench, method)
+                    peak = _peak_memory(func, *params)
+                    seconds = None
+                    if method.startswith('time_'):
+                        seconds = min(timeit.repeat(lambda: func(*params),
+                                                    repeat=repeat, number=1))
+                    result = {'name': '{}.{}'.format(class_name, method),
+                              'params': dict(zip(cls.param_names, params)),
+                              'time': seconds,
+                              'peakmem': peak}
+                    print('{:<55} {:<35} {:>11} {:>11}'.format(
+                        result['name'],
+                        ', '.join('{}={}'.format(k, v) for k, v
+                                  in sorted(result['params'].items())),
+                        '-' if seconds is None
+                        else '{:.4f}s'.format(seconds),
+                        '-' if peak is None
+                        else '{:.1f}MB'.format(peak / 2.**20)))
+                    results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run mir_eval benchmarks')
+    parser.add_argument('pattern', nargs='?', default='',
+                        help='Regular expression selecting benchmarks')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed calls per benchmark')
+    parser.add_argument('--json', dest='json_file', default=None,
+                        help='Write the results to this file as JSON')
+    args = parser.parse_args()
+    results = run(args.pattern, args.repeat)
+    if args.json_file is not None:
+        with open(args.json_file, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
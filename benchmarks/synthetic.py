@@ -0,0 +1,171 @@
+'''
+Synthetic annotation generators for the benchmarks.
+
+Each generator returns a reference annotation and an estimate derived from it
+by jittering, dropping and inserting elements, in the formats expected by the
+corresponding task submodule (cf. ``tests/generate_data.py``, which plays the
+same role for the regression test fixtures).  All generators are seeded so
+that benchmark inputs are reproducible across runs.
+'''
+
+import numpy as np
+
+CHORD_LABELS = ['N', 'C:maj', 'A:min', 'F:maj7', 'G:7', 'D:min7', 'E:hdim7',
+                'Bb:maj/3', 'Eb:sus4', 'Ab:aug', 'F#:dim', 'C#:min(9)']
+
+SEGMENT_LABELS = ['intro', 'verse', 'chorus', 'bridge', 'solo', 'outro']
+
+
+def event_pair(n_events, period=.5, jitter=.02, drop=.1, seed=0):
+    '''Generate reference and estimated event times (beats, onsets).
+
+    The estimate contains each reference event with probability
+    ``1 - drop``, shifted by Gaussian noise, plus ``drop * n_events``
+    spurious events.
+    '''
+    rng = np.random.RandomState(seed)
+    reference = np.cumsum(period * (1 + .1 * rng.randn(n_events)).clip(.5))
+    keep = rng.rand(n_events) > drop
+    estimated = reference[keep] + jitter * rng.randn(keep.sum())
+    spurious = rng.uniform(0, reference[-1], int(drop * n_events))
+    estimated = np.sort(np.abs(np.concatenate([estimated, spurious])))
+    return reference, estimated
+
+
+def _boundaries(n_intervals, duration, rng):
+    '''Random sorted boundaries spanning ``[0, duration]``.'''
+    inner = np.sort(rng.uniform(0, duration, n_intervals - 1))
+    # Enforce a minimum interval length to keep intervals well-formed
+    inner = np.unique(np.round(inner, 3))
+    inner = inner[(inner > 0) & (inner < duration)]
+    return np.concatenate([[0.], inner, [duration]])
+
+
+def labeled_interval_pair(n_intervals, labels=SEGMENT_LABELS, duration=None,
+                          seed=0):
+    '''Generate reference and estimated labeled intervals spanning the same
+    time range (segments, chords).
+    '''
+    rng = np.random.RandomState(seed)
+    if duration is None:
+        duration = 2. * n_intervals
+    pair = []
+    for _ in range(2):
+        bounds = _boundaries(n_intervals, duration, rng)
+        intervals = np.array([bounds[:-1], bounds[1:]]).T
+        pair.append(intervals)
+        pair.append([labels[i] for i in
+                     rng.randint(0, len(labels), len(intervals))])
+    return tuple(pair)
+
+
+def hierarchy_pair(n_levels, duration, seed=0):
+    '''Generate reference and estimated hierarchical segmentations where
+    level ``i`` has roughly ``4**(i + 1)`` segments.
+    '''
+    rng = np.random.RandomState(seed)
+    pair = []
+    for _ in range(2):
+        intervals_hier, labels_hier = [], []
+        for level in range(n_levels):
+            bounds = _boundaries(4**(level + 1), duration, rng)
+            intervals_hier.append(np.array([bounds[:-1], bounds[1:]]).T)
+            labels_hier.append(
+                [SEGMENT_LABELS[i] for i in
+                 rng.randint(0, len(SEGMENT_LABELS), len(bounds) - 1)])
+        pair.append(intervals_hier)
+        pair.append(labels_hier)
+    return tuple(pair)
+
+
+def melody_pair(n_frames, hop=256/44100., seed=0):
+    '''Generate reference and estimated melody time series in Hz, with
+    unvoiced regions; the estimate is sampled on a slightly different
+    timebase so that it has to be resampled.
+    '''
+    rng = np.random.RandomState(seed)
+    times = np.arange(n_frames) * hop
+    midi = 60 + np.cumsum(rng.randn(n_frames) * .1).clip(-24, 24)
+    voiced = (np.sin(times / 3.) + .3 * rng.randn(n_frames)) > -.3
+    ref_freq = 440. * 2**((midi - 69) / 12.) * voiced
+    est_time = np.arange(int(n_frames * .99)) * hop * 1.01
+    est_freq = np.interp(est_time, times, ref_freq)
+    est_freq *= 2**(rng.randn(est_time.size) * .03)
+    # Negative frequencies mark frames estimated as unvoiced
+    flip = rng.rand(est_time.size) < .1
+    est_freq[flip] *= -1
+    return times, ref_freq, est_time, est_freq
+
+
+def multipitch_pair(n_frames, max_polyphony=4, hop=.01, seed=0):
+    '''Generate reference and estimated multipitch time series as lists of
+    per-frame frequency arrays in Hz.
+    '''
+    rng = np.random.RandomState(seed)
+    times = np.arange(n_frames) * hop
+    pair = []
+    for _ in range(2):
+        polyphony = rng.randint(0, max_polyphony + 1, n_frames)
+        freqs = [440. * 2**((rng.randint(40, 90, n) - 69 +
+                             .1 * rng.randn(n)) / 12.)
+                 for n in polyphony]
+        pair.append(times)
+        pair.append(freqs)
+    return tuple(pair)
+
+
+def note_pair(n_notes, seed=0):
+    '''Generate reference and estimated notes as (intervals, pitches in Hz,
+    velocities).
+    '''
+    rng = np.random.RandomState(seed)
+    onsets = np.sort(rng.uniform(0, n_notes * .25, n_notes))
+    durations = rng.uniform(.1, 1., n_notes)
+    ref_intervals = np.array([onsets, onsets + durations]).T
+    ref_pitches = 440. * 2**((rng.randint(40, 90, n_notes) - 69) / 12.)
+    ref_velocities = rng.randint(1, 128, n_notes)
+    est_intervals = ref_intervals + .03 * rng.randn(n_notes, 1)
+    est_intervals = np.abs(est_intervals)
+    est_intervals[:, 1] += .1 * rng.rand(n_notes)
+    est_pitches = ref_pitches * 2**(rng.randn(n_notes) * .05)
+    est_velocities = (ref_velocities + 5 * rng.randn(n_notes)).clip(1, 127)
+    return (ref_intervals, ref_pitches, ref_velocities,
+            est_intervals, est_pitches, est_velocities)
+
+
+def pattern_pair(n_patterns, n_occurrences=4, n_notes=16, seed=0):
+    '''Generate reference and estimated pattern lists in the format returned
+    by :func:`mir_eval.io.load_patterns`; estimated occurrences share part of
+    their (onset, midi) pairs with the reference.
+    '''
+    rng = np.random.RandomState(seed)
+
+    def occurrence(start):
+        onsets = start + .5 * np.arange(n_notes)
+        midis = rng.randint(50, 80, n_notes).astype(float)
+        return list(zip(onsets.tolist(), midis.tolist()))
+
+    reference, estimated = [], []
+    for p in range(n_patterns):
+        pattern = [occurrence(8. * n_notes * (p * n_occurrences + o))
+                   for o in range(n_occurrences)]
+        reference.append(pattern)
+        estimated.append([occ[rng.randint(0, n_notes // 2):] +
+                          occurrence(occ[-1][0] + 1.)[:n_notes // 4]
+                          for occ in pattern])
+    return reference, estimated
+
+
+def source_pair(n_sources, n_samples, n_channels=None, seed=0):
+    '''Generate reference sources and estimates which are noisy mixtures of
+    the references, of shape ``(n_sources, n_samples[, n_channels])``.
+    '''
+    rng = np.random.RandomState(seed)
+    shape = (n_sources, n_samples)
+    if n_channels is not None:
+        shape += (n_channels,)
+    reference = rng.randn(*shape)
+    mixing = np.eye(n_sources) + .1 * rng.rand(n_sources, n_sources)
+    estimated = np.tensordot(mixing, reference, axes=1)
+    estimated += .05 * rng.randn(*shape)
+    return reference, estimated
@@ -1,22 +1,32 @@
 #!/usr/bin/env python
 """Top-level module for mir_eval"""
 
-# Import all submodules (for each task)
-from . import beat
-from . import chord
-from . import io
-from . import onset
-from . import segment
-from . import separation
-from . import util
-from . import sonify
-from . import melody
-from . import multipitch
-from . import pattern
-from . import tempo
-from . import hierarchy
-from . import transcription
-from . import transcription_velocity
-from . import key
+import importlib as _importlib
+import sys as _sys
 
 __version__ = '0.5'
+
+# All submodules (for each task)
+_SUBMODULES = ['beat', 'chord', 'io', 'onset', 'segment', 'separation',
+               'util', 'sonify', 'melody', 'multipitch', 'pattern', 'tempo',
+               'hierarchy', 'transcription', 'transcription_velocity', 'key',
+               'cache', 'profiling']
+
+
+def __getattr__(name):
+    # Submodules are imported on first access (PEP 562), so that e.g.
+    # ``mir_eval.beat`` does not pull in scipy through unrelated submodules
+    if name in _SUBMODULES:
+        return _importlib.import_module('.' + name, __name__)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__,
+                                                                    name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+
+# Module-level __getattr__ is only supported from Python 3.7 on
+if _sys.version_info < (3, 7):
+    for _name in _SUBMODULES:
+        _importlib.import_module('.' + _name, __name__)
@@ -74,6 +74,7 @@ def trim_beats(beats, min_beat_time=5.):
     return beats[beats >= min_beat_time]
 
 
+@util.validator
 def validate(reference_beats, estimated_beats):
     """Checks that the input annotations to a metric look like valid beat time
     arrays, and throws helpful errors if not.
@@ -701,6 +702,7 @@ def _get_entropy(reference_beats, estimated_beats, bins):
     return -np.sum(raw_bin_values * np.log2(raw_bin_values))
 
 
+@util.validate_once()
 def evaluate(reference_beats, estimated_beats, **kwargs):
     """Compute all metrics for the given reference and estimated annotations.
 
@@ -0,0 +1,197 @@
+'''
+Repeated evaluation runs over a large corpus often re-score annotation pairs
+which have not changed since the last run.  This submodule provides an opt-in
+wrapper around the task submodules' ``evaluate`` functions which stores the
+resulting scores on disk, so that unchanged pairs can be returned without
+re-computing any metrics.
+
+Conventions
+-----------
+
+Each cached result is keyed by
+
+* the task submodule (e.g. :mod:`mir_eval.beat`),
+* a hash of the contents of the reference annotation file,
+* a hash of the contents of the estimated annotation file,
+* the keyword arguments passed to ``evaluate``, and
+* the installed ``mir_eval`` version.
+
+Any change to one of these produces a different key, so that e.g. changing
+the ``window`` of :func:`mir_eval.onset.evaluate` only invalidates the entries
+computed with the old ``window``; all other entries remain valid.  Results are
+stored as one JSON file per key in ``cache_dir/<task>/``.
+
+The function used to load the annotation files is not part of the key, so a
+given ``cache_dir`` should always be used with the same loader for a task.
+'''
+
+import collections
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# os.rename fails on Windows if the destination exists, e.g. when another
+# worker wrote the same entry; os.replace is only available on Python 3
+_replace = getattr(os, 'replace', os.rename)
+
+
+def file_hash(filename, block_size=2**16):
+    """Compute a hash of the contents of a file.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the file
+    block_size : int
+        Number of bytes to read at a time
+        (Default value = 2**16)
+
+    Returns
+    -------
+    digest : str
+        Hexadecimal SHA-1 digest of the file contents
+
+    """
+    sha = hashlib.sha1()
+    with open(filename, 'rb') as input_file:
+        for block in iter(lambda: input_file.read(block_size), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _to_builtin(value):
+    """Convert numpy values to builtin types for JSON serialization.  Any
+    other non-serializable value raises a ``TypeError``, since e.g. the
+    ``repr`` of a function changes from one process to the next and could
+    not be used in a cache key.
+    """
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError('{!r} cannot be used in a cached evaluation; only JSON '
+                    'and numpy values are supported'.format(value))
+
+
+def cache_key(task, reference_file, estimated_file, **kwargs):
+    """Compute the key under which the scores for a pair of annotation files
+    are cached.
+
+    Parameters
+    ----------
+    task : module
+        Task submodule, e.g. :mod:`mir_eval.beat`
+    reference_file : str
+        Path to the reference annotation file
+    estimated_file : str
+        Path to the estimated annotation file
+    kwargs
+        Keyword arguments which will be passed to ``task.evaluate``.  They
+        must be JSON-serializable or numpy values.
+
+    Returns
+    -------
+    key : str
+        Hexadecimal digest identifying the evaluation
+
+    Raises
+    ------
+    TypeError
+        If one of the keyword arguments cannot be serialized
+
+    """
+    from . import __version__
+    description = json.dumps([task.__name__,
+                              file_hash(reference_file),
+                              file_hash(estimated_file),
+                              kwargs,
+                              __version__],
+                             sort_keys=True, default=_to_builtin)
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()
+
+
+def evaluate(task, reference_file, estimated_file, loader, cache_dir,
+             **kwargs):
+    """Evaluate a pair of annotation files with ``task.evaluate``, re-using
+    previously cached scores when neither file nor any of the parameters have
+    changed.
+
+    Examples
+    --------
+    >>> scores = mir_eval.cache.evaluate(mir_eval.beat, 'ref.txt', 'est.txt',
+    ...                                  mir_eval.io.load_events,
+    ...                                  cache_dir='scores_cache')
+    >>> # Changing a metric parameter only recomputes the affected entry
+    >>> scores = mir_eval.cache.evaluate(mir_eval.onset, 'ref.txt', 'est.txt',
+    ...                                  mir_eval.io.load_events,
+    ...                                  cache_dir='scores_cache',
+    ...                                  window=.1)
+
+    Parameters
+    ----------
+    task : module
+        Task submodule whose ``evaluate`` function computes the scores,
+        e.g. :mod:`mir_eval.beat`
+    reference_file : str
+        Path to the reference annotation file
+    estimated_file : str
+        Path to the estimated annotation file
+    loader : function
+        Function which loads an annotation file, e.g.
+        :func:`mir_eval.io.load_events`.  If it returns a tuple, its elements
+        are passed as separate arguments to ``task.evaluate``.
+    cache_dir : str
+        Directory in which cached scores are stored.  It will be created if
+        it does not exist.
+    kwargs
+        Additional keyword arguments which will be passed to
+        ``task.evaluate``.  They must be JSON-serializable or numpy values.
+
+    Returns
+    -------
+    scores : dict
+        Dictionary of scores, where the key is the metric name (str) and
+        the value is the (float) score achieved.  Array-valued scores are
+        returned as lists, whether or not they were read from the cache.
+
+    Raises
+    ------
+    TypeError
+        If one of the keyword arguments cannot be serialized
+
+    """
+    key = cache_key(task, reference_file, estimated_file, **kwargs)
+    task_dir = os.path.join(cache_dir, task.__name__.split('.')[-1])
+    cache_file = os.path.join(task_dir, '{}.json'.format(key))
+
+    if os.path.exists(cache_file):
+        with open(cache_file, 'r') as f:
+            return json.load(f, object_pairs_hook=collections.OrderedDict)
+
+    reference_data = loader(reference_file)
+    estimated_data = loader(estimated_file)
+    # Some loaders return tuples, others don't
+    if isinstance(reference_data, tuple):
+        scores = task.evaluate(*(reference_data + estimated_data), **kwargs)
+    else:
+        scores = task.evaluate(reference_data, estimated_data, **kwargs)
+
+    # Return the same builtin types as a cache hit would
+    serialized = json.dumps(scores, default=_to_builtin)
+    scores = json.loads(serialized, object_pairs_hook=collections.OrderedDict)
+
+    try:
+        os.makedirs(task_dir)
+    except OSError:
+        # Another worker may have created it in the meantime
+        if not os.path.isdir(task_dir):
+            raise
+    # Write to a temporary file first so that concurrent or interrupted runs
+    # never leave a partially written entry behind
+    handle, temp_file = tempfile.mkstemp(dir=task_dir, suffix='.tmp')
+    with os.fdopen(handle, 'w') as f:
+        f.write(serialized)
+    _replace(temp_file, cache_file)
+
+    return scores
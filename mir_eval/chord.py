@@ -616,6 +616,7 @@ def rotate_bitmaps_to_roots(bitmaps, roots):
 
 
 # --- Comparison Routines ---
+@util.validator
 def validate(reference_labels, estimated_labels):
     """Checks that the input annotations to a comparison function look like
     valid chord labels.
@@ -1389,12 +1390,31 @@ def directional_hamming_distance(reference_intervals, estimated_intervals):
         raise ValueError('Chord Intervals must not overlap')
 
     est_ts = np.unique(estimated_intervals.flatten())
-    seg = 0.
-    for start, end in reference_intervals:
-        dur = end - start
-        between_start_end = est_ts[(est_ts >= start) & (est_ts < end)]
-        seg_ts = np.hstack([start, between_start_end, end])
-        seg += dur - np.diff(seg_ts).max()
+    starts, ends = reference_intervals.T
+    # The estimated boundaries est_ts[lo[i]:hi[i]] split the i-th reference
+    # interval into sub-segments
+    lo = np.searchsorted(est_ts, starts, side='left')
+    hi = np.searchsorted(est_ts, ends, side='left')
+    n_inner = hi - lo
+    # Lay out the boundaries of the sub-segments of all the intervals end to
+    # end: the start of each interval, the estimated boundaries within it,
+    # and its end
+    first = np.cumsum(n_inner + 2) - (n_inner + 2)
+    last = first + n_inner + 1
+    seg_ts = np.empty(last[-1] + 1)
+    seg_ts[first] = starts
+    seg_ts[last] = ends
+    inner = np.ones(len(seg_ts), dtype=bool)
+    inner[first] = inner[last] = False
+    inner_offset = np.cumsum(n_inner) - n_inner
+    seg_ts[inner] = est_ts[np.arange(n_inner.sum()) +
+                           np.repeat(lo - inner_offset, n_inner)]
+    seg_durations = np.diff(seg_ts)
+    # The gaps from the end of an interval to the start of the next one are
+    # not sub-segments
+    seg_durations[last[:-1]] = 0
+    longest = np.maximum.reduceat(seg_durations, first)
+    seg = np.sum(ends - starts - longest)
     return seg / (reference_intervals[-1, 1] - reference_intervals[0, 0])
 
 
@@ -1514,6 +1534,7 @@ def merge_chord_intervals(intervals, labels):
     return np.array(merged_ivs)
 
 
+@util.validate_once()
 def evaluate(ref_intervals, ref_labels, est_intervals, est_labels, **kwargs):
     """Computes weighted accuracy for all comparison functions for the given
     reference and estimated annotations.
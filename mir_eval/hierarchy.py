@@ -46,7 +46,6 @@ import itertools
 import warnings
 
 import numpy as np
-import scipy.sparse
 
 from . import util
 from .segment import validate_structure
@@ -154,6 +153,8 @@ def _lca(intervals_hier, frame_size):
         of the deepest segment containing frames ``i`` and ``j``.
     '''
 
+    import scipy.sparse
+
     frame_size = float(frame_size)
 
     # Figure out how many frames we need
@@ -203,6 +204,8 @@ def _meet(intervals_hier, labels_hier, frame_size):
         of the deepest segment label containing both ``i`` and ``j``.
     '''
 
+    import scipy.sparse
+
     frame_size = float(frame_size)
 
     # Figure out how many frames we need
@@ -436,6 +439,7 @@ def _compare_frame_rankings(ref, est, transitive=False):
     return inversions, float(normalizer)
 
 
+@util.validator
 def validate_hier_intervals(intervals_hier):
     '''Validate a hierarchical segment annotation.
 
@@ -627,6 +631,7 @@ def lmeasure(reference_intervals_hier, reference_labels_hier,
     return l_precision, l_recall, l_measure
 
 
+@util.validate_once()
 def evaluate(ref_intervals_hier, ref_labels_hier,
              est_intervals_hier, est_labels_hier, **kwargs):
     '''Compute all hierarchical structure metrics for the given reference and
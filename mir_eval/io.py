@@ -6,7 +6,6 @@ import contextlib
 import numpy as np
 import re
 import warnings
-import scipy.io.wavfile
 import six
 
 from . import util
@@ -370,6 +369,8 @@ def load_wav(path, mono=True):
 
     """
 
+    import scipy.io.wavfile
+
     fs, audio_data = scipy.io.wavfile.read(path)
     # Make float in range [-1, 1]
     if audio_data.dtype == 'int8':
@@ -16,9 +16,13 @@ Metrics
 -------
 * :func:`mir_eval.key.weighted_score`: Heuristic scoring of the relation of two
   keys.
+* :func:`mir_eval.key.weighted_score_batch`: The same score for many pairs of
+  keys at once, which have been encoded with
+  :func:`mir_eval.key.encode_keys`.
 '''
 
 import collections
+import numpy as np
 from . import util
 
 
@@ -26,6 +30,8 @@ KEY_TO_SEMITONE = {'c': 0, 'c#': 1, 'db': 1, 'd': 2, 'd#': 3, 'eb': 3, 'e': 4,
                    'f': 5, 'f#': 6, 'gb': 6, 'g': 7, 'g#': 8, 'ab': 8, 'a': 9,
                    'a#': 10, 'bb': 10, 'b': 11}
 
+MODE_TO_INT = {'major': 0, 'minor': 1}
+
 
 def validate_key(key):
     """Checks that a key is well-formatted, e.g. in the form ``'C# major'``.
@@ -46,6 +52,7 @@ def validate_key(key):
             "Mode '{}' is invalid; must be 'major' or 'minor'".format(mode))
 
 
+@util.validator
 def validate(reference_key, estimated_key):
     """Checks that the input annotations to a metric are valid key strings and
     throws helpful errors if not.
@@ -143,6 +150,92 @@ def weighted_score(reference_key, estimated_key):
     return 0.
 
 
+def encode_keys(keys):
+    """Validates and encodes many key strings as integer arrays of tonics and
+    modes, for use with :func:`mir_eval.key.weighted_score_batch`.
+
+    Parameters
+    ----------
+    keys : list of str
+        Key strings, e.g. ``'C# major'``.
+
+    Returns
+    -------
+    tonics : np.ndarray, dtype=int
+        Number of semitones above C of each key.
+    modes : np.ndarray, dtype=int
+        Mode of each key, encoded according to ``MODE_TO_INT`` (``0`` for
+        major, ``1`` for minor).
+    """
+    tonics = np.empty(len(keys), dtype=int)
+    modes = np.empty(len(keys), dtype=int)
+    # Each distinct key string is only validated and split once
+    encoded = {}
+    for n, key in enumerate(keys):
+        if key not in encoded:
+            validate_key(key)
+            tonic, mode = split_key_string(key)
+            encoded[key] = tonic, MODE_TO_INT[mode]
+        tonics[n], modes[n] = encoded[key]
+    return tonics, modes
+
+
+def weighted_score_batch(reference_tonics, reference_modes, estimated_tonics,
+                         estimated_modes):
+    """Computes :func:`mir_eval.key.weighted_score` for many pairs of
+    reference and estimated keys at once.
+
+    Examples
+    --------
+    >>> ref_tonics, ref_modes = mir_eval.key.encode_keys(ref_keys)
+    >>> est_tonics, est_modes = mir_eval.key.encode_keys(est_keys)
+    >>> scores = mir_eval.key.weighted_score_batch(ref_tonics, ref_modes,
+    ...                                            est_tonics, est_modes)
+
+    Parameters
+    ----------
+    reference_tonics : np.ndarray, shape=(n,)
+        Number of semitones above C of each reference key.
+    reference_modes : np.ndarray, shape=(n,)
+        Mode of each reference key, ``0`` for major and ``1`` for minor.
+    estimated_tonics : np.ndarray, shape=(n,)
+        Number of semitones above C of each estimated key.
+    estimated_modes : np.ndarray, shape=(n,)
+        Mode of each estimated key, ``0`` for major and ``1`` for minor.
+
+    Returns
+    -------
+    scores : np.ndarray, shape=(n,)
+        Score of each pair of keys, the same as returned by
+        :func:`mir_eval.key.weighted_score`.
+    """
+    reference_tonics, reference_modes, estimated_tonics, estimated_modes = [
+        np.asarray(x) for x in (reference_tonics, reference_modes,
+                                estimated_tonics, estimated_modes)]
+    for tonics, modes in [(reference_tonics, reference_modes),
+                          (estimated_tonics, estimated_modes)]:
+        if tonics.shape != reference_tonics.shape or tonics.ndim != 1:
+            raise ValueError('Tonics must be 1-d arrays of the same length.')
+        if modes.shape != tonics.shape:
+            raise ValueError('There must be one mode per tonic.')
+        if np.any((tonics < 0) | (tonics > 11) | (tonics != tonics // 1)):
+            raise ValueError('Tonics must be integers in the range [0, 11].')
+        if np.any((modes != 0) & (modes != 1)):
+            raise ValueError('Modes must be 0 (major) or 1 (minor).')
+
+    same_mode = reference_modes == estimated_modes
+    interval = (estimated_tonics - reference_tonics) % 12
+    # Conditions in decreasing order of precedence, as in weighted_score
+    return np.select(
+        [same_mode & (interval == 0),
+         same_mode & (interval == 7),
+         ~same_mode & (reference_modes == 0) & (interval == 9),
+         ~same_mode & (reference_modes == 1) & (interval == 3),
+         ~same_mode & (interval == 0)],
+        [1., .5, .3, .3, .2], default=0.)
+
+
+@util.validate_once()
 def evaluate(reference_key, estimated_key, **kwargs):
     """Compute all metrics for the given reference and estimated annotations.
 
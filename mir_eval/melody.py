@@ -49,15 +49,21 @@ Metrics
   the proportion of all frames correctly estimated by the algorithm, including
   whether non-melody frames where labeled by the algorithm as non-melody
 
+All of the above are computed at once by
+:func:`mir_eval.melody.evaluate_cent_voicing`, which validates the inputs only
+once and shares the intermediate arrays between the metrics, and by
+:func:`mir_eval.melody.evaluate_batch`, which scores many estimates against a
+single reference, converting and resampling the reference only once.
+
 '''
 
 import numpy as np
-import scipy.interpolate
 import collections
 import warnings
 from . import util
 
 
+@util.validator
 def validate_voicing(ref_voicing, est_voicing):
     """Checks that voicing inputs to a metric are in the correct format.
 
@@ -87,6 +93,7 @@ def validate_voicing(ref_voicing, est_voicing):
             raise ValueError('Voicing arrays must be boolean.')
 
 
+@util.validator
 def validate(ref_voicing, ref_cent, est_voicing, est_cent):
     """Checks that voicing and frequency arrays are well-formed.  To be used in
     conjunction with :func:`mir_eval.melody.validate_voicing`
@@ -187,6 +194,36 @@ def constant_hop_timebase(hop, end_time):
     return times
 
 
+def _resample_indices(times, times_new, kind):
+    """Compute, for each of ``times_new``, the index of the sample in
+    ``times`` selected by zeroth-order (``kind='zero'``) or nearest-neighbor
+    (``kind='nearest'``) interpolation.  Equivalent to (but much faster than)
+    interpolating the sample indices with ``scipy.interpolate.interp1d``.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Sorted times of each sample
+    times_new : np.ndarray
+        Times to resample to, all >= ``times[0]``
+    kind : str
+        Either ``'zero'`` or ``'nearest'``
+
+    Returns
+    -------
+    indices : np.ndarray, dtype=int
+        Index into ``times`` for each of ``times_new``
+
+    """
+    if kind == 'zero':
+        indices = np.searchsorted(times, times_new, side='right') - 1
+    else:
+        # Ties are resolved towards the previous sample, as in interp1d
+        midpoints = (times[1:] + times[:-1])/2.
+        indices = np.searchsorted(midpoints, times_new, side='left')
+    return np.minimum(indices, times.shape[0] - 1)
+
+
 def resample_melody_series(times, frequencies, voicing,
                            times_new, kind='linear'):
     """Resamples frequency and voicing time series to a new timescale. Maintains
@@ -207,6 +244,8 @@ def resample_melody_series(times, frequencies, voicing,
         Times to resample frequency and voicing sequences to
     kind : str
         kind parameter to pass to scipy.interpolate.interp1d.
+        The ``'linear'``, ``'zero'`` and ``'nearest'`` kinds are computed
+        directly with numpy.
         (Default value = 'linear')
 
     Returns
@@ -235,6 +274,7 @@ def resample_melody_series(times, frequencies, voicing,
     # Round to avoid floating point problems
     times = np.round(times, 10)
     times_new = np.round(times_new, 10)
+    frequencies = np.asarray(frequencies, dtype=float)
     # Add in an additional sample if we'll be asking for a time too large
     if times_new.max() > times.max():
         times = np.append(times, times_new.max())
@@ -244,33 +284,44 @@ def resample_melody_series(times, frequencies, voicing,
     if kind != 'zero' and kind != 'nearest':
         # Fill in zero values with the last reported frequency
         # to avoid erroneous values when resampling
-        frequencies_held = np.array(frequencies)
-        for n, frequency in enumerate(frequencies[1:]):
-            if frequency == 0:
-                frequencies_held[n + 1] = frequencies_held[n]
+        held_indices = np.arange(frequencies.shape[0])
+        held_indices[1:][frequencies[1:] == 0] = 0
+        frequencies_held = frequencies[np.maximum.accumulate(held_indices)]
+    # Like interp1d, sort by time and refuse to extrapolate before the start
+    if np.any(times[1:] < times[:-1]):
+        order = np.argsort(times, kind='mergesort')
+        times = times[order]
+        frequencies = frequencies[order]
+        voicing = np.asarray(voicing)[order]
+        if kind != 'zero' and kind != 'nearest':
+            frequencies_held = frequencies_held[order]
+    if times_new.min() < times[0]:
+        raise ValueError('A value in x_new is below the interpolation range.')
+    # Samples selected by zeroth-order interpolation
+    zero_indices = _resample_indices(times, times_new, 'zero')
+    if kind == 'linear':
         # Linearly interpolate frequencies
+        frequencies_resampled = np.interp(times_new, times, frequencies_held)
+    elif kind == 'zero':
+        frequencies_resampled = frequencies[zero_indices]
+    elif kind == 'nearest':
+        frequencies_resampled = frequencies[
+            _resample_indices(times, times_new, 'nearest')]
+    else:
+        import scipy.interpolate
         frequencies_resampled = scipy.interpolate.interp1d(times,
                                                            frequencies_held,
                                                            kind)(times_new)
+    if kind != 'zero' and kind != 'nearest':
         # Retain zeros
-        frequency_mask = scipy.interpolate.interp1d(times,
-                                                    frequencies,
-                                                    'zero')(times_new)
-        frequencies_resampled *= (frequency_mask != 0)
-    else:
-        frequencies_resampled = scipy.interpolate.interp1d(times,
-                                                           frequencies,
-                                                           kind)(times_new)
+        frequencies_resampled *= (frequencies[zero_indices] != 0)
     # Use nearest-neighbor for voicing if it was used for frequencies
     if kind == 'nearest':
-        voicing_resampled = scipy.interpolate.interp1d(times,
-                                                       voicing,
-                                                       kind)(times_new)
+        voicing_resampled = np.asarray(voicing)[
+            _resample_indices(times, times_new, 'nearest')]
     # otherwise, always use zeroth order
     else:
-        voicing_resampled = scipy.interpolate.interp1d(times,
-                                                       voicing,
-                                                       'zero')(times_new)
+        voicing_resampled = np.asarray(voicing)[zero_indices]
     return frequencies_resampled, voicing_resampled.astype(np.bool)
 
 
@@ -315,44 +366,110 @@ def to_cent_voicing(ref_time, ref_freq, est_time, est_freq, base_frequency=10.,
     est_cent : np.ndarray
         Resampled estimated frequency (cent) array
 
+    """
+    ref_time, ref_cent, ref_voicing = _series_to_cent_voicing(
+        ref_time, ref_freq, base_frequency, hop, None, kind)
+    # If we received a hop, use it to resample both, otherwise, only resample
+    # estimated to the reference time base
+    est_cent, est_voicing = _estimate_to_cent_voicing(
+        ref_time, ref_cent.shape[0], est_time, est_freq, base_frequency, hop,
+        kind)
+
+    return (ref_voicing.astype(bool), ref_cent,
+            est_voicing.astype(bool), est_cent)
+
+
+def _series_to_cent_voicing(times, frequencies, base_frequency, hop,
+                            times_new, kind):
+    """Convert a single time/frequency (Hz) series to a frequency (cent) and
+    voicing array, as done by :func:`mir_eval.melody.to_cent_voicing`.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Time of each frequency value
+    frequencies : np.ndarray
+        Array of frequency values
+    base_frequency : float
+        Base frequency in Hz for conversion to cents
+    hop : float or None
+        Hop size, in seconds, to resample to
+    times_new : np.ndarray or None
+        Times to resample to when ``hop`` is None.  If both are None, the
+        series is not resampled.
+    kind : str
+        kind parameter to pass to
+        :func:`mir_eval.melody.resample_melody_series`
+
+    Returns
+    -------
+    times : np.ndarray
+        Times of the series, including a sample at time 0
+    cent : np.ndarray
+        (Resampled) frequency (cent) array
+    voicing : np.ndarray
+        (Resampled) boolean voicing array
+
     """
     # Check if missing sample at time 0 and if so add one
-    if ref_time[0] > 0:
-        ref_time = np.insert(ref_time, 0, 0)
-        ref_freq = np.insert(ref_freq, 0, ref_freq[0])
-    if est_time[0] > 0:
-        est_time = np.insert(est_time, 0, 0)
-        est_freq = np.insert(est_freq, 0, est_freq[0])
+    if times[0] > 0:
+        times = np.insert(times, 0, 0)
+        frequencies = np.insert(frequencies, 0, frequencies[0])
     # Get separated frequency array and voicing boolean array
-    ref_freq, ref_voicing = freq_to_voicing(ref_freq)
-    est_freq, est_voicing = freq_to_voicing(est_freq)
-    # convert both sequences to cents
-    ref_cent = hz2cents(ref_freq, base_frequency)
-    est_cent = hz2cents(est_freq, base_frequency)
-    # If we received a hop, use it to resample both
+    frequencies, voicing = freq_to_voicing(frequencies)
+    # convert to cents
+    cent = hz2cents(frequencies, base_frequency)
+    # If we received a hop, use it to resample
     if hop is not None:
-        # Resample to common time base
-        ref_cent, ref_voicing = resample_melody_series(
-            ref_time, ref_cent, ref_voicing,
-            constant_hop_timebase(hop, ref_time.max()), kind)
-        est_cent, est_voicing = resample_melody_series(
-            est_time, est_cent, est_voicing,
-            constant_hop_timebase(hop, est_time.max()), kind)
-    # Otherwise, only resample estimated to the reference time base
-    else:
-        est_cent, est_voicing = resample_melody_series(
-            est_time, est_cent, est_voicing, ref_time, kind)
+        times_new = constant_hop_timebase(hop, times.max())
+    if times_new is not None:
+        cent, voicing = resample_melody_series(times, cent, voicing,
+                                               times_new, kind)
+    return times, cent, voicing
+
+
+def _estimate_to_cent_voicing(ref_time, n_frames, est_time, est_freq,
+                              base_frequency, hop, kind):
+    """Convert an estimated time/frequency (Hz) series to frequency (cent)
+    and voicing arrays of the same length as the (resampled) reference.
+
+    Parameters
+    ----------
+    ref_time : np.ndarray
+        Time of each reference frequency value, including a sample at time 0
+    n_frames : int
+        Length of the (resampled) reference arrays
+    est_time : np.ndarray
+        Time of each estimated frequency value
+    est_freq : np.ndarray
+        Array of estimated frequency values
+    base_frequency : float
+        Base frequency in Hz for conversion to cents
+    hop : float or None
+        Hop size, in seconds, to resample to
+    kind : str
+        kind parameter to pass to
+        :func:`mir_eval.melody.resample_melody_series`
+
+    Returns
+    -------
+    est_cent : np.ndarray
+        Resampled estimated frequency (cent) array
+    est_voicing : np.ndarray
+        Resampled estimated voicing array
+
+    """
+    _, est_cent, est_voicing = _series_to_cent_voicing(
+        est_time, est_freq, base_frequency, hop, ref_time, kind)
     # ensure the estimated sequence is the same length as the reference
-    len_diff = ref_cent.shape[0] - est_cent.shape[0]
+    len_diff = n_frames - est_cent.shape[0]
     if len_diff >= 0:
         est_cent = np.append(est_cent, np.zeros(len_diff))
         est_voicing = np.append(est_voicing, np.zeros(len_diff))
     else:
-        est_cent = est_cent[:ref_cent.shape[0]]
-        est_voicing = est_voicing[:ref_voicing.shape[0]]
-
-    return (ref_voicing.astype(bool), ref_cent,
-            est_voicing.astype(bool), est_cent)
+        est_cent = est_cent[:n_frames]
+        est_voicing = est_voicing[:n_frames]
+    return est_cent, est_voicing
 
 
 def voicing_measures(ref_voicing, est_voicing):
@@ -629,6 +746,150 @@ def overall_accuracy(ref_voicing, ref_cent, est_voicing, est_cent,
     return accuracy
 
 
+def evaluate_cent_voicing(ref_voicing, ref_cent, est_voicing, est_cent,
+                          cent_tolerance=50, dtype=np.float64):
+    """Compute all melody metrics in a single pass over the frames, given two
+    pitch (frequency) sequences in cents and matching voicing indicator
+    sequences.  This is equivalent to calling
+    :func:`mir_eval.melody.voicing_measures`,
+    :func:`mir_eval.melody.raw_pitch_accuracy`,
+    :func:`mir_eval.melody.raw_chroma_accuracy` and
+    :func:`mir_eval.melody.overall_accuracy`, but the inputs are validated
+    only once and the cent differences are computed only once.
+
+    Examples
+    --------
+    >>> ref_time, ref_freq = mir_eval.io.load_time_series('ref.txt')
+    >>> est_time, est_freq = mir_eval.io.load_time_series('est.txt')
+    >>> (ref_v, ref_c,
+    ...  est_v, est_c) = mir_eval.melody.to_cent_voicing(ref_time,
+    ...                                                  ref_freq,
+    ...                                                  est_time,
+    ...                                                  est_freq)
+    >>> scores = mir_eval.melody.evaluate_cent_voicing(ref_v, ref_c,
+    ...                                                est_v, est_c)
+
+    Parameters
+    ----------
+    ref_voicing : np.ndarray
+        Reference boolean voicing array
+    ref_cent : np.ndarray
+        Reference pitch sequence in cents
+    est_voicing : np.ndarray
+        Estimated boolean voicing array
+    est_cent : np.ndarray
+        Estimate pitch sequence in cents
+    cent_tolerance : float
+        Maximum absolute deviation for a cent value to be considered correct
+        (Default value = 50)
+    dtype : np.dtype
+        Floating point type of the cent differences.  With ``np.float32``,
+        frames whose deviation is within about 1e-3 cents of
+        ``cent_tolerance`` (or of an octave boundary, for the chroma accuracy)
+        may be classified differently than with the default.
+        (Default value = np.float64)
+
+    Returns
+    -------
+    scores : dict
+        Dictionary of scores, with the same keys and values as
+        :func:`mir_eval.melody.evaluate`
+
+    """
+    validate_voicing(ref_voicing, est_voicing)
+    validate(ref_voicing, ref_cent, est_voicing, est_cent)
+    ref_voicing = ref_voicing.astype(bool)
+    est_voicing = est_voicing.astype(bool)
+
+    # When input arrays are empty, return 0 by special case
+    if ref_cent.shape[0] == 0:
+        return collections.OrderedDict(
+            (metric, 0.) for metric in ['Voicing Recall',
+                                        'Voicing False Alarm',
+                                        'Raw Pitch Accuracy',
+                                        'Raw Chroma Accuracy',
+                                        'Overall Accuracy'])
+    scores = _cent_voicing_scores(ref_voicing, ref_cent,
+                                  est_voicing[np.newaxis],
+                                  est_cent[np.newaxis],
+                                  cent_tolerance, dtype)
+    return collections.OrderedDict((metric, scores[metric][0])
+                                   for metric in scores)
+
+
+def _cent_voicing_scores(ref_voicing, ref_cent, est_voicing, est_cent,
+                         cent_tolerance, dtype):
+    """Compute all melody metrics for a batch of non-empty, validated
+    estimates.
+
+    Parameters
+    ----------
+    ref_voicing : np.ndarray, shape=(n_frames,), dtype=bool
+        Reference boolean voicing array
+    ref_cent : np.ndarray, shape=(n_frames,)
+        Reference pitch sequence in cents
+    est_voicing : np.ndarray, shape=(n_estimates, n_frames), dtype=bool
+        Estimated boolean voicing arrays
+    est_cent : np.ndarray, shape=(n_estimates, n_frames)
+        Estimated pitch sequences in cents
+    cent_tolerance : float
+        Maximum absolute deviation for a cent value to be considered correct
+    dtype : np.dtype
+        Floating point type of the cent differences
+
+    Returns
+    -------
+    scores : dict
+        Dictionary mapping each metric name to an array of shape
+        ``(n_estimates,)``
+
+    """
+    n_frames = ref_cent.shape[0]
+    # Voicing confusion counts, see voicing_measures
+    n_ref_voiced = ref_voicing.sum()
+    both_voiced = ref_voicing & est_voicing
+    TP = both_voiced.sum(axis=-1)
+    FN = n_ref_voiced - TP
+    FP = est_voicing.sum(axis=-1) - TP
+    TN = n_frames - n_ref_voiced - FP
+
+    # Absolute cent differences, and the same differences wrapped to the
+    # nearest octave, each computed in place in a single buffer
+    cent_diff = np.subtract(ref_cent, est_cent, dtype=dtype)
+    np.abs(cent_diff, out=cent_diff)
+    pitch_correct = cent_diff < cent_tolerance
+    chroma_diff = np.divide(cent_diff, 1200.0, dtype=dtype)
+    chroma_diff += 0.5
+    np.floor(chroma_diff, out=chroma_diff)
+    chroma_diff *= 1200
+    np.subtract(cent_diff, chroma_diff, out=chroma_diff)
+    np.abs(chroma_diff, out=chroma_diff)
+    chroma_correct = chroma_diff < cent_tolerance
+
+    scores = collections.OrderedDict()
+    scores['Voicing Recall'] = _safe_ratio(TP, TP + FN)
+    scores['Voicing False Alarm'] = _safe_ratio(FP, FP + TN)
+    # If there are no voiced frames in reference, raw accuracies are 0
+    scores['Raw Pitch Accuracy'] = _safe_ratio(
+        (pitch_correct & ref_voicing).sum(axis=-1), n_ref_voiced)
+    scores['Raw Chroma Accuracy'] = _safe_ratio(
+        (chroma_correct & ref_voicing).sum(axis=-1), n_ref_voiced)
+    scores['Overall Accuracy'] = _safe_ratio(
+        (pitch_correct & both_voiced).sum(axis=-1) + TN, n_frames)
+    return scores
+
+
+def _safe_ratio(numerator, denominator):
+    """Element-wise ``numerator/denominator``, or 0 where the denominator
+    is 0."""
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    ratio = np.zeros(numerator.shape)
+    nonzero = denominator != 0
+    ratio[nonzero] = np.true_divide(numerator[nonzero], denominator[nonzero])
+    return ratio
+
+
+@util.validate_once()
 def evaluate(ref_time, ref_freq, est_time, est_freq, **kwargs):
     """Evaluate two melody (predominant f0) transcriptions, where the first is
     treated as the reference (ground truth) and the second as the estimate to
@@ -667,26 +928,101 @@ def evaluate(ref_time, ref_freq, est_time, est_freq, **kwargs):
      est_voicing, est_cent) = util.filter_kwargs(
          to_cent_voicing, ref_time, ref_freq, est_time, est_freq, **kwargs)
 
-    # Compute metrics
-    scores = collections.OrderedDict()
+    # Compute all metrics in a single pass
+    return util.filter_kwargs(evaluate_cent_voicing, ref_voicing, ref_cent,
+                              est_voicing, est_cent, **kwargs)
 
-    (scores['Voicing Recall'],
-     scores['Voicing False Alarm']) = util.filter_kwargs(voicing_measures,
-                                                         ref_voicing,
-                                                         est_voicing, **kwargs)
-
-    scores['Raw Pitch Accuracy'] = util.filter_kwargs(raw_pitch_accuracy,
-                                                      ref_voicing, ref_cent,
-                                                      est_voicing, est_cent,
-                                                      **kwargs)
-
-    scores['Raw Chroma Accuracy'] = util.filter_kwargs(raw_chroma_accuracy,
-                                                       ref_voicing, ref_cent,
-                                                       est_voicing, est_cent,
-                                                       **kwargs)
-
-    scores['Overall Accuracy'] = util.filter_kwargs(overall_accuracy,
-                                                    ref_voicing, ref_cent,
-                                                    est_voicing, est_cent,
-                                                    **kwargs)
-    return scores
+
+def evaluate_batch(ref_time, ref_freq, est_time, est_freqs,
+                   base_frequency=10., hop=None, kind='linear',
+                   cent_tolerance=50, dtype=np.float64):
+    """Evaluate several melody transcriptions against the same reference.
+
+    The reference is converted to cents and (if ``hop`` is given) resampled
+    only once; each estimate is then converted and resampled as in
+    :func:`mir_eval.melody.to_cent_voicing`, and all estimates are scored in a
+    single vectorized pass.  The scores are the same as those returned by
+    :func:`mir_eval.melody.evaluate` for each estimate.
+
+    Examples
+    --------
+    >>> ref_time, ref_freq = mir_eval.io.load_time_series('ref.txt')
+    >>> est_time, est_freq_1 = mir_eval.io.load_time_series('est1.txt')
+    >>> est_time, est_freq_2 = mir_eval.io.load_time_series('est2.txt')
+    >>> scores = mir_eval.melody.evaluate_batch(ref_time, ref_freq, est_time,
+    ...                                         [est_freq_1, est_freq_2])
+    >>> scores[1]['Overall Accuracy']
+    0.7...
+
+    Parameters
+    ----------
+    ref_time : np.ndarray
+        Time of each reference frequency value
+    ref_freq : np.ndarray
+        Array of reference frequency values
+    est_time : np.ndarray or list of np.ndarray
+        Time of each estimated frequency value, either shared by all estimates
+        or given separately for each estimate
+    est_freqs : np.ndarray, shape=(n_estimates, n_times), or list of np.ndarray
+        Estimated frequency values, one row (or array) per estimate
+    base_frequency : float
+        Base frequency in Hz for conversion to cents
+        (Default value = 10.)
+    hop : float
+        Hop size, in seconds, to resample,
+        default None which means use ref_time
+    kind : str
+        kind parameter to pass to
+        :func:`mir_eval.melody.resample_melody_series`.
+        (Default value = 'linear')
+    cent_tolerance : float
+        Maximum absolute deviation for a cent value to be considered correct
+        (Default value = 50)
+    dtype : np.dtype
+        Floating point type of the cent differences, see
+        :func:`mir_eval.melody.evaluate_cent_voicing`.
+        (Default value = np.float64)
+
+    Returns
+    -------
+    scores : list of dict
+        For each estimate, a dictionary of scores, where the key is the metric
+        name (str) and the value is the (float) score achieved.
+
+    """
+    if isinstance(est_time, np.ndarray) and est_time.ndim == 1:
+        est_times = [est_time]*len(est_freqs)
+    else:
+        est_times = est_time
+    if len(est_times) != len(est_freqs):
+        raise ValueError('est_time must be a single array or contain one '
+                         'array per estimate.')
+
+    # Convert and resample the reference only once
+    ref_time, ref_cent, ref_voicing = _series_to_cent_voicing(
+        ref_time, ref_freq, base_frequency, hop, None, kind)
+    ref_voicing = ref_voicing.astype(bool)
+    n_frames = ref_cent.shape[0]
+
+    est_cent = np.empty((len(est_freqs), n_frames))
+    est_voicing = np.empty((len(est_freqs), n_frames), dtype=bool)
+    for n, (time, freq) in enumerate(zip(est_times, est_freqs)):
+        est_cent[n], voicing = _estimate_to_cent_voicing(
+            ref_time, n_frames, time, freq, base_frequency, hop, kind)
+        est_voicing[n] = voicing.astype(bool)
+        # Validate as evaluate does, so that each estimate raises the same
+        # errors and warnings
+        validate_voicing(ref_voicing, est_voicing[n])
+        validate(ref_voicing, ref_cent, est_voicing[n], est_cent[n])
+
+    # When input arrays are empty, return 0 by special case
+    if n_frames == 0:
+        return [evaluate_cent_voicing(ref_voicing, ref_cent,
+                                      est_voicing[n], est_cent[n])
+                for n in range(len(est_freqs))]
+
+    scores = _cent_voicing_scores(ref_voicing, ref_cent, est_voicing,
+                                  est_cent, cent_tolerance, dtype)
+    return [collections.OrderedDict((metric, scores[metric][n])
+                                    for metric in scores)
+            for n in range(len(est_freqs))]
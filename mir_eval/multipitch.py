@@ -9,6 +9,10 @@ Multipitch estimates are represented by a timebase and a corresponding list
 of arrays of frequency estimates. Frequency estimates may have any number of
 frequency values, including 0 (represented by an empty array). Time values are
 in units of seconds and frequency estimates are in units of Hz.
+Alternatively, all frequency values can be given in a single flat array
+together with the offset of each frame in this array, as a
+:class:`mir_eval.multipitch.FlatFrequencies`, which is the representation used
+internally; this is much more efficient for long recordings.
 
 The timebase of the estimate time series should ideally match the timebase of
 the reference time series, but if this is not the case, the estimate time
@@ -44,7 +48,6 @@ References
 
 import numpy as np
 import collections
-import scipy.interpolate
 from . import util
 import warnings
 
@@ -54,6 +57,96 @@ MAX_FREQ = 5000.  # The maximum allowable frequency (Hz)
 MIN_FREQ = 20.  # The minimum allowable frequency (Hz)
 
 
+class FlatFrequencies(collections.namedtuple('FlatFrequencies',
+                                             ['values', 'offsets'])):
+    """Flat representation of a multipitch frequency series.
+
+    All frequency values are stored in a single array, frame after frame, and
+    the values of frame ``i`` are ``values[offsets[i]:offsets[i + 1]]``
+    (as in the compressed sparse row format).  Every function of this module
+    which takes a list of frequency arrays also accepts this representation,
+    and returns its frequency series in the same representation as its input.
+
+    Attributes
+    ----------
+    values : np.ndarray, shape=(n_values,)
+        Frequency values of all frames
+    offsets : np.ndarray, shape=(n_frames + 1,), dtype=int
+        Index of the first value of each frame in ``values``, followed by
+        ``n_values``
+
+    """
+    __slots__ = ()
+
+
+def flatten_frequencies(frequencies):
+    """Convert a list of frequency arrays to a
+    :class:`mir_eval.multipitch.FlatFrequencies`.
+
+    Parameters
+    ----------
+    frequencies : list of np.ndarray or FlatFrequencies
+        Frequency values of each frame
+
+    Returns
+    -------
+    frequencies_flat : FlatFrequencies
+        The same frequency values, in flat representation
+
+    """
+    if isinstance(frequencies, FlatFrequencies):
+        return frequencies
+    num_freqs = [len(f) for f in frequencies]
+    offsets = np.zeros(len(num_freqs) + 1, dtype=int)
+    np.cumsum(num_freqs, out=offsets[1:])
+    values = np.concatenate(list(frequencies) + [np.empty(0)])
+    return FlatFrequencies(values, offsets)
+
+
+def unflatten_frequencies(frequencies):
+    """Convert a :class:`mir_eval.multipitch.FlatFrequencies` to a list of
+    frequency arrays.
+
+    Parameters
+    ----------
+    frequencies : FlatFrequencies or list of np.ndarray
+        Frequency values of each frame
+
+    Returns
+    -------
+    frequencies_list : list of np.ndarray
+        The same frequency values, as one array per frame
+
+    """
+    if not isinstance(frequencies, FlatFrequencies):
+        return frequencies
+    values, offsets = frequencies
+    bounds = offsets.tolist()
+    return [values[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _like(frequencies_flat, frequencies):
+    """Return ``frequencies_flat`` in the same representation as
+    ``frequencies``."""
+    if isinstance(frequencies, FlatFrequencies):
+        return frequencies_flat
+    return unflatten_frequencies(frequencies_flat)
+
+
+def _num_frames(frequencies):
+    """Number of frames of a frequency series in either representation."""
+    if isinstance(frequencies, FlatFrequencies):
+        return len(frequencies.offsets) - 1
+    return len(frequencies)
+
+
+def _frame(frequencies_flat, i):
+    """Frequency values of frame ``i`` of a ``FlatFrequencies``."""
+    values, offsets = frequencies_flat
+    return values[offsets[i]:offsets[i + 1]]
+
+
+@util.validator
 def validate(ref_time, ref_freqs, est_time, est_freqs):
     """Checks that the time and frequency inputs are well-formed.
 
@@ -61,11 +154,11 @@ def validate(ref_time, ref_freqs, est_time, est_freqs):
     ----------
     ref_time : np.ndarray
         reference time stamps in seconds
-    ref_freqs : list of np.ndarray
+    ref_freqs : list of np.ndarray or FlatFrequencies
         reference frequencies in Hz
     est_time : np.ndarray
         estimate time stamps in seconds
-    est_freqs : list of np.ndarray
+    est_freqs : list of np.ndarray or FlatFrequencies
         estimated frequencies in Hz
 
     """
@@ -73,31 +166,38 @@ def validate(ref_time, ref_freqs, est_time, est_freqs):
     util.validate_events(ref_time, max_time=MAX_TIME)
     util.validate_events(est_time, max_time=MAX_TIME)
 
+    n_ref_frames = _num_frames(ref_freqs)
+    n_est_frames = _num_frames(est_freqs)
     if ref_time.size == 0:
         warnings.warn("Reference times are empty.")
     if ref_time.ndim != 1:
         raise ValueError("Reference times have invalid dimension")
-    if len(ref_freqs) == 0:
+    if n_ref_frames == 0:
         warnings.warn("Reference frequencies are empty.")
     if est_time.size == 0:
         warnings.warn("Estimated times are empty.")
     if est_time.ndim != 1:
         raise ValueError("Estimated times have invalid dimension")
-    if len(est_freqs) == 0:
+    if n_est_frames == 0:
         warnings.warn("Estimated frequencies are empty.")
-    if ref_time.size != len(ref_freqs):
+    if ref_time.size != n_ref_frames:
         raise ValueError('Reference times and frequencies have unequal '
                          'lengths.')
-    if est_time.size != len(est_freqs):
+    if est_time.size != n_est_frames:
         raise ValueError('Estimate times and frequencies have unequal '
                          'lengths.')
 
-    for freq in ref_freqs:
-        util.validate_frequencies(freq, max_freq=MAX_FREQ, min_freq=MIN_FREQ,
-                                  allow_negatives=False)
-
-    for freq in est_freqs:
-        util.validate_frequencies(freq, max_freq=MAX_FREQ, min_freq=MIN_FREQ,
+    for freqs in [ref_freqs, est_freqs]:
+        if not isinstance(freqs, FlatFrequencies):
+            # Make sure frequency values are 1-d np ndarrays
+            for freq in freqs:
+                if freq.ndim != 1:
+                    raise ValueError('Frequencies should be 1-d numpy '
+                                     'ndarray, but shape={}'.format(
+                                         freq.shape))
+        # All frames are checked at once
+        util.validate_frequencies(flatten_frequencies(freqs).values,
+                                  max_freq=MAX_FREQ, min_freq=MIN_FREQ,
                                   allow_negatives=False)
 
 
@@ -109,23 +209,27 @@ def resample_multipitch(times, frequencies, target_times):
     ----------
     times : np.ndarray
         Array of time stamps
-    frequencies : list of np.ndarray
+    frequencies : list of np.ndarray or FlatFrequencies
         List of np.ndarrays of frequency values
     target_times : np.ndarray
         Array of target time stamps
 
     Returns
     -------
-    frequencies_resampled : list of numpy arrays
+    frequencies_resampled : list of numpy arrays or FlatFrequencies
         Frequency list of lists resampled to new timebase
     """
-    if target_times.size == 0:
-        return []
+    import scipy.interpolate
 
-    if times.size == 0:
-        return [np.array([])]*len(target_times)
+    values, offsets = flatten_frequencies(frequencies)
+    num_freqs = np.diff(offsets)
+    n_times = len(num_freqs)
 
-    n_times = len(frequencies)
+    if target_times.size == 0 or times.size == 0:
+        # No pitch estimate at any of the target times
+        return _like(FlatFrequencies(
+            np.empty(0), np.zeros(target_times.size + 1, dtype=int)),
+            frequencies)
 
     # scipy's interpolate doesn't handle ragged arrays. Instead, we interpolate
     # the frequency index and then map back to the frequency values.
@@ -137,17 +241,23 @@ def resample_multipitch(times, frequencies, target_times):
     # that is out of range. We handle this in the next line.
     new_frequency_index = scipy.interpolate.interp1d(
         times, frequency_index, kind='nearest', bounds_error=False,
-        assume_sorted=True, fill_value=n_times)(target_times)
+        assume_sorted=True, fill_value=n_times)(target_times).astype(int)
 
-    # create array of frequencies plus additional empty element at the end for
-    # target time stamps that are out of the interpolation range
-    freq_vals = frequencies + [np.array([])]
+    # add an empty frame at the end for target time stamps that are out of
+    # the interpolation range
+    num_freqs = np.append(num_freqs, 0)
+    starts = np.append(offsets[:-1], 0)
 
-    # map interpolated indices back to frequency values
-    frequencies_resampled = [
-        freq_vals[i] for i in new_frequency_index.astype(int)]
+    # gather the values of the selected frames
+    new_num_freqs = num_freqs[new_frequency_index]
+    new_offsets = np.zeros(len(new_num_freqs) + 1, dtype=int)
+    np.cumsum(new_num_freqs, out=new_offsets[1:])
+    value_index = (np.repeat(starts[new_frequency_index] - new_offsets[:-1],
+                             new_num_freqs) +
+                   np.arange(new_offsets[-1]))
 
-    return frequencies_resampled
+    return _like(FlatFrequencies(values[value_index], new_offsets),
+                 frequencies)
 
 
 def frequencies_to_midi(frequencies, ref_frequency=440.0):
@@ -155,17 +265,19 @@ def frequencies_to_midi(frequencies, ref_frequency=440.0):
 
     Parameters
     ----------
-    frequencies : list of np.ndarray
+    frequencies : list of np.ndarray or FlatFrequencies
         Original frequency values
     ref_frequency : float
         reference frequency in Hz.
 
     Returns
     -------
-    frequencies_midi : list of np.ndarray
+    frequencies_midi : list of np.ndarray or FlatFrequencies
         Continuous MIDI frequency values.
     """
-    return [69.0 + 12.0*np.log2(freqs/ref_frequency) for freqs in frequencies]
+    values, offsets = flatten_frequencies(frequencies)
+    return _like(FlatFrequencies(69.0 + 12.0*np.log2(values/ref_frequency),
+                                 offsets), frequencies)
 
 
 def midi_to_chroma(frequencies_midi):
@@ -173,16 +285,18 @@ def midi_to_chroma(frequencies_midi):
 
     Parameters
     ----------
-    frequencies_midi : list of np.ndarray
+    frequencies_midi : list of np.ndarray or FlatFrequencies
         Continuous MIDI note frequency values.
 
     Returns
     -------
-    frequencies_chroma : list of np.ndarray
+    frequencies_chroma : list of np.ndarray or FlatFrequencies
         Midi values wrapped to one octave.
 
     """
-    return [np.mod(freqs, 12) for freqs in frequencies_midi]
+    values, offsets = flatten_frequencies(frequencies_midi)
+    return _like(FlatFrequencies(np.mod(values, 12), offsets),
+                 frequencies_midi)
 
 
 def compute_num_freqs(frequencies):
@@ -190,7 +304,7 @@ def compute_num_freqs(frequencies):
 
     Parameters
     ----------
-    frequencies : list of np.ndarray
+    frequencies : list of np.ndarray or FlatFrequencies
         Frequency values
 
     Returns
@@ -198,7 +312,9 @@ def compute_num_freqs(frequencies):
     num_freqs : np.ndarray
         Number of frequencies at each time point.
     """
-    return np.array([f.size for f in frequencies])
+    if isinstance(frequencies, FlatFrequencies):
+        return np.diff(frequencies.offsets)
+    return np.array([len(f) for f in frequencies], dtype=int)
 
 
 def compute_num_true_positives(ref_freqs, est_freqs, window=0.5, chroma=False):
@@ -206,11 +322,15 @@ def compute_num_true_positives(ref_freqs, est_freqs, window=0.5, chroma=False):
     A frequency is correct if it is within a quartertone of the
     correct frequency.
 
+    The result is the same as the size of the matching computed by
+    :func:`mir_eval.util.match_events` for each frame, but all frames with the
+    same number of reference and estimated frequencies are matched at once.
+
     Parameters
     ----------
-    ref_freqs : list of np.ndarray
+    ref_freqs : list of np.ndarray or FlatFrequencies
         reference frequencies (MIDI)
-    est_freqs : list of np.ndarray
+    est_freqs : list of np.ndarray or FlatFrequencies
         estimated frequencies (MIDI)
     window : float
         Window size, in semitones
@@ -225,24 +345,160 @@ def compute_num_true_positives(ref_freqs, est_freqs, window=0.5, chroma=False):
         positives.
 
     """
-    n_frames = len(ref_freqs)
+    ref_freqs = flatten_frequencies(ref_freqs)
+    est_freqs = flatten_frequencies(est_freqs)
+    n_ref = compute_num_freqs(ref_freqs)
+    n_frames = len(n_ref)
     true_positives = np.zeros((n_frames, ))
-
-    for i, (ref_frame, est_frame) in enumerate(zip(ref_freqs, est_freqs)):
+    if n_frames == 0:
+        return true_positives
+    # Frames without an estimate have no true positives
+    n_est = np.zeros(n_frames, dtype=int)
+    n_est_frames = min(n_frames, len(est_freqs.offsets) - 1)
+    n_est[:n_est_frames] = compute_num_freqs(est_freqs)[:n_est_frames]
+
+    # Frames with the same number of reference and estimated frequencies are
+    # matched together, as a stack of small dense problems
+    frames = np.flatnonzero((n_ref > 0) & (n_est > 0))
+    shapes = n_ref[frames]*(n_est.max() + 1) + n_est[frames]
+    frames = frames[np.argsort(shapes, kind='mergesort')]
+    boundaries = np.flatnonzero(np.diff(np.sort(shapes))) + 1
+    for group in np.split(frames, boundaries):
+        if group.size == 0:
+            continue
+        ref = ref_freqs.values[ref_freqs.offsets[group, np.newaxis] +
+                               np.arange(n_ref[group[0]])]
+        est = est_freqs.values[est_freqs.offsets[group, np.newaxis] +
+                               np.arange(n_est[group[0]])]
         if chroma:
-            # match chroma-wrapped frequency events
-            matching = util.match_events(
-                ref_frame, est_frame, window,
-                distance=util._outer_distance_mod_n)
+            counts, matched = _match_frames_mod_n(ref, est, window)
+            true_positives[group[matched]] = counts[matched]
+            # Fall back to the general matching for the frames which could
+            # not be cut open
+            for i in group[~matched]:
+                true_positives[i] = len(util.match_events(
+                    _frame(ref_freqs, i), _frame(est_freqs, i), window,
+                    distance=util._outer_distance_mod_n))
         else:
-            # match frequency events within tolerance window in semitones
-            matching = util.match_events(ref_frame, est_frame, window)
-
-        true_positives[i] = len(matching)
+            true_positives[group] = _match_frames(ref, est, window)
 
     return true_positives
 
 
+def _greedy_match_counts(hits):
+    """Compute the size of a maximum matching in a stack of bipartite graphs
+    in which the neighbors of each reference form a contiguous range of
+    estimates, and where these ranges move monotonically with the reference
+    index (as is the case for sorted values matched within a window).
+
+    In this case, greedily matching each reference to its first unmatched
+    neighbor yields a maximum matching.
+
+    Parameters
+    ----------
+    hits : np.ndarray, shape=(n_frames, n_ref, n_est), dtype=bool
+        ``hits[i, j, k]`` is True if reference ``j`` can be matched to
+        estimate ``k`` in frame ``i``
+
+    Returns
+    -------
+    counts : np.ndarray, shape=(n_frames,)
+        Size of the maximum matching of each frame
+
+    """
+    n_frames, n_ref, n_est = hits.shape
+    rows = np.arange(n_frames)
+    counts = np.zeros(n_frames, dtype=int)
+    available = np.ones((n_frames, n_est), dtype=bool)
+    for j in range(n_ref):
+        candidates = hits[:, j] & available
+        found = candidates.any(axis=1)
+        first = np.argmax(candidates, axis=1)
+        available[rows[found], first[found]] = False
+        counts += found
+    return counts
+
+
+def _match_frames(ref, est, window):
+    """Count the matches of a stack of frames, equivalently to calling
+    :func:`mir_eval.util.match_events` on each frame.
+
+    Parameters
+    ----------
+    ref : np.ndarray, shape=(n_frames, n_ref)
+        Reference values of each frame
+    est : np.ndarray, shape=(n_frames, n_est)
+        Estimated values of each frame
+    window : float
+        Window size
+
+    Returns
+    -------
+    counts : np.ndarray, shape=(n_frames,)
+        Number of matched values in each frame
+
+    """
+    ref = np.sort(ref, axis=1)
+    est = np.sort(est, axis=1)
+    # Same comparisons as util._fast_hit_windows
+    hits = ((est[:, np.newaxis, :] - window <= ref[:, :, np.newaxis]) &
+            (ref[:, :, np.newaxis] <= est[:, np.newaxis, :] + window))
+    return _greedy_match_counts(hits)
+
+
+def _match_frames_mod_n(ref, est, window, modulus=12):
+    """Count the matches of a stack of frames of chroma values, equivalently
+    to calling :func:`mir_eval.util.match_events` with
+    ``distance=util._outer_distance_mod_n`` on each frame.
+
+    The circle of each frame is cut open in the middle of the largest gap
+    between its values, which no matching pair can straddle, and the values
+    are then matched in order from the cut on.
+
+    Parameters
+    ----------
+    ref : np.ndarray, shape=(n_frames, n_ref)
+        Reference values of each frame
+    est : np.ndarray, shape=(n_frames, n_est)
+        Estimated values of each frame
+    window : float
+        Window size
+    modulus : int
+        The modulus.
+        (Default value = 12)
+
+    Returns
+    -------
+    counts : np.ndarray, shape=(n_frames,)
+        Number of matched values in each frame
+    matched : np.ndarray, shape=(n_frames,), dtype=bool
+        False for the frames whose largest gap is too small to be sure that
+        no matching pair straddles it; their counts are not computed
+
+    """
+    ref = np.mod(ref, modulus)
+    est = np.mod(est, modulus)
+    rows = np.arange(ref.shape[0])[:, np.newaxis]
+
+    # Find the largest gap between consecutive values on the circle
+    values = np.sort(np.hstack([ref, est]), axis=1)
+    gaps = np.diff(np.hstack([values, values[:, :1] + modulus]), axis=1)
+    largest = np.argmax(gaps, axis=1)
+    # Leave a margin so that rounding errors cannot create a straddling hit
+    matched = gaps[rows[:, 0], largest] > 2*window
+    cut = values[rows[:, 0], largest] + gaps[rows[:, 0], largest]/2.
+
+    # Sort the values by their position counted from the cut
+    ref = ref[rows, np.argsort(np.mod(ref - cut[:, np.newaxis], modulus),
+                               axis=1)]
+    est = est[rows, np.argsort(np.mod(est - cut[:, np.newaxis], modulus),
+                               axis=1)]
+    # Same distance as util._outer_distance_mod_n
+    abs_diff = np.abs(ref[:, :, np.newaxis] - est[:, np.newaxis, :])
+    hits = np.minimum(abs_diff, modulus - abs_diff) <= window
+    return _greedy_match_counts(hits), matched
+
+
 def compute_accuracy(true_positives, n_ref, n_est):
     """Compute accuracy metrics.
 
@@ -361,11 +617,11 @@ def metrics(ref_time, ref_freqs, est_time, est_freqs, **kwargs):
     ----------
     ref_time : np.ndarray
         Time of each reference frequency value
-    ref_freqs : list of np.ndarray
+    ref_freqs : list of np.ndarray or FlatFrequencies
         List of np.ndarrays of reference frequency values
     est_time : np.ndarray
         Time of each estimated frequency value
-    est_freqs : list of np.ndarray
+    est_freqs : list of np.ndarray or FlatFrequencies
         List of np.ndarrays of estimate frequency values
     kwargs
         Additional keyword arguments which will be passed to the
@@ -405,6 +661,10 @@ def metrics(ref_time, ref_freqs, est_time, est_freqs, **kwargs):
     """
     validate(ref_time, ref_freqs, est_time, est_freqs)
 
+    # all frequencies are processed in the flat representation
+    ref_freqs = flatten_frequencies(ref_freqs)
+    est_freqs = flatten_frequencies(est_freqs)
+
     # resample est_freqs if est_times is different from ref_times
     if est_time.size != ref_time.size or not np.allclose(est_time, ref_time):
         warnings.warn("Estimate times not equal to reference times. "
@@ -453,6 +713,7 @@ def metrics(ref_time, ref_freqs, est_time, est_freqs, **kwargs):
             e_miss_chroma, e_fa_chroma, e_tot_chroma)
 
 
+@util.validate_once()
 def evaluate(ref_time, ref_freqs, est_time, est_freqs, **kwargs):
     """Evaluate two multipitch (multi-f0) transcriptions, where the first is
     treated as the reference (ground truth) and the second as the estimate to
@@ -469,11 +730,11 @@ def evaluate(ref_time, ref_freqs, est_time, est_freqs, **kwargs):
     ----------
     ref_time : np.ndarray
         Time of each reference frequency value
-    ref_freqs : list of np.ndarray
+    ref_freqs : list of np.ndarray or FlatFrequencies
         List of np.ndarrays of reference frequency values
     est_time : np.ndarray
         Time of each estimated frequency value
-    est_freqs : list of np.ndarray
+    est_freqs : list of np.ndarray or FlatFrequencies
         List of np.ndarrays of estimate frequency values
     kwargs
         Additional keyword arguments which will be passed to the
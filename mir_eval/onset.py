@@ -32,6 +32,7 @@ import warnings
 MAX_TIME = 30000.
 
 
+@util.validator
 def validate(reference_onsets, estimated_onsets):
     """Checks that the input annotations to a metric look like valid onset time
     arrays, and throws helpful errors if not.
@@ -98,6 +99,7 @@ def f_measure(reference_onsets, estimated_onsets, window=.05):
     return util.f_measure(precision, recall), precision, recall
 
 
+@util.validate_once()
 def evaluate(reference_onsets, estimated_onsets, **kwargs):
     """Compute all metrics for the given reference and estimated annotations.
 
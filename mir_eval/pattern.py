@@ -79,6 +79,7 @@ def _n_onset_midi(patterns):
     return len([o_m for pat in patterns for occ in pat for o_m in occ])
 
 
+@util.validator
 def validate(reference_patterns, estimated_patterns):
     """Checks that the input annotations to a metric look like valid pattern
     lists, and throws helpful errors if not.
@@ -112,25 +113,124 @@ def validate(reference_patterns, estimated_patterns):
                                          "contain exactly 2 elements.")
 
 
-def _occurrence_intersection(occ_P, occ_Q):
-    """Computes the intersection between two occurrences.
+def _encode_occurrences(occurrences):
+    """Encodes each distinct (onset, midi) pair of a list of occurrences as an
+    integer key.
 
     Parameters
     ----------
-    occ_P : list of tuples
-        (onset, midi) pairs representing the reference occurrence.
-    occ_Q : list
-        second list of (onset, midi) tuples
+    occurrences : list
+        List of occurrences, each a list of (onset, midi) tuples.
 
     Returns
     -------
-    S : set
-        Set of the intersection between occ_P and occ_Q.
+    incidence : scipy.sparse.csr_matrix, shape=(n_occurrences, n_keys)
+        ``incidence[i, k]`` is 1 if occurrence ``i`` contains the (onset, midi)
+        pair with key ``k``, and 0 otherwise.
+    lengths : np.ndarray, shape=(n_occurrences,)
+        Number of (onset, midi) tuples in each occurrence, including
+        duplicates.
 
     """
-    set_P = set([tuple(onset_midi) for onset_midi in occ_P])
-    set_Q = set([tuple(onset_midi) for onset_midi in occ_Q])
-    return set_P & set_Q    # Return the intersection
+    import scipy.sparse
+
+    lengths = np.array([len(occ) for occ in occurrences], dtype=int)
+    onset_midi = np.array([o_m for occ in occurrences for o_m in occ],
+                          dtype=float).reshape(-1, 2)
+    occurrence_index = np.repeat(np.arange(len(occurrences)), lengths)
+
+    # Sort the pairs, and start a new key wherever the pair changes
+    order = np.lexsort((onset_midi[:, 1], onset_midi[:, 0]))
+    sorted_pairs = onset_midi[order]
+    new_key = np.ones(len(order), dtype=int)
+    new_key[1:] = np.any(sorted_pairs[1:] != sorted_pairs[:-1], axis=1)
+    keys = np.empty(len(order), dtype=int)
+    keys[order] = np.cumsum(new_key) - 1
+
+    # Duplicate pairs within an occurrence only count once, as in a set
+    incidence = scipy.sparse.csr_matrix(
+        (np.ones(len(keys)), (occurrence_index, keys)),
+        shape=(len(occurrences), new_key.sum()))
+    incidence.data[:] = 1
+    return incidence, lengths
+
+
+def _intersection_counts(reference_patterns, estimated_patterns):
+    """Computes the size of the intersection of every reference occurrence
+    with every estimated occurrence, where each occurrence is taken as the
+    set of its (onset, midi) tuples.
+
+    Parameters
+    ----------
+    reference_patterns : list
+        The reference patterns in the format returned by
+        :func:`mir_eval.io.load_patterns()`
+    estimated_patterns : list
+        The estimated patterns in the same format
+
+    Returns
+    -------
+    counts : np.ndarray, shape=(n_ref_occurrences, n_est_occurrences)
+        Intersection sizes, where the occurrences of all patterns are numbered
+        consecutively.
+    ref_lengths : np.ndarray, shape=(n_ref_occurrences,)
+        Number of (onset, midi) tuples in each reference occurrence
+    est_lengths : np.ndarray, shape=(n_est_occurrences,)
+        Number of (onset, midi) tuples in each estimated occurrence
+    ref_bounds : np.ndarray, shape=(n_ref_patterns + 1,)
+        The occurrences of reference pattern ``i`` are numbered
+        ``ref_bounds[i]`` to ``ref_bounds[i + 1] - 1``
+    est_bounds : np.ndarray, shape=(n_est_patterns + 1,)
+        Same for the estimated patterns
+
+    """
+    ref_occs = [occ for pattern in reference_patterns for occ in pattern]
+    est_occs = [occ for pattern in estimated_patterns for occ in pattern]
+    # Encode the reference and estimated pairs with the same keys
+    incidence, lengths = _encode_occurrences(ref_occs + est_occs)
+    ref_incidence = incidence[:len(ref_occs)]
+    est_incidence = incidence[len(ref_occs):]
+    counts = ref_incidence.dot(est_incidence.T).toarray()
+
+    ref_bounds = np.cumsum([0] + [len(pattern)
+                                  for pattern in reference_patterns])
+    est_bounds = np.cumsum([0] + [len(pattern)
+                                  for pattern in estimated_patterns])
+    return (counts, lengths[:len(ref_occs)], lengths[len(ref_occs):],
+            ref_bounds, est_bounds)
+
+
+def _score_matrix(counts, ref_lengths, est_lengths, similarity_metric):
+    """Computes the score matrix between occurrences from their intersection
+    sizes.
+
+    Parameters
+    ----------
+    counts : np.ndarray, shape=(n_ref_occurrences, n_est_occurrences)
+        Intersection size of each pair of occurrences
+    ref_lengths : np.ndarray, shape=(n_ref_occurrences,)
+        Number of (onset, midi) tuples in each reference occurrence
+    est_lengths : np.ndarray, shape=(n_est_occurrences,)
+        Number of (onset, midi) tuples in each estimated occurrence
+    similarity_metric : str
+        A string representing the metric to be used
+        when computing the similarity matrix. Accepted values:
+        - "cardinality_score":
+            Count of the intersection between occurrences.
+
+    Returns
+    -------
+    sm : np.array
+        The score matrix using the similarity_metric.
+
+    """
+    if similarity_metric == "cardinality_score":
+        denom = np.maximum.outer(ref_lengths, est_lengths).astype(float)
+        return counts / denom
+    # TODO: More scores: 'normalised matching socre'
+    else:
+        raise ValueError("The similarity metric (%s) can only be: "
+                         "'cardinality_score'.")
 
 
 def _compute_score_matrix(P, Q, similarity_metric="cardinality_score"):
@@ -155,19 +255,118 @@ def _compute_score_matrix(P, Q, similarity_metric="cardinality_score"):
         The score matrix between P and Q using the similarity_metric.
 
     """
-    sm = np.zeros((len(P), len(Q)))     # The score matrix
-    for iP, occ_P in enumerate(P):
-        for iQ, occ_Q in enumerate(Q):
-            if similarity_metric == "cardinality_score":
-                denom = float(np.max([len(occ_P), len(occ_Q)]))
-                # Compute the score
-                sm[iP, iQ] = len(_occurrence_intersection(occ_P, occ_Q)) / \
-                    denom
-            # TODO: More scores: 'normalised matching socre'
-            else:
-                raise ValueError("The similarity metric (%s) can only be: "
-                                 "'cardinality_score'.")
-    return sm
+    counts, ref_lengths, est_lengths, _, _ = _intersection_counts([P], [Q])
+    return _score_matrix(counts, ref_lengths, est_lengths, similarity_metric)
+
+
+class _PatternScores(object):
+    """Pairwise scores of the occurrences and patterns of a reference and an
+    estimation, shared by the metrics.  Every matrix is computed on first use
+    and memoized, so that computing several metrics for the same patterns
+    (as in :func:`mir_eval.pattern.evaluate`) computes it only once.
+
+    Parameters
+    ----------
+    reference_patterns : list
+        The reference patterns in the format returned by
+        :func:`mir_eval.io.load_patterns()`
+    estimated_patterns : list
+        The estimated patterns in the same format
+
+    """
+
+    def __init__(self, reference_patterns, estimated_patterns):
+        self.reference_patterns = reference_patterns
+        self.estimated_patterns = estimated_patterns
+        # If no patterns were provided, metrics are zero
+        self.empty = (_n_onset_midi(reference_patterns) == 0 or
+                      _n_onset_midi(estimated_patterns) == 0)
+        self._cache = {}
+
+    def _memoize(self, key, function, *args):
+        """Return ``function(*args)``, computing it only once per key."""
+        if key not in self._cache:
+            self._cache[key] = function(*args)
+        return self._cache[key]
+
+    def intersection_counts(self):
+        """See :func:`mir_eval.pattern._intersection_counts`."""
+        return self._memoize('counts', _intersection_counts,
+                             self.reference_patterns, self.estimated_patterns)
+
+    def _pattern_blocks(self, matrix):
+        """Iterate over the (iP, iQ, block) of an occurrence matrix, where
+        block contains the rows of the occurrences of reference pattern iP and
+        the columns of the occurrences of estimated pattern iQ."""
+        _, _, _, ref_bounds, est_bounds = self.intersection_counts()
+        for iP in range(len(ref_bounds) - 1):
+            for iQ in range(len(est_bounds) - 1):
+                yield iP, iQ, matrix[ref_bounds[iP]:ref_bounds[iP + 1],
+                                     est_bounds[iQ]:est_bounds[iQ + 1]]
+
+    def score_matrix(self, similarity_metric):
+        """Score of each pair of occurrences, as computed by
+        :func:`mir_eval.pattern._compute_score_matrix` for each pair of
+        patterns."""
+        def compute():
+            counts, ref_lengths, est_lengths, _, _ = \
+                self.intersection_counts()
+            return _score_matrix(counts, ref_lengths, est_lengths,
+                                 similarity_metric)
+        return self._memoize(('score', similarity_metric), compute)
+
+    def establishment_matrix(self, similarity_metric):
+        """Maximum occurrence score of each pair of patterns."""
+        def compute():
+            _, _, _, ref_bounds, est_bounds = self.intersection_counts()
+            return np.maximum.reduceat(
+                np.maximum.reduceat(self.score_matrix(similarity_metric),
+                                    ref_bounds[:-1], axis=0),
+                est_bounds[:-1], axis=1)
+        return self._memoize(('establishment', similarity_metric), compute)
+
+    def occurrence_matrices(self, similarity_metric):
+        """Occurrence precision and recall of each pair of patterns."""
+        def compute():
+            O_P = np.zeros((len(self.reference_patterns),
+                            len(self.estimated_patterns)))
+            O_R = np.zeros(O_P.shape)
+            for iP, iQ, s in self._pattern_blocks(
+                    self.score_matrix(similarity_metric)):
+                O_P[iP, iQ] = np.mean(np.max(s, axis=0))
+                O_R[iP, iQ] = np.mean(np.max(s, axis=1))
+            return O_P, O_R
+        return self._memoize(('occurrence', similarity_metric), compute)
+
+    def first_layer(self):
+        """First layer F-measure of each pair of occurrences."""
+        def compute():
+            counts, ref_lengths, est_lengths, _, _ = \
+                self.intersection_counts()
+            # Compute the first layer scores from the length of the
+            # intersection between reference and estimation
+            precision = counts / ref_lengths[:, np.newaxis].astype(float)
+            recall = counts / est_lengths.astype(float)
+            # Same as util.f_measure, which is 0 when there is no
+            # intersection
+            F_1 = np.zeros(counts.shape)
+            nonzero = counts > 0
+            F_1[nonzero] = (2*precision[nonzero]*recall[nonzero] /
+                            (precision[nonzero] + recall[nonzero]))
+            return F_1
+        return self._memoize('layer 1', compute)
+
+    def second_layer(self):
+        """Second layer F-measure of each pair of patterns."""
+        def compute():
+            F_2 = np.zeros((len(self.reference_patterns),
+                            len(self.estimated_patterns)))
+            for iP, iQ, F_1 in self._pattern_blocks(self.first_layer()):
+                precision = np.mean(np.max(F_1, axis=0))
+                recall = np.mean(np.max(F_1, axis=1))
+                F_2[iP, iQ] = util.f_measure(precision, recall)
+            return F_2
+        return self._memoize('layer 2', compute)
 
 
 def standard_FPR(reference_patterns, estimated_patterns, tol=1e-5):
@@ -281,20 +480,45 @@ def establishment_FPR(reference_patterns, estimated_patterns,
 
     """
     validate(reference_patterns, estimated_patterns)
-    nP = len(reference_patterns)    # Number of elements in reference
-    nQ = len(estimated_patterns)    # Number of elements in estimation
-    S = np.zeros((nP, nQ))          # Establishment matrix
+    return _establishment_FPR(
+        _PatternScores(reference_patterns, estimated_patterns),
+        similarity_metric)
+
+
+def _establishment_FPR(pattern_scores, similarity_metric="cardinality_score",
+                       n_estimated=None):
+    """Establishment F1 Score, Precision and Recall, computed from the
+    shared pattern scores.
+
+    Parameters
+    ----------
+    pattern_scores : _PatternScores
+        Pairwise scores of the reference and estimated patterns
+    similarity_metric : str
+        See :func:`mir_eval.pattern.establishment_FPR`
+        (Default value = "cardinality_score")
+    n_estimated : int or None
+        If not None, only the first ``n_estimated`` estimated patterns are
+        considered.
+        (Default value = None)
+
+    Returns
+    -------
+    f_measure : float
+        The establishment F1 Score
+    precision : float
+        The establishment Precision
+    recall : float
+        The establishment Recall
 
+    """
     # If no patterns were provided, metric is zero
-    if _n_onset_midi(reference_patterns) == 0 or \
-       _n_onset_midi(estimated_patterns) == 0:
+    if pattern_scores.empty or _n_onset_midi(
+            pattern_scores.estimated_patterns[:n_estimated]) == 0:
         return 0., 0., 0.
 
-    for iP, ref_pattern in enumerate(reference_patterns):
-        for iQ, est_pattern in enumerate(estimated_patterns):
-            s = _compute_score_matrix(ref_pattern, est_pattern,
-                                      similarity_metric)
-            S[iP, iQ] = np.max(s)
+    # Establishment matrix
+    S = pattern_scores.establishment_matrix(similarity_metric)[:, :n_estimated]
 
     # Compute scores
     precision = np.mean(np.max(S, axis=0))
@@ -348,39 +572,57 @@ def occurrence_FPR(reference_patterns, estimated_patterns, thres=.75,
 
     """
     validate(reference_patterns, estimated_patterns)
-    # Number of elements in reference
-    nP = len(reference_patterns)
-    # Number of elements in estimation
-    nQ = len(estimated_patterns)
-    # Occurrence matrix with Precision and recall in its last dimension
-    O_PR = np.zeros((nP, nQ, 2))
+    return _occurrence_FPR(
+        _PatternScores(reference_patterns, estimated_patterns), thres,
+        similarity_metric)
+
+
+def _occurrence_FPR(pattern_scores, thres=.75,
+                    similarity_metric="cardinality_score"):
+    """Occurrence F1 Score, Precision and Recall, computed from the shared
+    pattern scores.
 
-    # Index of the values that are greater than the specified threshold
-    rel_idx = np.empty((0, 2), dtype=int)
+    Parameters
+    ----------
+    pattern_scores : _PatternScores
+        Pairwise scores of the reference and estimated patterns
+    thres : float
+        See :func:`mir_eval.pattern.occurrence_FPR`
+        (Default value = .75)
+    similarity_metric : str
+        See :func:`mir_eval.pattern.occurrence_FPR`
+        (Default value = "cardinality_score")
+
+    Returns
+    -------
+    f_measure : float
+        The establishment F1 Score
+    precision : float
+        The establishment Precision
+    recall : float
+        The establishment Recall
 
+    """
     # If no patterns were provided, metric is zero
-    if _n_onset_midi(reference_patterns) == 0 or \
-       _n_onset_midi(estimated_patterns) == 0:
+    if pattern_scores.empty:
         return 0., 0., 0.
 
-    for iP, ref_pattern in enumerate(reference_patterns):
-        for iQ, est_pattern in enumerate(estimated_patterns):
-            s = _compute_score_matrix(ref_pattern, est_pattern,
-                                      similarity_metric)
-            if np.max(s) >= thres:
-                O_PR[iP, iQ, 0] = np.mean(np.max(s, axis=0))
-                O_PR[iP, iQ, 1] = np.mean(np.max(s, axis=1))
-                rel_idx = np.vstack((rel_idx, [iP, iQ]))
+    # Index of the pairs of patterns whose occurrences are similar enough
+    relevant = (pattern_scores.establishment_matrix(similarity_metric) >=
+                thres)
+    rel_idx = np.argwhere(relevant)
 
     # Compute the scores
     if len(rel_idx) == 0:
         precision = 0
         recall = 0
     else:
-        P = O_PR[:, :, 0]
+        # Occurrence Precision and recall of the relevant pairs
+        O_P, O_R = pattern_scores.occurrence_matrices(similarity_metric)
+        P = np.where(relevant, O_P, 0.)
         precision = np.mean(np.max(P[np.ix_(rel_idx[:, 0], rel_idx[:, 1])],
                                    axis=0))
-        R = O_PR[:, :, 1]
+        R = np.where(relevant, O_R, 0.)
         recall = np.mean(np.max(R[np.ix_(rel_idx[:, 0], rel_idx[:, 1])],
                                 axis=1))
     f_measure = util.f_measure(precision, recall)
@@ -416,102 +658,40 @@ def three_layer_FPR(reference_patterns, estimated_patterns):
 
     """
     validate(reference_patterns, estimated_patterns)
+    return _three_layer_FPR(
+        _PatternScores(reference_patterns, estimated_patterns))
 
-    def compute_first_layer_PR(ref_occs, est_occs):
-        """Computes the first layer Precision and Recall values given the
-        set of occurrences in the reference and the set of occurrences in the
-        estimation.
-
-        Parameters
-        ----------
-        ref_occs :
-
-        est_occs :
-
-
-        Returns
-        -------
-
-        """
-        # Find the length of the intersection between reference and estimation
-        s = len(_occurrence_intersection(ref_occs, est_occs))
-
-        # Compute the first layer scores
-        precision = s / float(len(ref_occs))
-        recall = s / float(len(est_occs))
-        return precision, recall
-
-    def compute_second_layer_PR(ref_pattern, est_pattern):
-        """Computes the second layer Precision and Recall values given the
-        set of occurrences in the reference and the set of occurrences in the
-        estimation.
-
-        Parameters
-        ----------
-        ref_pattern :
-
-        est_pattern :
-
-
-        Returns
-        -------
-
-        """
-        # Compute the first layer scores
-        F_1 = compute_layer(ref_pattern, est_pattern)
-
-        # Compute the second layer scores
-        precision = np.mean(np.max(F_1, axis=0))
-        recall = np.mean(np.max(F_1, axis=1))
-        return precision, recall
-
-    def compute_layer(ref_elements, est_elements, layer=1):
-        """Computes the F-measure matrix for a given layer. The reference and
-        estimated elements can be either patters or occurrences, depending
-        on the layer.
-
-        For layer 1, the elements must be occurrences.
-        For layer 2, the elements must be patterns.
 
-        Parameters
-        ----------
-        ref_elements :
+def _three_layer_FPR(pattern_scores, n_estimated=None):
+    """Three Layer F1 Score, Precision and Recall, computed from the shared
+    pattern scores.
 
-        est_elements :
-
-        layer :
-             (Default value = 1)
-
-        Returns
-        -------
-
-        """
-        if layer != 1 and layer != 2:
-            raise ValueError("Layer (%d) must be an integer between 1 and 2"
-                             % layer)
-
-        nP = len(ref_elements)      # Number of elements in reference
-        nQ = len(est_elements)      # Number of elements in estimation
-        F = np.zeros((nP, nQ))      # F-measure matrix for the given layer
-        for iP in range(nP):
-            for iQ in range(nQ):
-                if layer == 1:
-                    func = compute_first_layer_PR
-                elif layer == 2:
-                    func = compute_second_layer_PR
+    Parameters
+    ----------
+    pattern_scores : _PatternScores
+        Pairwise scores of the reference and estimated patterns
+    n_estimated : int or None
+        If not None, only the first ``n_estimated`` estimated patterns are
+        considered.
+        (Default value = None)
 
-                # Compute layer scores
-                precision, recall = func(ref_elements[iP], est_elements[iQ])
-                F[iP, iQ] = util.f_measure(precision, recall)
-        return F
+    Returns
+    -------
+    f_measure : float
+        The three-layer F1 Score
+    precision : float
+        The three-layer Precision
+    recall : float
+        The three-layer Recall
 
+    """
     # If no patterns were provided, metric is zero
-    if _n_onset_midi(reference_patterns) == 0 or \
-       _n_onset_midi(estimated_patterns) == 0:
+    if pattern_scores.empty or _n_onset_midi(
+            pattern_scores.estimated_patterns[:n_estimated]) == 0:
         return 0., 0., 0.
 
     # Compute the second layer (it includes the first layer)
-    F_2 = compute_layer(reference_patterns, estimated_patterns, layer=2)
+    F_2 = pattern_scores.second_layer()[:, :n_estimated]
 
     # Compute the final scores (third layer)
     precision_3 = np.mean(np.max(F_2, axis=0))
@@ -554,16 +734,34 @@ def first_n_three_layer_P(reference_patterns, estimated_patterns, n=5):
     """
 
     validate(reference_patterns, estimated_patterns)
+    return _first_n_three_layer_P(
+        _PatternScores(reference_patterns, estimated_patterns), n)
+
+
+def _first_n_three_layer_P(pattern_scores, n=5):
+    """First n three-layer precision, computed from the shared pattern
+    scores by only keeping the scores of the first n estimated patterns.
+
+    Parameters
+    ----------
+    pattern_scores : _PatternScores
+        Pairwise scores of the reference and estimated patterns
+    n : int
+        Number of patterns to consider from the estimated results
+        (Default value = 5)
+
+    Returns
+    -------
+    precision : float
+        The first n three-layer Precision
+
+    """
     # If no patterns were provided, metric is zero
-    if _n_onset_midi(reference_patterns) == 0 or \
-       _n_onset_midi(estimated_patterns) == 0:
+    if pattern_scores.empty:
         return 0., 0., 0.
 
-    # Get only the first n patterns from the estimated results
-    fn_est_patterns = estimated_patterns[:min(len(estimated_patterns), n)]
-
     # Compute the three-layer scores for the first n estimated patterns
-    F, P, R = three_layer_FPR(reference_patterns, fn_est_patterns)
+    F, P, R = _three_layer_FPR(pattern_scores, n_estimated=n)
 
     return P    # Return the precision only
 
@@ -602,18 +800,38 @@ def first_n_target_proportion_R(reference_patterns, estimated_patterns, n=5):
     """
 
     validate(reference_patterns, estimated_patterns)
+    return _first_n_target_proportion_R(
+        _PatternScores(reference_patterns, estimated_patterns), n)
+
+
+def _first_n_target_proportion_R(pattern_scores, n=5):
+    """First n target proportion establishment recall, computed from the
+    shared pattern scores by only keeping the scores of the first n estimated
+    patterns.
+
+    Parameters
+    ----------
+    pattern_scores : _PatternScores
+        Pairwise scores of the reference and estimated patterns
+    n : int
+        Number of patterns to consider from the estimated results
+        (Default value = 5)
+
+    Returns
+    -------
+    recall : float
+        The first n target proportion Recall.
+
+    """
     # If no patterns were provided, metric is zero
-    if _n_onset_midi(reference_patterns) == 0 or \
-       _n_onset_midi(estimated_patterns) == 0:
+    if pattern_scores.empty:
         return 0., 0., 0.
 
-    # Get only the first n patterns from the estimated results
-    fn_est_patterns = estimated_patterns[:min(len(estimated_patterns), n)]
-
-    F, P, R = establishment_FPR(reference_patterns, fn_est_patterns)
+    F, P, R = _establishment_FPR(pattern_scores, n_estimated=n)
     return R
 
 
+@util.validate_once()
 def evaluate(ref_patterns, est_patterns, **kwargs):
     """Load data and perform the evaluation.
 
@@ -642,6 +860,11 @@ def evaluate(ref_patterns, est_patterns, **kwargs):
 
     """
 
+    validate(ref_patterns, est_patterns)
+    # The occurrence and pattern scores used by all metrics but the standard
+    # scores are computed only once
+    pattern_scores = _PatternScores(ref_patterns, est_patterns)
+
     # Compute all the metrics
     scores = collections.OrderedDict()
 
@@ -651,33 +874,29 @@ def evaluate(ref_patterns, est_patterns, **kwargs):
 
     # Establishment scores
     scores['F_est'], scores['P_est'], scores['R_est'] = \
-        util.filter_kwargs(establishment_FPR, ref_patterns, est_patterns,
-                           **kwargs)
+        util.filter_kwargs(_establishment_FPR, pattern_scores, **kwargs)
 
     # Occurrence scores
     # Force these values for thresh
     kwargs['thresh'] = .5
     scores['F_occ.5'], scores['P_occ.5'], scores['R_occ.5'] = \
-        util.filter_kwargs(occurrence_FPR, ref_patterns, est_patterns,
-                           **kwargs)
+        util.filter_kwargs(_occurrence_FPR, pattern_scores, **kwargs)
     kwargs['thresh'] = .75
     scores['F_occ.75'], scores['P_occ.75'], scores['R_occ.75'] = \
-        util.filter_kwargs(occurrence_FPR, ref_patterns, est_patterns,
-                           **kwargs)
+        util.filter_kwargs(_occurrence_FPR, pattern_scores, **kwargs)
 
     # Three-layer scores
     scores['F_3'], scores['P_3'], scores['R_3'] = \
-        util.filter_kwargs(three_layer_FPR, ref_patterns, est_patterns,
-                           **kwargs)
+        util.filter_kwargs(_three_layer_FPR, pattern_scores, **kwargs)
 
     # First Five Patterns scores
     # Set default value of n
     if 'n' not in kwargs:
         kwargs['n'] = 5
-    scores['FFP'] = util.filter_kwargs(first_n_three_layer_P, ref_patterns,
-                                       est_patterns, **kwargs)
+    scores['FFP'] = util.filter_kwargs(_first_n_three_layer_P,
+                                       pattern_scores, **kwargs)
     scores['FFTP_est'] = \
-        util.filter_kwargs(first_n_target_proportion_R, ref_patterns,
-                           est_patterns, **kwargs)
+        util.filter_kwargs(_first_n_target_proportion_R, pattern_scores,
+                           **kwargs)
 
     return scores
@@ -0,0 +1,291 @@
+'''
+Opt-in instrumentation of the metric functions, for finding out which metric
+(or which internal stage of a metric) dominates the run time of an
+``evaluate`` call.
+
+While a :class:`mir_eval.profiling.Profiler` is active, the functions of the
+task submodules (and of :mod:`mir_eval.util`) are replaced by wrappers which
+record the wall time, the number of calls and, optionally, the peak memory
+allocated by every call.  The original functions are restored when the
+profiler is stopped, so there is no overhead at all when profiling is not
+enabled.
+
+Conventions
+-----------
+
+Each instrumented function is assigned to one of the following stages,
+according to its name:
+
+* ``'validation'``: input checks, e.g. :func:`mir_eval.beat.validate`
+* ``'resampling'``: conversion of annotations to a common timebase, e.g.
+  :func:`mir_eval.melody.resample_melody_series`
+* ``'matching'``: matching of reference and estimated events, e.g.
+  :func:`mir_eval.util.match_events`
+* ``'evaluate'``: the ``evaluate`` functions themselves
+* ``'scoring'``: everything else
+
+Examples
+--------
+>>> with mir_eval.profiling.Profiler() as profiler:
+...     scores = mir_eval.beat.evaluate(reference_beats, estimated_beats)
+>>> stats = profiler.to_dict()
+>>> stats['functions']['mir_eval.beat.p_score']['time']
+0.0123...
+>>> profiler.save_chrome_trace('beat.json')
+
+The resulting trace file can be inspected with ``chrome://tracing`` or
+https://ui.perfetto.dev.
+'''
+
+import collections
+import functools
+import importlib
+import inspect
+import json
+import os
+import threading
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+# Submodules whose functions are instrumented by default
+MODULES = ['beat', 'chord', 'hierarchy', 'key', 'melody', 'multipitch',
+           'onset', 'pattern', 'segment', 'separation', 'tempo',
+           'transcription', 'transcription_velocity', 'util']
+
+# Functions which are never instrumented, because they are part of the
+# call machinery used by the evaluate functions
+_EXCLUDE = ['mir_eval.util.filter_kwargs', 'mir_eval.util.has_kwargs']
+
+_RESAMPLING = ['to_cent_voicing', 'constant_hop_timebase', 'trim_beats',
+               'interpolate_intervals', 'intervals_to_samples',
+               'adjust_intervals', 'adjust_events', '_align_intervals']
+
+_MATCHING = ['_fast_hit_windows', '_bipartite_match']
+
+# The currently active profiler, if any
+_ACTIVE = None
+
+
+def _stage(name):
+    '''Assign a function name to a stage.'''
+    if 'validate' in name:
+        return 'validation'
+    if 'resample' in name or name in _RESAMPLING:
+        return 'resampling'
+    if 'match' in name or name in _MATCHING:
+        return 'matching'
+    if name == 'evaluate':
+        return 'evaluate'
+    return 'scoring'
+
+
+class Profiler(object):
+    '''Record per-function timing statistics of the mir_eval metrics.
+
+    The profiler can be used as a context manager, or enabled globally by
+    calling :meth:`start` and :meth:`stop`.  Only one profiler may be active
+    at a time.
+
+    Parameters
+    ----------
+    modules : list of str or None
+        Names of the submodules to instrument, by default
+        ``mir_eval.profiling.MODULES``
+    memory : bool
+        If True, also record the peak memory allocated by each call, using
+        ``tracemalloc``.  This slows down the instrumented code considerably
+        and requires Python >= 3.9.
+        (Default value = False)
+    callback : function or None
+        If provided, ``callback(event)`` is called after every instrumented
+        call with a dict describing the call (see :meth:`events`).
+    '''
+
+    def __init__(self, modules=None, memory=False, callback=None):
+        if memory and (tracemalloc is None or
+                       not hasattr(tracemalloc, 'reset_peak')):
+            raise ValueError('memory=True requires tracemalloc.reset_peak '
+                             '(Python >= 3.9)')
+        if modules is None:
+            modules = MODULES
+        self.modules = [importlib.import_module('mir_eval.' + m)
+                        for m in modules]
+        self.memory = memory
+        self.callback = callback
+        self.events = []
+        self._originals = []
+        self._local = threading.local()
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        '''Replace the functions of the instrumented modules by timing
+        wrappers.'''
+        global _ACTIVE
+        if _ACTIVE is not None:
+            raise RuntimeError('Another profiler is already active.')
+        _ACTIVE = self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        module_names = set(module.__name__ for module in self.modules)
+        wrappers = {}
+        for module in self.modules:
+            for name, function in inspect.getmembers(module,
+                                                     inspect.isfunction):
+                qualified_name = '{}.{}'.format(function.__module__,
+                                                function.__name__)
+                # Functions imported from other instrumented modules (e.g.
+                # segment.validate_structure in hierarchy) are wrapped too
+                if (function.__module__ not in module_names or
+                        qualified_name in _EXCLUDE):
+                    continue
+                if function not in wrappers:
+                    wrappers[function] = self._wrap(function, qualified_name)
+                self._originals.append((module, name, function))
+                setattr(module, name, wrappers[function])
+
+    def stop(self):
+        '''Restore the original functions.'''
+        global _ACTIVE
+        for module, name, function in reversed(self._originals):
+            setattr(module, name, function)
+        self._originals = []
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        _ACTIVE = None
+
+    def _stack(self):
+        '''Per-thread stack of the currently running instrumented calls.'''
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _wrap(self, function, qualified_name):
+        '''Construct the timing wrapper of a function.'''
+        stage = _stage(function.__name__)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            stack = self._stack()
+            frame = {'children': 0.}
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                if stack:
+                    stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+                tracemalloc.reset_peak()
+                frame['start_memory'] = frame['peak'] = current
+            stack.append(frame)
+            start = timeit.default_timer()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                end = timeit.default_timer()
+                stack.pop()
+                event = {'name': qualified_name,
+                         'stage': stage,
+                         'start': start,
+                         'time': end - start,
+                         'self_time': end - start - frame['children'],
+                         'thread': threading.current_thread().ident}
+                if stack:
+                    stack[-1]['children'] += end - start
+                if self.memory:
+                    frame['peak'] = max(frame['peak'],
+                                        tracemalloc.get_traced_memory()[1])
+                    event['peakmem'] = frame['peak'] - frame['start_memory']
+                    if stack:
+                        stack[-1]['peak'] = max(stack[-1]['peak'],
+                                                frame['peak'])
+                    tracemalloc.reset_peak()
+                self.events.append(event)
+                if self.callback is not None:
+                    self.callback(event)
+
+        # functools.wraps only sets __wrapped__ on Python 3
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    def to_dict(self):
+        '''Summarize the recorded calls.
+
+        Returns
+        -------
+        stats : dict
+            ``stats['functions'][name]`` contains, for each instrumented
+            function which was called, its ``'stage'``, the number of
+            ``'calls'``, the total ``'time'`` spent in it (in seconds,
+            including nested instrumented calls), the ``'self_time'``
+            excluding nested instrumented calls and, if ``memory`` is
+            enabled, the maximum ``'peakmem'`` allocated by a call (in bytes).
+            ``stats['stages'][stage]`` contains the total ``'self_time'`` and
+            number of ``'calls'`` of each stage.
+        '''
+        functions = collections.OrderedDict()
+        stages = collections.OrderedDict()
+        for event in self.events:
+            if event['name'] not in functions:
+                functions[event['name']] = {'stage': event['stage'],
+                                            'calls': 0, 'time': 0.,
+                                            'self_time': 0.}
+                if self.memory:
+                    functions[event['name']]['peakmem'] = 0
+            stats = functions[event['name']]
+            stats['calls'] += 1
+            stats['time'] += event['time']
+            stats['self_time'] += event['self_time']
+            if self.memory:
+                stats['peakmem'] = max(stats['peakmem'], event['peakmem'])
+            stage = stages.setdefault(event['stage'],
+                                      {'calls': 0, 'self_time': 0.})
+            stage['calls'] += 1
+            stage['self_time'] += event['self_time']
+        return {'functions': functions, 'stages': stages}
+
+    def to_chrome_trace(self):
+        '''Convert the recorded calls to the Chrome trace event format.
+
+        Returns
+        -------
+        trace : dict
+            JSON-serializable trace with one complete (``'X'``) event per
+            instrumented call.
+        '''
+        if self.events:
+            origin = min(event['start'] for event in self.events)
+        pid = os.getpid()
+        trace_events = []
+        for event in self.events:
+            trace_event = {'name': event['name'].split('.', 1)[-1],
+                           'cat': event['stage'],
+                           'ph': 'X',
+                           'ts': 1e6 * (event['start'] - origin),
+                           'dur': 1e6 * event['time'],
+                           'pid': pid,
+                           'tid': event['thread']}
+            if self.memory:
+                trace_event['args'] = {'peakmem': event['peakmem']}
+            trace_events.append(trace_event)
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def save_chrome_trace(self, filename):
+        '''Write the recorded calls to a Chrome trace JSON file.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the output file
+        '''
+        with open(filename, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
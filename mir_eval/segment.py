@@ -76,14 +76,11 @@ import collections
 import warnings
 
 import numpy as np
-import scipy.stats
-import scipy.sparse
-import scipy.misc
-import scipy.special
 
 from . import util
 
 
+@util.validator
 def validate_boundary(reference_intervals, estimated_intervals, trim):
     """Checks that the input annotations to a segment boundary estimation
     metric (i.e. one that only takes in segment intervals) look like valid
@@ -123,6 +120,7 @@ def validate_boundary(reference_intervals, estimated_intervals, trim):
         util.validate_intervals(intervals)
 
 
+@util.validator
 def validate_structure(reference_intervals, reference_labels,
                        estimated_intervals, estimated_labels):
     """Checks that the input annotations to a structure estimation metric (i.e.
@@ -387,16 +385,14 @@ def pairwise(reference_intervals, reference_labels,
     # Generate the cluster labels
     y_ref = util.intervals_to_samples(reference_intervals,
                                       reference_labels,
-                                      sample_size=frame_size)[-1]
-
-    y_ref = util.index_labels(y_ref)[0]
+                                      sample_size=frame_size,
+                                      return_index=True)[1]
 
     # Map to index space
     y_est = util.intervals_to_samples(estimated_intervals,
                                       estimated_labels,
-                                      sample_size=frame_size)[-1]
-
-    y_est = util.index_labels(y_est)[0]
+                                      sample_size=frame_size,
+                                      return_index=True)[1]
 
     # Build the reference label agreement matrix
     agree_ref = np.equal.outer(y_ref, y_ref)
@@ -481,16 +477,14 @@ def rand_index(reference_intervals, reference_labels,
     # Generate the cluster labels
     y_ref = util.intervals_to_samples(reference_intervals,
                                       reference_labels,
-                                      sample_size=frame_size)[-1]
-
-    y_ref = util.index_labels(y_ref)[0]
+                                      sample_size=frame_size,
+                                      return_index=True)[1]
 
     # Map to index space
     y_est = util.intervals_to_samples(estimated_intervals,
                                       estimated_labels,
-                                      sample_size=frame_size)[-1]
-
-    y_est = util.index_labels(y_est)[0]
+                                      sample_size=frame_size,
+                                      return_index=True)[1]
 
     # Build the reference label agreement matrix
     agree_ref = np.equal.outer(y_ref, y_ref)
@@ -530,6 +524,8 @@ def _contingency_matrix(reference_indices, estimated_indices):
     .. note:: Based on sklearn.metrics.cluster.contingency_matrix
 
     """
+    import scipy.sparse
+
     ref_classes, ref_class_idx = np.unique(reference_indices,
                                            return_inverse=True)
     est_classes, est_class_idx = np.unique(estimated_indices,
@@ -561,6 +557,8 @@ def _adjusted_rand_index(reference_indices, estimated_indices):
     .. note:: Based on sklearn.metrics.cluster.adjusted_rand_score
 
     """
+    import scipy.special
+
     n_samples = len(reference_indices)
     ref_classes = np.unique(reference_indices)
     est_classes = np.unique(estimated_indices)
@@ -646,16 +644,14 @@ def ari(reference_intervals, reference_labels,
     # Generate the cluster labels
     y_ref = util.intervals_to_samples(reference_intervals,
                                       reference_labels,
-                                      sample_size=frame_size)[-1]
-
-    y_ref = util.index_labels(y_ref)[0]
+                                      sample_size=frame_size,
+                                      return_index=True)[1]
 
     # Map to index space
     y_est = util.intervals_to_samples(estimated_intervals,
                                       estimated_labels,
-                                      sample_size=frame_size)[-1]
-
-    y_est = util.index_labels(y_est)[0]
+                                      sample_size=frame_size,
+                                      return_index=True)[1]
 
     return _adjusted_rand_index(y_ref, y_est)
 
@@ -749,6 +745,8 @@ def _adjusted_mutual_info_score(reference_indices, estimated_indices):
         and sklearn.metrics.cluster.expected_mutual_info_score
 
     """
+    import scipy.special
+
     n_samples = len(reference_indices)
     ref_classes = np.unique(reference_indices)
     est_classes = np.unique(estimated_indices)
@@ -916,16 +914,14 @@ def mutual_information(reference_intervals, reference_labels,
     # Generate the cluster labels
     y_ref = util.intervals_to_samples(reference_intervals,
                                       reference_labels,
-                                      sample_size=frame_size)[-1]
-
-    y_ref = util.index_labels(y_ref)[0]
+                                      sample_size=frame_size,
+                                      return_index=True)[1]
 
     # Map to index space
     y_est = util.intervals_to_samples(estimated_intervals,
                                       estimated_labels,
-                                      sample_size=frame_size)[-1]
-
-    y_est = util.index_labels(y_est)[0]
+                                      sample_size=frame_size,
+                                      return_index=True)[1]
 
     # Mutual information
     mutual_info = _mutual_info_score(y_ref, y_est)
@@ -1015,7 +1011,6 @@ def nce(reference_intervals, reference_labels, estimated_intervals,
         F-measure for (S_over, S_under)
 
     """
-
     validate_structure(reference_intervals, reference_labels,
                        estimated_intervals, estimated_labels)
 
@@ -1024,19 +1019,19 @@ def nce(reference_intervals, reference_labels, estimated_intervals,
     if reference_intervals.size == 0 or estimated_intervals.size == 0:
         return 0., 0., 0.
 
+    import scipy.stats
+
     # Generate the cluster labels
     y_ref = util.intervals_to_samples(reference_intervals,
                                       reference_labels,
-                                      sample_size=frame_size)[-1]
-
-    y_ref = util.index_labels(y_ref)[0]
+                                      sample_size=frame_size,
+                                      return_index=True)[1]
 
     # Map to index space
     y_est = util.intervals_to_samples(estimated_intervals,
                                       estimated_labels,
-                                      sample_size=frame_size)[-1]
-
-    y_est = util.index_labels(y_est)[0]
+                                      sample_size=frame_size,
+                                      return_index=True)[1]
 
     # Make the contingency table: shape = (n_ref, n_est)
     contingency = _contingency_matrix(y_ref, y_est).astype(float)
@@ -1150,6 +1145,7 @@ def vmeasure(reference_intervals, reference_labels, estimated_intervals,
                marginal=True)
 
 
+@util.validate_once()
 def evaluate(ref_intervals, ref_labels, est_intervals, est_labels, **kwargs):
     """Compute all metrics for the given reference and estimated annotations.
 
@@ -36,6 +36,9 @@ Metrics
 * :func:`mir_eval.separation.bss_eval_images_framewise`: Computes the
   bss_eval_images metrics on a frame-by-frame basis.
 
+The memory and the run time needed by these metrics for a given signal size
+can be estimated beforehand with :func:`mir_eval.separation.bss_eval_cost`.
+
 References
 ----------
   .. [#vincent2006performance] Emmanuel Vincent, Rémi Gribonval, and Cédric
@@ -46,19 +49,26 @@ References
 '''
 
 import numpy as np
-import scipy.fftpack
-from scipy.linalg import toeplitz
-from scipy.signal import fftconvolve
 import collections
 import itertools
 import warnings
+import six
 from . import util
 
 
 # The maximum allowable number of sources (prevents insane computational load)
 MAX_SOURCES = 100
 
+# Rough throughputs, in operations per second on a single core, of the FFTs,
+# of the dense linear algebra and of the element-wise array operations, used
+# by bss_eval_cost to estimate run times.  They were measured on one machine
+# and vary with the hardware and the BLAS library.
+_FFT_RATE = 1.5e9
+_LINALG_RATE = 1e10
+_ELEMENTWISE_RATE = 1e10
+
 
+@util.validator
 def validate(reference_sources, estimated_sources):
     """Checks that the input data to a metric are valid, and throws helpful
     errors if not.
@@ -127,19 +137,188 @@ def _any_source_silent(sources):
         sources, axis=tuple(range(2, sources.ndim))) == 0, axis=1))
 
 
+def _filter_length(flen, nsampl):
+    """Length of the distortion filters: ``flen`` if given, which must be a
+    positive integer no larger than the number of samples ``nsampl``, or
+    512 by default, as in the BSS_EVAL Matlab toolbox, whatever ``nsampl``.
+    """
+    if flen is None:
+        return 512
+    if (not isinstance(flen, six.integer_types + (np.integer,)) or
+            not 0 < flen <= nsampl):
+        raise ValueError('flen should be a positive integer no larger than '
+                         'the number of samples of the sources ({}), but '
+                         'flen = {!r}'.format(nsampl, flen))
+    return flen
+
+
+def _best_permutation(sir):
+    """Find the ordering of the estimated sources which maximizes the mean
+    SIR.
+
+    This is a linear assignment problem, which is solved in polynomial time.
+    When several orderings have the same mean SIR (up to floating point
+    precision), the lexicographically smallest one is returned, which is the
+    first one in ``itertools.permutations`` order.
+
+    Non-finite SIRs (e.g. ``+inf`` without any interference) select the same
+    ordering as ``np.argmax`` over the mean SIRs of all the orderings: the
+    first ordering whose mean SIR is ``NaN`` (it includes a ``NaN`` SIR, or
+    both a ``+inf`` and a ``-inf`` SIR), otherwise the first one whose mean
+    SIR is ``+inf``, otherwise the best one without a ``-inf`` SIR, or the
+    first one if they all include a ``-inf`` SIR.
+
+    Parameters
+    ----------
+    sir : np.ndarray, shape=(nsrc, nsrc)
+        ``sir[jest, jtrue]`` is the SIR of estimated source ``jest`` with
+        respect to reference source ``jtrue``
+
+    Returns
+    -------
+    perm : np.ndarray, shape=(nsrc,)
+        estimated source number ``perm[j]`` corresponds to reference source
+        number ``j``
+    """
+    from scipy.optimize import linear_sum_assignment
+
+    nsrc = sir.shape[0]
+    dum = np.arange(nsrc)
+    finite = np.isfinite(sir)
+    big = None
+    if not np.all(finite):
+        posinf = np.isposinf(sir)
+        neginf = np.isneginf(sir)
+        # np.argmax picks the first NaN mean, otherwise the first +inf mean
+        perm = _first_permutation_containing(np.isnan(sir), posinf, neginf)
+        if perm is None:
+            none = np.zeros_like(finite)
+            perm = _first_permutation_containing(posinf, none, none)
+        if perm is not None:
+            return perm
+        # Only finite and -inf SIRs are left: replace the -inf SIRs by a value
+        # lower than any total of finite SIRs
+        bound = np.abs(sir[finite]).max() if np.any(finite) else 0.
+        big = 2 * nsrc * max(bound, 1.) + 1
+        sir = np.where(neginf, -big, sir)
+
+    def max_total(jtrue, jest):
+        """Maximal total SIR of the reference sources ``jtrue`` matched to
+        the estimated sources ``jest``."""
+        sub = sir[np.ix_(jest, jtrue)]
+        rows, cols = linear_sum_assignment(-sub)
+        return sub[rows, cols].sum()
+
+    best = max_total(dum, dum)
+    if big is not None and best < -big / 2:
+        # All the mean SIRs are -inf
+        return dum
+    tol = 1e-12 * max(1., np.abs(sir).sum())
+    # Assign the reference sources in order, each to the smallest estimated
+    # source which still allows the maximal total SIR
+    perm = np.empty(nsrc, dtype=int)
+    total = 0.
+    free = list(range(nsrc))
+    for j in range(nsrc):
+        for jest in free:
+            rest = [r for r in free if r != jest]
+            candidate = total + sir[jest, j]
+            if j < nsrc - 1:
+                candidate += max_total(dum[j + 1:], rest)
+            if candidate >= best - tol:
+                break
+        perm[j] = jest
+        total += sir[jest, j]
+        free.remove(jest)
+    return perm
+
+
+def _first_permutation_containing(single, first, second):
+    """Find the lexicographically smallest ordering ``perm`` whose cells
+    ``(perm[j], j)`` include a cell of the mask ``single``, or both a cell of
+    ``first`` and a cell of ``second``.
+
+    Any cells in distinct rows and columns belong to some ordering, so
+    whether the sources left after each choice can still complete such an
+    ordering only depends on the cells of the masks they contain.
+
+    Parameters
+    ----------
+    single, first, second : np.ndarray, shape=(nsrc, nsrc), dtype=bool
+        masks of the cells ``[jest, jtrue]``
+
+    Returns
+    -------
+    perm : np.ndarray, shape=(nsrc,), or None
+        the ordering, or None if there is none
+    """
+    nsrc = single.shape[0]
+
+    def feasible(rows, cols, has_first, has_second):
+        """Whether the rows and columns left can complete an ordering."""
+        index = np.ix_(np.asarray(rows, dtype=int),
+                       np.asarray(cols, dtype=int))
+        if single[index].any():
+            return True
+        first_left, second_left = first[index], second[index]
+        if has_first:
+            return second_left.any()
+        if has_second:
+            return first_left.any()
+        # Pairs of cells of both masks, in distinct rows and columns
+        pairs = (first_left.sum() * second_left.sum() -
+                 np.dot(first_left.sum(axis=1), second_left.sum(axis=1)) -
+                 np.dot(first_left.sum(axis=0), second_left.sum(axis=0)))
+        return pairs > 0
+
+    free = list(range(nsrc))
+    if not feasible(free, free, False, False):
+        return None
+    perm = []
+    has_first = has_second = False
+    for j in range(nsrc):
+        for jest in free:
+            with_first = has_first or first[jest, j]
+            with_second = has_second or second[jest, j]
+            if single[jest, j] or (with_first and with_second):
+                # Any completion will do, the first one is in order
+                free.remove(jest)
+                return np.asarray(perm + [jest] + free)
+            rest = [r for r in free if r != jest]
+            if feasible(rest, range(j + 1, nsrc), with_first, with_second):
+                break
+        perm.append(jest)
+        free.remove(jest)
+        has_first, has_second = with_first, with_second
+    return np.asarray(perm)
+
+
 def bss_eval_sources(reference_sources, estimated_sources,
-                     compute_permutation=True):
+                     compute_permutation=True, flen=None, dtype=np.float64):
     """
     Ordering and measurement of the separation quality for estimated source
     signals in terms of filtered true source, interference and artifacts.
 
     The decomposition allows a time-invariant filter distortion of length
-    512, as described in Section III.B of [#vincent2006performance]_.
+    ``flen`` (512 by default, as in the BSS_EVAL Matlab toolbox), as described
+    in Section III.B of [#vincent2006performance]_.  The least-squares
+    problem has ``nsrc * flen`` unknowns, so its cost grows with the square
+    (memory) and the cube (time) of ``flen``, see
+    :func:`mir_eval.separation.bss_eval_cost`.
 
     Passing ``False`` for ``compute_permutation`` will improve the computation
     performance of the evaluation; however, it is not always appropriate and
     is not the way that the BSS_EVAL Matlab toolbox computes bss_eval_sources.
 
+    Passing ``np.float32`` for ``dtype`` computes the decomposition in single
+    precision, which roughly halves the memory used and the run time but is
+    suited to ranking systems rather than to reporting scores.  On the test
+    data of mir_eval, the single precision scores of whole signals are within
+    0.2 dB of the double precision ones.  When the signals are not much longer
+    than the ``nsrc * flen`` distortion filter coefficients, as for short
+    framewise windows, the least-squares problem is ill-conditioned and the
+    scores can deviate by several dB (up to 5 dB on the test data).
+
     Examples
     --------
     >>> # reference_sources[n] should be an ndarray of samples of the
@@ -160,6 +339,14 @@ def bss_eval_sources(reference_sources, estimated_sources,
         reference_sources)
     compute_permutation : bool, optional
         compute permutation of estimate/source combinations (True by default)
+    flen : int or None, optional
+        length of the distortion filters, a positive integer no larger than
+        the number of samples.  None (the default) uses 512 coefficients, as
+        the BSS_EVAL Matlab toolbox, whatever the number of samples.
+    dtype : np.dtype, optional
+        floating point type of the computations (``np.float64`` by default).
+        ``np.float32`` halves the memory used and speeds up the evaluation,
+        at the cost of accuracy.
 
     Returns
     -------
@@ -195,46 +382,35 @@ def bss_eval_sources(reference_sources, estimated_sources,
     # If empty matrices were supplied, return empty lists (special case)
     if reference_sources.size == 0 or estimated_sources.size == 0:
         return np.array([]), np.array([]), np.array([]), np.array([])
+    flen = _filter_length(flen, reference_sources.shape[1])
+
+    # cast once, the decomposition computes in the precision of its input
+    reference_sources = reference_sources.astype(dtype, copy=False)
+    estimated_sources = estimated_sources.astype(dtype, copy=False)
 
     nsrc = estimated_sources.shape[0]
 
     # does user desire permutations?
     if compute_permutation:
         # compute criteria for all possible pair matches
-        sdr = np.empty((nsrc, nsrc))
-        sir = np.empty((nsrc, nsrc))
-        sar = np.empty((nsrc, nsrc))
-        for jest in range(nsrc):
-            for jtrue in range(nsrc):
-                s_true, e_spat, e_interf, e_artif = \
-                    _bss_decomp_mtifilt(reference_sources,
-                                        estimated_sources[jest],
-                                        jtrue, 512)
-                sdr[jest, jtrue], sir[jest, jtrue], sar[jest, jtrue] = \
-                    _bss_source_crit(s_true, e_spat, e_interf, e_artif)
+        pairs = list(itertools.product(range(nsrc), repeat=2))
+        crit = _bss_crit(reference_sources[:, np.newaxis],
+                         estimated_sources[:, np.newaxis], pairs, flen,
+                         _bss_source_energies)
+        sdr, sir, sar = crit.T.reshape(3, nsrc, nsrc)
 
         # select the best ordering
-        perms = list(itertools.permutations(list(range(nsrc))))
-        mean_sir = np.empty(len(perms))
-        dum = np.arange(nsrc)
-        for (i, perm) in enumerate(perms):
-            mean_sir[i] = np.mean(sir[perm, dum])
-        popt = perms[np.argmax(mean_sir)]
-        idx = (popt, dum)
-        return (sdr[idx], sir[idx], sar[idx], np.asarray(popt))
+        popt = _best_permutation(sir)
+        idx = (popt, np.arange(nsrc))
+        return (sdr[idx], sir[idx], sar[idx], popt)
     else:
         # compute criteria for only the simple correspondence
         # (estimate 1 is estimate corresponding to reference source 1, etc.)
-        sdr = np.empty(nsrc)
-        sir = np.empty(nsrc)
-        sar = np.empty(nsrc)
-        for j in range(nsrc):
-            s_true, e_spat, e_interf, e_artif = \
-                _bss_decomp_mtifilt(reference_sources,
-                                    estimated_sources[j],
-                                    j, 512)
-            sdr[j], sir[j], sar[j] = \
-                _bss_source_crit(s_true, e_spat, e_interf, e_artif)
+        crit = _bss_crit(reference_sources[:, np.newaxis],
+                         estimated_sources[:, np.newaxis],
+                         [(j, j) for j in range(nsrc)], flen,
+                         _bss_source_energies)
+        sdr, sir, sar = crit.T
 
         # return the default permutation for compatibility
         popt = np.arange(nsrc)
@@ -243,7 +419,8 @@ def bss_eval_sources(reference_sources, estimated_sources,
 
 def bss_eval_sources_framewise(reference_sources, estimated_sources,
                                window=30*44100, hop=15*44100,
-                               compute_permutation=False):
+                               compute_permutation=False, flen=None,
+                               dtype=np.float64):
     """Framewise computation of bss_eval_sources
 
     Please be aware that this function does not compute permutations (by
@@ -289,6 +466,14 @@ def bss_eval_sources_framewise(reference_sources, estimated_sources,
     compute_permutation : bool, optional
         compute permutation of estimate/source combinations for all windows
         (False by default)
+    flen : int or None, optional
+        length of the distortion filters, a positive integer no larger than
+        the window length.  None (the default) uses 512 coefficients, as
+        the BSS_EVAL Matlab toolbox, whatever the window length.
+    dtype : np.dtype, optional
+        floating point type of the computations, see
+        :func:`mir_eval.separation.bss_eval_sources`
+        (``np.float64`` by default)
 
     Returns
     -------
@@ -317,16 +502,21 @@ def bss_eval_sources_framewise(reference_sources, estimated_sources,
     if reference_sources.size == 0 or estimated_sources.size == 0:
         return np.array([]), np.array([]), np.array([]), np.array([])
 
+    reference_sources = reference_sources.astype(dtype, copy=False)
+    estimated_sources = estimated_sources.astype(dtype, copy=False)
     nsrc = reference_sources.shape[0]
 
     nwin = int(
         np.floor((reference_sources.shape[1] - window + hop) / hop)
     )
+    # the filters must fit in the windows, or in the whole signals when
+    # fewer than 2 windows would be evaluated
+    _filter_length(flen, window if nwin >= 2 else reference_sources.shape[1])
     # if fewer than 2 windows would be evaluated, return the sources result
     if nwin < 2:
         result = bss_eval_sources(reference_sources,
                                   estimated_sources,
-                                  compute_permutation)
+                                  compute_permutation, flen, dtype)
         return [np.expand_dims(score, -1) for score in result]
 
     # compute the criteria across all windows
@@ -344,7 +534,7 @@ def bss_eval_sources_framewise(reference_sources, estimated_sources,
         if (not _any_source_silent(ref_slice) and
                 not _any_source_silent(est_slice)):
             sdr[:, k], sir[:, k], sar[:, k], perm[:, k] = bss_eval_sources(
-                ref_slice, est_slice, compute_permutation
+                ref_slice, est_slice, compute_permutation, flen, dtype
             )
         else:
             # if we have a silent frame set results as np.nan
@@ -354,7 +544,8 @@ def bss_eval_sources_framewise(reference_sources, estimated_sources,
 
 
 def bss_eval_images(reference_sources, estimated_sources,
-                    compute_permutation=True):
+                    compute_permutation=True, flen=None, block_size=None,
+                    dtype=np.float64):
     """Implementation of the bss_eval_images function from the
     BSS_EVAL Matlab toolbox.
 
@@ -363,12 +554,27 @@ def bss_eval_images(reference_sources, estimated_sources,
     This method also provides the ISR measure.
 
     The decomposition allows a time-invariant filter distortion of length
-    512, as described in Section III.B of [#vincent2006performance]_.
+    ``flen`` (512 by default, as in the BSS_EVAL Matlab toolbox) from each
+    channel of each source, as described in Section III.B of
+    [#vincent2006performance]_.
 
     Passing ``False`` for ``compute_permutation`` will improve the computation
     performance of the evaluation; however, it is not always appropriate and
     is not the way that the BSS_EVAL Matlab toolbox computes bss_eval_images.
 
+    By default, the whole signals are transformed at once, which needs memory
+    proportional to ``nsrc * nchan`` times the signal length rounded up to a
+    power of two.  For long multichannel signals, passing a ``block_size``
+    (e.g. ``2**13``) accumulates the decomposition over blocks of that many
+    samples instead, so that the memory used no longer grows with the signal
+    length.  The results are equal up to floating point precision.  The
+    least-squares system still takes ``8 * (nsrc * nchan * flen)**2`` bytes,
+    see :func:`mir_eval.separation.bss_eval_cost`.
+
+    Passing ``np.float32`` for ``dtype`` computes the decomposition in single
+    precision, see :func:`mir_eval.separation.bss_eval_sources` for its
+    accuracy (with ``nsrc * nchan * flen`` distortion filter coefficients).
+
     Examples
     --------
     >>> # reference_sources[n] should be an ndarray of samples of the
@@ -387,6 +593,18 @@ def bss_eval_images(reference_sources, estimated_sources,
         matrix containing estimated sources
     compute_permutation : bool, optional
         compute permutation of estimate/source combinations (True by default)
+    flen : int or None, optional
+        length of the distortion filters, a positive integer no larger than
+        the number of samples.  None (the default) uses 512 coefficients, as
+        the BSS_EVAL Matlab toolbox, whatever the number of samples.
+    block_size : int or None, optional
+        if given, compute the decomposition over blocks of that many samples,
+        which bounds the memory used independently of the signal length
+        (None by default)
+    dtype : np.dtype, optional
+        floating point type of the computations (``np.float64`` by default).
+        ``np.float32`` halves the memory used and speeds up the evaluation,
+        at the cost of accuracy.
 
     Returns
     -------
@@ -425,65 +643,37 @@ def bss_eval_images(reference_sources, estimated_sources,
     if reference_sources.size == 0 or estimated_sources.size == 0:
         return np.array([]), np.array([]), np.array([]), \
                          np.array([]), np.array([])
+    flen = _filter_length(flen, reference_sources.shape[1])
+
+    # cast once, the decomposition computes in the precision of its input
+    reference_sources = reference_sources.astype(dtype, copy=False)
+    estimated_sources = estimated_sources.astype(dtype, copy=False)
 
     # determine size parameters
     nsrc = estimated_sources.shape[0]
-    nsampl = estimated_sources.shape[1]
-    nchan = estimated_sources.shape[2]
+    # the decomposition expects the shape (nsrc, nchan, nsampl)
+    reference_sources = np.transpose(reference_sources, (0, 2, 1))
+    estimated_sources = np.transpose(estimated_sources, (0, 2, 1))
 
     # does the user desire permutation?
     if compute_permutation:
         # compute criteria for all possible pair matches
-        sdr = np.empty((nsrc, nsrc))
-        isr = np.empty((nsrc, nsrc))
-        sir = np.empty((nsrc, nsrc))
-        sar = np.empty((nsrc, nsrc))
-        for jest in range(nsrc):
-            for jtrue in range(nsrc):
-                s_true, e_spat, e_interf, e_artif = \
-                    _bss_decomp_mtifilt_images(
-                        reference_sources,
-                        np.reshape(
-                            estimated_sources[jest],
-                            (nsampl, nchan),
-                            order='F'
-                        ),
-                        jtrue,
-                        512
-                    )
-                sdr[jest, jtrue], isr[jest, jtrue], \
-                    sir[jest, jtrue], sar[jest, jtrue] = \
-                    _bss_image_crit(s_true, e_spat, e_interf, e_artif)
+        pairs = list(itertools.product(range(nsrc), repeat=2))
+        crit = _bss_crit(reference_sources, estimated_sources, pairs, flen,
+                         _bss_image_energies, block_size)
+        sdr, isr, sir, sar = crit.T.reshape(4, nsrc, nsrc)
 
         # select the best ordering
-        perms = list(itertools.permutations(range(nsrc)))
-        mean_sir = np.empty(len(perms))
-        dum = np.arange(nsrc)
-        for (i, perm) in enumerate(perms):
-            mean_sir[i] = np.mean(sir[perm, dum])
-        popt = perms[np.argmax(mean_sir)]
-        idx = (popt, dum)
-        return (sdr[idx], isr[idx], sir[idx], sar[idx], np.asarray(popt))
+        popt = _best_permutation(sir)
+        idx = (popt, np.arange(nsrc))
+        return (sdr[idx], isr[idx], sir[idx], sar[idx], popt)
     else:
         # compute criteria for only the simple correspondence
         # (estimate 1 is estimate corresponding to reference source 1, etc.)
-        sdr = np.empty(nsrc)
-        isr = np.empty(nsrc)
-        sir = np.empty(nsrc)
-        sar = np.empty(nsrc)
-        Gj = [0] * nsrc  # prepare G matrics with zeroes
-        G = np.zeros(1)
-        for j in range(nsrc):
-            # save G matrix to avoid recomputing it every call
-            s_true, e_spat, e_interf, e_artif, Gj_temp, G = \
-                _bss_decomp_mtifilt_images(reference_sources,
-                                           np.reshape(estimated_sources[j],
-                                                      (nsampl, nchan),
-                                                      order='F'),
-                                           j, 512, Gj[j], G)
-            Gj[j] = Gj_temp
-            sdr[j], isr[j], sir[j], sar[j] = \
-                _bss_image_crit(s_true, e_spat, e_interf, e_artif)
+        crit = _bss_crit(reference_sources, estimated_sources,
+                         [(j, j) for j in range(nsrc)], flen,
+                         _bss_image_energies, block_size)
+        sdr, isr, sir, sar = crit.T
 
         # return the default permutation for compatibility
         popt = np.arange(nsrc)
@@ -492,7 +682,8 @@ def bss_eval_images(reference_sources, estimated_sources,
 
 def bss_eval_images_framewise(reference_sources, estimated_sources,
                               window=30*44100, hop=15*44100,
-                              compute_permutation=False):
+                              compute_permutation=False, flen=None,
+                              block_size=None, dtype=np.float64):
     """Framewise computation of bss_eval_images
 
     Please be aware that this function does not compute permutations (by
@@ -537,6 +728,18 @@ def bss_eval_images_framewise(reference_sources, estimated_sources,
     compute_permutation : bool, optional
         compute permutation of estimate/source combinations for all windows
         (False by default)
+    flen : int or None, optional
+        length of the distortion filters, a positive integer no larger than
+        the window length.  None (the default) uses 512 coefficients, as
+        the BSS_EVAL Matlab toolbox, whatever the window length.
+    block_size : int or None, optional
+        if given, compute the decomposition of each window over blocks of
+        that many samples, see :func:`mir_eval.separation.bss_eval_images`
+        (None by default)
+    dtype : np.dtype, optional
+        floating point type of the computations, see
+        :func:`mir_eval.separation.bss_eval_images`
+        (``np.float64`` by default)
 
     Returns
     -------
@@ -568,16 +771,22 @@ def bss_eval_images_framewise(reference_sources, estimated_sources,
     if reference_sources.size == 0 or estimated_sources.size == 0:
         return np.array([]), np.array([]), np.array([]), np.array([])
 
+    reference_sources = reference_sources.astype(dtype, copy=False)
+    estimated_sources = estimated_sources.astype(dtype, copy=False)
     nsrc = reference_sources.shape[0]
 
     nwin = int(
         np.floor((reference_sources.shape[1] - window + hop) / hop)
     )
+    # the filters must fit in the windows, or in the whole signals when
+    # fewer than 2 windows would be evaluated
+    _filter_length(flen, window if nwin >= 2 else reference_sources.shape[1])
     # if fewer than 2 windows would be evaluated, return the images result
     if nwin < 2:
         result = bss_eval_images(reference_sources,
                                  estimated_sources,
-                                 compute_permutation)
+                                 compute_permutation, flen, block_size,
+                                 dtype)
         return [np.expand_dims(score, -1) for score in result]
 
     # compute the criteria across all windows
@@ -597,7 +806,8 @@ def bss_eval_images_framewise(reference_sources, estimated_sources,
                 not _any_source_silent(est_slice)):
             sdr[:, k], isr[:, k], sir[:, k], sar[:, k], perm[:, k] = \
                 bss_eval_images(
-                    ref_slice, est_slice, compute_permutation
+                    ref_slice, est_slice, compute_permutation, flen,
+                    block_size, dtype
                 )
         else:
             # if we have a silent frame set results as np.nan
@@ -606,222 +816,504 @@ def bss_eval_images_framewise(reference_sources, estimated_sources,
     return sdr, isr, sir, sar, perm
 
 
-def _bss_decomp_mtifilt(reference_sources, estimated_source, j, flen):
-    """Decomposition of an estimated source image into four components
-    representing respectively the true source image, spatial (or filtering)
-    distortion, interference and artifacts, derived from the true source
-    images using multichannel time-invariant filters.
+def bss_eval_cost(nsrc, nchan, nsampl, flen=None, window=None, hop=None,
+                  compute_permutation=True, block_size=None,
+                  dtype=np.float64):
+    """Estimate the peak memory and the run time of the bss_eval metrics,
+    without computing them.
+
+    The estimate is derived from the sizes of the arrays and the numbers of
+    operations of the decomposition, so that e.g. a batch scheduler can pick
+    the resources of its workers, or reject a configuration, before running
+    the evaluation.  It is meant as an order of magnitude: on the signals
+    used to derive it, the memory is within 30% of the measured one, and the
+    run time within a factor of 2 of the one measured on a single core.  The
+    memory used by the input signals themselves is not included.
+
+    The run time is derived from rough throughputs of the FFTs, of the dense
+    linear algebra and of the element-wise operations, measured on a single
+    core of one machine.  They are machine-specific: on other hardware, or
+    with a multi-threaded BLAS, the estimated time is only proportional to
+    the actual one, and should be calibrated against one measured run.
+
+    Examples
+    --------
+    >>> # 4 stereo sources of 3 minutes at 44.1kHz
+    >>> memory, time = mir_eval.separation.bss_eval_cost(
+    ...     4, 2, 180 * 44100, window=30 * 44100, hop=15 * 44100)
+
+    Parameters
+    ----------
+    nsrc : int
+        number of sources
+    nchan : int
+        number of channels of each source, 1 for
+        :func:`mir_eval.separation.bss_eval_sources`
+    nsampl : int
+        number of samples of each source
+    flen : int or None, optional
+        length of the distortion filters, as for
+        :func:`mir_eval.separation.bss_eval_sources` (None by default, which
+        uses 512 coefficients)
+    window : int or None, optional
+        window length of a framewise evaluation, e.g. of
+        :func:`mir_eval.separation.bss_eval_images_framewise`, or None for
+        an evaluation of the whole signals (None by default)
+    hop : int or None, optional
+        hop size of a framewise evaluation (None by default)
+    compute_permutation : bool, optional
+        whether the permutation of estimate/source combinations is computed
+        (True by default, note that the framewise metrics do not compute it
+        by default)
+    block_size : int or None, optional
+        block size of the decomposition, see
+        :func:`mir_eval.separation.bss_eval_images` (None by default)
+    dtype : np.dtype, optional
+        floating point type of the computations (``np.float64`` by default)
+
+    Returns
+    -------
+    memory : int
+        estimated peak memory, in bytes
+    time : float
+        estimated run time, in seconds
+
     """
-    nsampl = estimated_source.size
-    # decomposition
-    # true source image
-    s_true = np.hstack((reference_sources[j], np.zeros(flen - 1)))
-    # spatial (or filtering) distortion
-    e_spat = _project(reference_sources[j, np.newaxis, :], estimated_source,
-                      flen) - s_true
-    # interference
-    e_interf = _project(reference_sources,
-                        estimated_source, flen) - s_true - e_spat
-    # artifacts
-    e_artif = -s_true - e_spat - e_interf
-    e_artif[:nsampl] += estimated_source
-    return (s_true, e_spat, e_interf, e_artif)
-
-
-def _bss_decomp_mtifilt_images(reference_sources, estimated_source, j, flen,
-                               Gj=None, G=None):
-    """Decomposition of an estimated source image into four components
-    representing respectively the true source image, spatial (or filtering)
-    distortion, interference and artifacts, derived from the true source
-    images using multichannel time-invariant filters.
-    Adapted version to work with multichannel sources.
-    Improved performance can be gained by passing Gj and G parameters initially
-    as all zeros. These parameters store the results from the computation of
-    the G matrix in _project_images and then return them for subsequent calls
-    to this function. This only works when not computing permuations.
+    itemsize = np.dtype(dtype).itemsize
+    nwin = 1
+    if window is not None:
+        nwin = int(np.floor((nsampl - window + hop) / hop))
+        # with fewer than 2 windows, the whole signals are evaluated
+        if nwin < 2:
+            nwin = 1
+        else:
+            nsampl = window
+    flen = _filter_length(flen, nsampl)
+    npairs = nsrc**2 if compute_permutation else nsrc
+    memory, fft_ops, linalg_ops, elementwise_ops = _bss_cost(
+        nsrc, nchan, nsampl, flen, npairs, block_size, itemsize)
+    # single precision doubles the throughput of the dense linear algebra
+    time = (fft_ops / _FFT_RATE +
+            linalg_ops * itemsize / 8. / _LINALG_RATE +
+            elementwise_ops / _ELEMENTWISE_RATE)
+    return int(memory), nwin * time
+
+
+def _bss_cost(nsrc, nchan, nsampl, flen, npairs, block_size, itemsize):
+    """Peak memory (in bytes) and numbers of operations of the FFTs, of the
+    dense linear algebra and of the element-wise operations of one call to
+    :func:`mir_eval.separation._bss_crit`, see
+    :func:`mir_eval.separation.bss_eval_cost`.
     """
-    nsampl = np.shape(estimated_source)[0]
-    nchan = np.shape(estimated_source)[1]
-    # are we saving the Gj and G parameters?
-    saveg = Gj is not None and G is not None
-    # decomposition
-    # true source image
-    s_true = np.hstack((np.reshape(reference_sources[j],
-                                   (nsampl, nchan),
-                                   order="F").transpose(),
-                        np.zeros((nchan, flen - 1))))
-    # spatial (or filtering) distortion
-    if saveg:
-        e_spat, Gj = _project_images(reference_sources[j, np.newaxis, :],
-                                     estimated_source, flen, Gj)
-    else:
-        e_spat = _project_images(reference_sources[j, np.newaxis, :],
-                                 estimated_source, flen)
-    e_spat = e_spat - s_true
-    # interference
-    if saveg:
-        e_interf, G = _project_images(reference_sources,
-                                      estimated_source, flen, G)
+    nref = nsrc * nchan
+    ncoef = nref * flen
+    nsampl_proj = nsampl + flen - 1
+    # least-squares problems: the Gram matrix, its factorization, the inner
+    # products with the estimates and the filters (all references and each
+    # reference alone)
+    memory = itemsize * (2 * ncoef**2 + 3 * ncoef * nsrc * nchan +
+                         (nchan * flen)**2)
+    linalg_ops = (ncoef**3 / 3. + 2. * ncoef**2 * nsrc * nchan +
+                  nsrc * ((nchan * flen)**3 / 3. +
+                          2. * (nchan * flen)**2 * nsrc * nchan))
+    # filling the Gram matrix, and computing the energies of the components
+    elementwise_ops = ncoef**2 + 40. * npairs * nchan * nsampl_proj
+    if block_size is None:
+        n_fft = 2**int(np.ceil(np.log2(nsampl_proj)))
+        # FFTs of the references and the estimates, correlations of the
+        # references with each other and with the estimates, and filtering
+        n_ffts = (nref + nref * (nref + 1) / 2. + nsrc * nchan +
+                  2. * nref * nsrc * nchan + nsrc * nchan +
+                  npairs * nchan * (nchan + 2))
+        memory += itemsize * (nref * (n_fft + 2) + nchan * (8 * n_fft + 12) +
+                              6 * nchan * nsampl_proj)
     else:
-        e_interf = _project_images(reference_sources,
-                                   estimated_source, flen)
-    e_interf = e_interf - s_true - e_spat
-    # artifacts
-    e_artif = -s_true - e_spat - e_interf
-    e_artif[:, :nsampl] += estimated_source.transpose()
-    # return Gj and G only if they were passed in
-    if saveg:
-        return (s_true, e_spat, e_interf, e_artif, Gj, G)
+        n_fft = 2**int(np.ceil(np.log2(block_size + flen - 1.)))
+        nblocks = np.ceil(nsampl_proj / float(block_size))
+        # the same FFTs, for each block
+        n_ffts = (nblocks * (2 * nref + nsrc * nchan + nref**2 +
+                             nref * nsrc * nchan + nsrc * (nref + nchan) +
+                             npairs * nchan) +
+                  nsrc * nref * nchan + npairs * nchan**2)
+        elementwise_ops += (4. * nblocks * (nsrc + npairs) * nchan * nref *
+                            n_fft)
+        memory += itemsize * (nref**2 * flen + 3 * nref * (n_fft + 2) +
+                              nsrc * nchan * (n_fft + 2) + nref * n_fft +
+                              (nsrc + 1) * nchan * nref * (n_fft + 2) +
+                              8 * nchan * block_size)
+    fft_ops = n_ffts * 2.5 * n_fft * np.log2(n_fft)
+    return memory, fft_ops, linalg_ops, elementwise_ops
+
+
+def _bss_crit(reference_sources, estimated_sources, pairs, flen, energies,
+              block_size=None):
+    """Separation criteria of estimated sources with respect to true sources.
+
+    Parameters
+    ----------
+    reference_sources : np.ndarray, shape=(nsrc, nchan, nsampl)
+        matrix containing true sources
+    estimated_sources : np.ndarray, shape=(nest, nchan, nsampl)
+        matrix containing estimated sources
+    pairs : list of tuple
+        ``(jest, jtrue)`` pairs of estimated and true source numbers to
+        evaluate, grouped by ``jest``
+    flen : int
+        length of the distortion filters
+    energies : function
+        ``energies(s_true, e_spat, e_interf, e_artif)`` returns the signal and
+        distortion energies of each criterion, e.g.
+        :func:`mir_eval.separation._bss_source_energies`
+    block_size : int or None
+        If given, the decomposition is computed block by block, see
+        :func:`mir_eval.separation._bss_decomp_mtifilt_blocks`
+
+    Returns
+    -------
+    crit : np.ndarray, shape=(len(pairs), ncrit)
+        criteria (in dB) of each pair
+    """
+    if block_size is None:
+        decomposition = _bss_decomp_mtifilt(reference_sources,
+                                            estimated_sources, pairs, flen)
     else:
-        return (s_true, e_spat, e_interf, e_artif)
+        decomposition = _bss_decomp_mtifilt_blocks(reference_sources,
+                                                   estimated_sources, pairs,
+                                                   flen, block_size)
+    total = collections.defaultdict(float)
+    for k, components in decomposition:
+        total[k] += energies(*components)
+    return np.array([[_safe_db(num, den) for num, den in total[k]]
+                     for k in range(len(pairs))], dtype=np.float64)
+
+
+def _bss_decomp_mtifilt(reference_sources, estimated_sources, pairs, flen):
+    """Decomposition of estimated source images into four components
+    representing respectively the true source image, spatial (or filtering)
+    distortion, interference and artifacts, derived from the true source
+    images using multichannel time-invariant filters.
 
+    The least-squares problems of all the estimated sources are solved
+    together, so that the inner products between the delayed reference
+    sources are computed and factorized only once for all the references,
+    and once for each reference alone.
 
-def _project(reference_sources, estimated_source, flen):
-    """Least-squares projection of estimated source on the subspace spanned by
-    delayed versions of reference sources, with delays between 0 and flen-1
+    Parameters
+    ----------
+    reference_sources : np.ndarray, shape=(nsrc, nchan, nsampl)
+        matrix containing true sources
+    estimated_sources : np.ndarray, shape=(nest, nchan, nsampl)
+        matrix containing estimated sources
+    pairs : list of tuple
+        ``(jest, jtrue)`` pairs of estimated and true source numbers to
+        decompose, grouped by ``jest``
+    flen : int
+        length of the distortion filters
+
+    Yields
+    ------
+    k : int
+        index of the pair in ``pairs``
+    components : tuple of np.ndarray, shape=(nchan, nsampl + flen - 1)
+        ``(s_true, e_spat, e_interf, e_artif)`` decomposition of
+        ``estimated_sources[jest]`` with respect to
+        ``reference_sources[jtrue]``
     """
-    nsrc = reference_sources.shape[0]
-    nsampl = reference_sources.shape[1]
+    import scipy.linalg
 
-    # computing coefficients of least squares problem via FFT ##
-    # zero padding and FFT of input data
-    reference_sources = np.hstack((reference_sources,
-                                   np.zeros((nsrc, flen - 1))))
-    estimated_source = np.hstack((estimated_source, np.zeros(flen - 1)))
+    nsrc, nchan, nsampl = reference_sources.shape
+    nest = estimated_sources.shape[0]
     n_fft = int(2**np.ceil(np.log2(nsampl + flen - 1.)))
-    sf = scipy.fftpack.fft(reference_sources, n=n_fft, axis=1)
-    sef = scipy.fftpack.fft(estimated_source, n=n_fft)
+    reference_sources = reference_sources.reshape(nsrc * nchan, nsampl)
+    sf = _rfft(reference_sources, n=n_fft, axis=1)
     # inner products between delayed versions of reference_sources
-    G = np.zeros((nsrc * flen, nsrc * flen))
-    for i in range(nsrc):
-        for j in range(nsrc):
-            ssf = sf[i] * np.conj(sf[j])
-            ssf = np.real(scipy.fftpack.ifft(ssf))
-            ss = toeplitz(np.hstack((ssf[0], ssf[-1:-flen:-1])),
-                          r=ssf[:flen])
+    G = np.empty((nsrc * nchan * flen, nsrc * nchan * flen),
+                 dtype=reference_sources.dtype)
+    delays = np.arange(0, -flen, -1)
+    for i in range(nsrc * nchan):
+        for j in range(i + 1):
+            ssf = _irfft(sf[i] * np.conj(sf[j]), n=n_fft)
+            ss = scipy.linalg.toeplitz(ssf[delays], r=ssf[:flen])
             G[i * flen: (i+1) * flen, j * flen: (j+1) * flen] = ss
             G[j * flen: (j+1) * flen, i * flen: (i+1) * flen] = ss.T
-    # inner products between estimated_source and delayed versions of
+    # inner products between estimated_sources and delayed versions of
     # reference_sources
-    D = np.zeros(nsrc * flen)
-    for i in range(nsrc):
-        ssef = sf[i] * np.conj(sef)
-        ssef = np.real(scipy.fftpack.ifft(ssef))
-        D[i * flen: (i+1) * flen] = np.hstack((ssef[0], ssef[-1:-flen:-1]))
-
-    # Computing projection
-    # Distortion filters
+    D = np.empty((nsrc * nchan * flen, nest * nchan), dtype=G.dtype)
+    for jest in range(nest):
+        sef = _rfft(estimated_sources[jest], n=n_fft, axis=1)
+        for i in range(nsrc * nchan):
+            ssef = _irfft(sf[i] * np.conj(sef), n=n_fft, axis=1)
+            D[i * flen: (i+1) * flen, jest * nchan: (jest+1) * nchan] = \
+                ssef[:, delays].T
+    # Distortion filters of all the estimated sources, with respect to all
+    # the references and to each reference alone
+    C = _solve(G, D)
+    Cj = {}
+    jproj = None
+    for k, (jest, jtrue) in enumerate(pairs):
+        columns = slice(jest * nchan, (jest + 1) * nchan)
+        refs = slice(jtrue * nchan, (jtrue + 1) * nchan)
+        if jtrue not in Cj:
+            rows = slice(jtrue * nchan * flen, (jtrue + 1) * nchan * flen)
+            Cj[jtrue] = _solve(G[rows, rows], D[rows])
+        if jest != jproj:
+            jproj = jest
+            sproj = _filter(sf, C[:, columns], flen, n_fft)
+            sproj = sproj[:, :nsampl + flen - 1]
+        sproj_j = _filter(sf[refs], Cj[jtrue][:, columns], flen, n_fft)
+        sproj_j = sproj_j[:, :nsampl + flen - 1]
+        # true source image
+        s_true = np.zeros((nchan, nsampl + flen - 1), dtype=G.dtype)
+        s_true[:, :nsampl] = reference_sources[refs]
+        # spatial (or filtering) distortion
+        e_spat = sproj_j - s_true
+        # interference
+        e_interf = sproj - sproj_j
+        # artifacts
+        e_artif = -sproj
+        e_artif[:, :nsampl] += estimated_sources[jest]
+        yield k, (s_true, e_spat, e_interf, e_artif)
+
+
+def _bss_decomp_mtifilt_blocks(reference_sources, estimated_sources, pairs,
+                               flen, block_size):
+    """Block-wise decomposition of estimated source images, see
+    :func:`mir_eval.separation._bss_decomp_mtifilt`.
+
+    The inner products between the signals are accumulated over blocks of
+    ``block_size`` samples (segmented FFT correlation), and the projections
+    are computed block by block (overlap-save convolution).  Apart from the
+    least-squares matrices, whose size only depends on ``nsrc``, ``nchan``
+    and ``flen``, the memory used is bounded by ``block_size`` instead of
+    the signal length.
+
+    Parameters
+    ----------
+    reference_sources : np.ndarray, shape=(nsrc, nchan, nsampl)
+        matrix containing true sources
+    estimated_sources : np.ndarray, shape=(nest, nchan, nsampl)
+        matrix containing estimated sources
+    pairs : list of tuple
+        ``(jest, jtrue)`` pairs of estimated and true source numbers to
+        decompose, grouped by ``jest``
+    flen : int
+        length of the distortion filters
+    block_size : int
+        number of samples per block
+
+    Yields
+    ------
+    k : int
+        index of the pair in ``pairs``
+    components : tuple of np.ndarray, shape=(nchan, block_size)
+        ``(s_true, e_spat, e_interf, e_artif)`` decomposition of
+        ``estimated_sources[jest]`` with respect to
+        ``reference_sources[jtrue]`` on one block.  The blocks of each pair
+        cover the ``nsampl + flen - 1`` samples of the decomposition,
+        followed by zeros.
+    """
+    nsrc, nchan, nsampl = reference_sources.shape
+    nest = estimated_sources.shape[0]
+    n_fft = int(2**np.ceil(np.log2(block_size + flen - 1.)))
+    starts = range(0, nsampl + flen - 1, block_size)
+
+    def segment(signals, start):
+        """Samples ``start - flen + 1`` to ``start + block_size`` of the
+        channels of the signals, zero-padded beyond their ends."""
+        seg = np.zeros(signals.shape[:-1] + (block_size + flen - 1,),
+                       dtype=signals.dtype)
+        first = start - flen + 1
+        lo, hi = max(first, 0), min(start + block_size, nsampl)
+        if lo < hi:
+            seg[..., lo - first:hi - first] = signals[..., lo:hi]
+        return seg.reshape(-1, block_size + flen - 1)
+
+    # inner products accumulated over the blocks: each block is correlated
+    # with the segment of the (delayed) reference signals ending with it
+    lags = np.zeros((nsrc * nchan, nsrc * nchan, flen),
+                    dtype=reference_sources.dtype)
+    D = np.zeros((nsrc * nchan * flen, nest * nchan), dtype=lags.dtype)
+    for start in starts:
+        seg = segment(reference_sources, start)
+        sf = _rfft(seg, n=n_fft, axis=1)
+        seg[:, :flen - 1] = 0
+        bf = _rfft(seg, n=n_fft, axis=1)
+        seg = segment(estimated_sources, start)
+        seg[:, :flen - 1] = 0
+        bef = _rfft(seg, n=n_fft, axis=1)
+        for i in range(nsrc * nchan):
+            lags[i] += _irfft(bf[i] * np.conj(sf), n=n_fft, axis=1)[:, :flen]
+            D[i * flen: (i+1) * flen] += _irfft(
+                bef * np.conj(sf[i]), n=n_fft, axis=1)[:, :flen].T
+    G = _lag_gram(lags)
+    C = _solve(G, D)
+    Cj = {}
+    for jest, group in itertools.groupby(enumerate(pairs),
+                                         key=lambda item: item[1][0]):
+        group = [(k, jtrue) for k, (_, jtrue) in group]
+        # the filters of each estimate are transformed once for all blocks
+        columns = slice(jest * nchan, (jest + 1) * nchan)
+        Cf = _filter_fft(C[:, columns], flen, n_fft)
+        Cjf = {}
+        for _, jtrue in group:
+            if jtrue not in Cj:
+                rows = slice(jtrue * nchan * flen,
+                             (jtrue + 1) * nchan * flen)
+                Cj[jtrue] = _solve(G[rows, rows], D[rows])
+            Cjf[jtrue] = _filter_fft(Cj[jtrue][:, columns], flen, n_fft)
+        for start in starts:
+            sf = _rfft(segment(reference_sources, start), n=n_fft, axis=1)
+            valid = slice(flen - 1, flen - 1 + block_size)
+            sproj = _irfft(np.einsum('cif,if->cf', Cf, sf), n=n_fft,
+                           axis=1)[:, valid]
+            e_artif = segment(estimated_sources[jest], start)[:, valid]
+            e_artif -= sproj
+            for k, jtrue in group:
+                refs = slice(jtrue * nchan, (jtrue + 1) * nchan)
+                sproj_j = _irfft(
+                    np.einsum('cif,if->cf', Cjf[jtrue], sf[refs]), n=n_fft,
+                    axis=1)[:, valid]
+                s_true = segment(reference_sources[jtrue], start)[:, valid]
+                yield k, (s_true, sproj_j - s_true, sproj - sproj_j, e_artif)
+
+
+def _lag_gram(lags):
+    """Inner products between delayed versions of the reference signals, with
+    delays between 0 and flen-1, from their accumulated lag correlations.
+
+    Parameters
+    ----------
+    lags : np.ndarray, shape=(nref, nref, flen)
+        ``lags[i, j, k]`` is the inner product of reference signal ``i`` and
+        reference signal ``j`` delayed by ``k``
+
+    Returns
+    -------
+    G : np.ndarray, shape=(nref * flen, nref * flen)
+        ``G[i * flen + a, j * flen + b]`` is the inner product of reference
+        signal ``i`` delayed by ``a`` and reference signal ``j`` delayed by
+        ``b``
+    """
+    import scipy.linalg
+
+    nref, _, flen = lags.shape
+    G = np.empty((nref * flen, nref * flen), dtype=lags.dtype)
+    for i in range(nref):
+        for j in range(nref):
+            G[i * flen: (i+1) * flen, j * flen: (j+1) * flen] = \
+                scipy.linalg.toeplitz(lags[j, i], r=lags[i, j])
+    return G
+
+
+def _single_precision_fft():
+    """The scipy.fft module (scipy >= 1.4), which unlike numpy.fft transforms
+    single precision input in single precision, or None if it is not
+    available."""
     try:
-        C = np.linalg.solve(G, D).reshape(flen, nsrc, order='F')
-    except np.linalg.linalg.LinAlgError:
-        C = np.linalg.lstsq(G, D)[0].reshape(flen, nsrc, order='F')
-    # Filtering
-    sproj = np.zeros(nsampl + flen - 1)
-    for i in range(nsrc):
-        sproj += fftconvolve(C[:, i], reference_sources[i])[:nsampl + flen - 1]
-    return sproj
-
-
-def _project_images(reference_sources, estimated_source, flen, G=None):
-    """Least-squares projection of estimated source on the subspace spanned by
-    delayed versions of reference sources, with delays between 0 and flen-1.
-    Passing G as all zeros will populate the G matrix and return it so it can
-    be passed into the next call to avoid recomputing G (this will only works
-    if not computing permutations).
+        import scipy.fft
+    except ImportError:
+        return None
+    return scipy.fft
+
+
+def _rfft(x, n, axis=-1):
+    """Real FFT, computed in single precision for single precision input if
+    scipy.fft is available."""
+    if x.dtype == np.float32:
+        fft = _single_precision_fft()
+        if fft is not None:
+            return fft.rfft(x, n=n, axis=axis)
+    return np.fft.rfft(x, n=n, axis=axis)
+
+
+def _irfft(x, n, axis=-1):
+    """Inverse real FFT, computed in single precision for single precision
+    input if scipy.fft is available."""
+    if x.dtype == np.complex64:
+        fft = _single_precision_fft()
+        if fft is not None:
+            return fft.irfft(x, n=n, axis=axis)
+    return np.fft.irfft(x, n=n, axis=axis)
+
+
+def _solve(G, D):
+    """Least-squares distortion filters, solving ``G C = D`` for all the
+    columns of D with a single factorization of G.
+
+    G is a Gram matrix, so the Cholesky factorization is tried first.
+    Numerically semi-definite matrices fall back to an LU factorization and
+    singular ones to a least-squares solution.
     """
-    nsrc = reference_sources.shape[0]
-    nsampl = reference_sources.shape[1]
-    nchan = reference_sources.shape[2]
-    reference_sources = np.reshape(np.transpose(reference_sources, (2, 0, 1)),
-                                   (nchan*nsrc, nsampl), order='F')
-
-    # computing coefficients of least squares problem via FFT ##
-    # zero padding and FFT of input data
-    reference_sources = np.hstack((reference_sources,
-                                   np.zeros((nchan*nsrc, flen - 1))))
-    estimated_source = \
-        np.hstack((estimated_source.transpose(), np.zeros((nchan, flen - 1))))
-    n_fft = int(2**np.ceil(np.log2(nsampl + flen - 1.)))
-    sf = scipy.fftpack.fft(reference_sources, n=n_fft, axis=1)
-    sef = scipy.fftpack.fft(estimated_source, n=n_fft)
+    import scipy.linalg
 
-    # inner products between delayed versions of reference_sources
-    if G is None:
-        saveg = False
-        G = np.zeros((nchan * nsrc * flen, nchan * nsrc * flen))
-        for i in range(nchan * nsrc):
-            for j in range(i+1):
-                ssf = sf[i] * np.conj(sf[j])
-                ssf = np.real(scipy.fftpack.ifft(ssf))
-                ss = toeplitz(np.hstack((ssf[0], ssf[-1:-flen:-1])),
-                              r=ssf[:flen])
-                G[i * flen: (i+1) * flen, j * flen: (j+1) * flen] = ss
-                G[j * flen: (j+1) * flen, i * flen: (i+1) * flen] = ss.T
-    else:  # avoid recomputing G (only works if no permutation is desired)
-        saveg = True  # return G
-        if np.all(G == 0):  # only compute G if passed as 0
-            G = np.zeros((nchan * nsrc * flen, nchan * nsrc * flen))
-            for i in range(nchan * nsrc):
-                for j in range(i+1):
-                    ssf = sf[i] * np.conj(sf[j])
-                    ssf = np.real(scipy.fftpack.ifft(ssf))
-                    ss = toeplitz(np.hstack((ssf[0], ssf[-1:-flen:-1])),
-                                  r=ssf[:flen])
-                    G[i * flen: (i+1) * flen, j * flen: (j+1) * flen] = ss
-                    G[j * flen: (j+1) * flen, i * flen: (i+1) * flen] = ss.T
-
-    # inner products between estimated_source and delayed versions of
-    # reference_sources
-    D = np.zeros((nchan * nsrc * flen, nchan))
-    for k in range(nchan * nsrc):
-        for i in range(nchan):
-            ssef = sf[k] * np.conj(sef[i])
-            ssef = np.real(scipy.fftpack.ifft(ssef))
-            D[k * flen: (k+1) * flen, i] = \
-                np.hstack((ssef[0], ssef[-1:-flen:-1])).transpose()
-
-    # Computing projection
-    # Distortion filters
     try:
-        C = np.linalg.solve(G, D).reshape(flen, nchan*nsrc, nchan, order='F')
-    except np.linalg.linalg.LinAlgError:
-        C = np.linalg.lstsq(G, D)[0].reshape(flen, nchan*nsrc, nchan,
-                                             order='F')
-    # Filtering
-    sproj = np.zeros((nchan, nsampl + flen - 1))
-    for k in range(nchan * nsrc):
-        for i in range(nchan):
-            sproj[i] += fftconvolve(C[:, k, i].transpose(),
-                                    reference_sources[k])[:nsampl + flen - 1]
-    # return G only if it was passed in
-    if saveg:
-        return sproj, G
-    else:
-        return sproj
+        return scipy.linalg.cho_solve(scipy.linalg.cho_factor(G), D)
+    except np.linalg.LinAlgError:
+        pass
+    try:
+        return np.linalg.solve(G, D)
+    except np.linalg.LinAlgError:
+        return np.linalg.lstsq(G, D, rcond=-1)[0]
+
+
+def _filter_fft(C, flen, n_fft):
+    """FFT of distortion filters, ``C[i * flen + a, c]`` being the filters
+    from each reference signal ``i`` to each channel ``c`` of an estimated
+    source, as an array of shape ``(nchan, nref, n_fft // 2 + 1)``.
+    """
+    return _rfft(C.T.reshape(C.shape[1], -1, flen), n=n_fft, axis=2)
+
+
+def _filter(sf, C, flen, n_fft):
+    """Sum of the reference signals filtered by the distortion filters, i.e.
+    the projection of an estimated source, computed in the frequency domain.
+
+    Parameters
+    ----------
+    sf : np.ndarray, shape=(nref, n_fft // 2 + 1)
+        FFT of the reference signals
+    C : np.ndarray, shape=(nref * flen, nchan)
+        distortion filters from each reference signal to each channel of the
+        estimated source
+    flen : int
+        length of the distortion filters
+    n_fft : int
+        FFT length, at least nsampl + flen - 1
+
+    Returns
+    -------
+    sproj : np.ndarray, shape=(nchan, n_fft)
+        projection of each channel of the estimated source
+    """
+    sproj = np.zeros((C.shape[1], sf.shape[1]), dtype=sf.dtype)
+    for i in range(sf.shape[0]):
+        sproj += _rfft(C[i * flen: (i+1) * flen].T, n=n_fft,
+                       axis=1) * sf[i]
+    return _irfft(sproj, n=n_fft, axis=1)
 
 
-def _bss_source_crit(s_true, e_spat, e_interf, e_artif):
-    """Measurement of the separation quality for a given source in terms of
-    filtered true source, interference and artifacts.
+def _bss_source_energies(s_true, e_spat, e_interf, e_artif):
+    """Energies of the signal and distortion terms of the SDR, SIR and SAR of
+    a given source, in terms of filtered true source, interference and
+    artifacts.
     """
-    # energy ratios
     s_filt = s_true + e_spat
-    sdr = _safe_db(np.sum(s_filt**2), np.sum((e_interf + e_artif)**2))
-    sir = _safe_db(np.sum(s_filt**2), np.sum(e_interf**2))
-    sar = _safe_db(np.sum((s_filt + e_interf)**2), np.sum(e_artif**2))
-    return (sdr, sir, sar)
+    return np.array([[np.sum(s_filt**2), np.sum((e_interf + e_artif)**2)],
+                     [np.sum(s_filt**2), np.sum(e_interf**2)],
+                     [np.sum((s_filt + e_interf)**2), np.sum(e_artif**2)]])
 
 
-def _bss_image_crit(s_true, e_spat, e_interf, e_artif):
-    """Measurement of the separation quality for a given image in terms of
-    filtered true source, spatial error, interference and artifacts.
+def _bss_image_energies(s_true, e_spat, e_interf, e_artif):
+    """Energies of the signal and distortion terms of the SDR, ISR, SIR and
+    SAR of a given image, in terms of filtered true source, spatial error,
+    interference and artifacts.
     """
-    # energy ratios
-    sdr = _safe_db(np.sum(s_true**2), np.sum((e_spat+e_interf+e_artif)**2))
-    isr = _safe_db(np.sum(s_true**2), np.sum(e_spat**2))
-    sir = _safe_db(np.sum((s_true+e_spat)**2), np.sum(e_interf**2))
-    sar = _safe_db(np.sum((s_true+e_spat+e_interf)**2), np.sum(e_artif**2))
-    return (sdr, isr, sir, sar)
+    return np.array([[np.sum(s_true**2),
+                      np.sum((e_spat + e_interf + e_artif)**2)],
+                     [np.sum(s_true**2), np.sum(e_spat**2)],
+                     [np.sum((s_true + e_spat)**2), np.sum(e_interf**2)],
+                     [np.sum((s_true + e_spat + e_interf)**2),
+                      np.sum(e_artif**2)]])
 
 
 def _safe_db(num, den):
@@ -834,6 +1326,7 @@ def _safe_db(num, den):
     return 10 * np.log10(num / den)
 
 
+@util.validate_once()
 def evaluate(reference_sources, estimated_sources, **kwargs):
     """Compute all metrics for the given reference and estimated signals.
 
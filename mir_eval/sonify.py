@@ -1,17 +1,133 @@
 '''
 Methods which sonify annotations for "evaluation by ear".
 All functions return a raw signal at the specified sampling rate.
+
+Streaming
+---------
+
+For long annotations, :func:`mir_eval.sonify.iter_clicks`,
+:func:`mir_eval.sonify.iter_time_frequency`,
+:func:`mir_eval.sonify.iter_pitch_contour`,
+:func:`mir_eval.sonify.iter_chroma` and :func:`mir_eval.sonify.iter_chords`
+generate the same signals as their counterparts block by block, without
+allocating the full output signal.  The blocks can be written to a wav file
+with :func:`mir_eval.sonify.write_wav`, or to a file object or array with
+:func:`mir_eval.sonify.write_raw`.
 '''
 
+import contextlib
+import wave
+
 import numpy as np
-from numpy.lib.stride_tricks import as_strided
-from scipy.interpolate import interp1d
 
 from . import util
 from . import chord
 
+# Number of samples times oscillators synthesized at once by time_frequency
+_CHUNK_SIZE = 2**16
+
+# Clicks up to this length are placed by a single scatter over all clicks,
+# longer ones are copied one at a time
+_MAX_SCATTER_LENGTH = 64
+
+
+def _clicks_synthesizer(times, fs, click, length, overlap):
+    """Prepare the synthesis of :func:`mir_eval.sonify.clicks`.
+
+    Returns
+    -------
+    length : int
+        number of samples in the output signal
+    synthesize : function
+        ``synthesize(click_signal, start)`` places the clicks in
+        ``click_signal``, a zero-initialized array for the samples from
+        ``start`` on
+    """
+    if overlap not in ('overwrite', 'sum'):
+        raise ValueError('Invalid overlap mode: {}'.format(overlap))
+    # Create default click signal
+    if click is None:
+        # 1 kHz tone, 100ms
+        click = np.sin(2*np.pi*np.arange(fs*.1)*1000/(1.*fs))
+        # Exponential decay
+        click *= np.exp(-np.arange(fs*.1)/(fs*.01))
+    # Set default length
+    if length is None:
+        length = int(times.max()*fs + click.shape[0] + 1)
 
-def clicks(times, fs, click=None, length=None):
+    # Compute the boundaries of the clicks
+    starts = (np.asarray(times) * fs).astype(int)
+    # Clicks are placed up to the first one which starts or ends past the end
+    # of the signal, which is truncated
+    n_clicks = len(starts)
+    past_end = np.flatnonzero(starts >= length)
+    if len(past_end):
+        n_clicks = past_end[0]
+    past_end = np.flatnonzero(starts[:n_clicks] + click.shape[0] >= length)
+    if len(past_end):
+        n_clicks = past_end[0] + 1
+    starts = starts[:n_clicks]
+
+    # Number of samples of each click which end up in the signal
+    lengths = np.full(n_clicks, click.shape[0], dtype=int)
+    ordered = np.all(starts[1:] >= starts[:-1])
+    if overlap == 'sum':
+        # The order of the clicks doesn't matter
+        starts = np.sort(starts)
+    elif ordered:
+        # Each click is overwritten by the next one
+        lengths[:-1] = np.minimum(lengths[:-1], np.diff(starts))
+
+    def synthesize(click_signal, start):
+        end = start + len(click_signal)
+        # Clip the clicks overlapping [start, end) to it
+        if ordered or overlap == 'sum':
+            first = np.searchsorted(starts, start - click.shape[0],
+                                    side='right')
+            last = np.searchsorted(starts, end, side='left')
+            index = np.arange(first, last)
+        else:
+            index = np.flatnonzero((starts < end) &
+                                   (starts + click.shape[0] > start))
+        offsets = np.maximum(start - starts[index], 0)
+        counts = (np.minimum(starts[index] + lengths[index], end) -
+                  starts[index] - offsets)
+        keep = counts > 0
+        offsets, counts = offsets[keep], counts[keep]
+        positions = starts[index[keep]] + offsets - start
+
+        if (overlap == 'overwrite' and not ordered or
+                click.shape[0] > _MAX_SCATTER_LENGTH):
+            # Long clicks are faster to copy one at a time, and clicks out
+            # of order have to be placed in order
+            for position, offset, count in zip(positions.tolist(),
+                                               offsets.tolist(),
+                                               counts.tolist()):
+                if overlap == 'sum':
+                    click_signal[position:position + count] += click[
+                        offset:offset + count]
+                else:
+                    click_signal[position:position + count] = click[
+                        offset:offset + count]
+            return
+
+        # Index of every sample of every clipped click in the click signal
+        # and in the click
+        click_index = (np.arange(counts.sum()) -
+                       np.repeat(np.cumsum(counts) - counts - offsets, counts))
+        signal_index = click_index + np.repeat(positions - offsets, counts)
+        if overlap == 'sum':
+            click_signal += np.bincount(signal_index,
+                                        weights=click[click_index],
+                                        minlength=end - start)
+        else:
+            # The clipped clicks don't overlap
+            click_signal[signal_index] = click[click_index]
+
+    return length, synthesize
+
+
+def clicks(times, fs, click=None, length=None, overlap='overwrite'):
     """Returns a signal with the signal 'click' placed at each specified time
 
     Parameters
@@ -25,6 +141,11 @@ def clicks(times, fs, click=None, length=None):
     length : int
         desired number of samples in the output signal,
         defaults to ``times.max()*fs + click.shape[0] + 1``
+    overlap : str
+        How overlapping clicks are combined: with ``'overwrite'``, each
+        click overwrites the clicks placed before it; with ``'sum'``, the
+        clicks are added.
+        (Default value = 'overwrite')
 
     Returns
     -------
@@ -32,36 +153,161 @@ def clicks(times, fs, click=None, length=None):
         Synthesized click signal
 
     """
-    # Create default click signal
-    if click is None:
-        # 1 kHz tone, 100ms
-        click = np.sin(2*np.pi*np.arange(fs*.1)*1000/(1.*fs))
-        # Exponential decay
-        click *= np.exp(-np.arange(fs*.1)/(fs*.01))
-    # Set default length
-    if length is None:
-        length = int(times.max()*fs + click.shape[0] + 1)
-
-    # Pre-allocate click signal
+    length, synthesize = _clicks_synthesizer(times, fs, click, length,
+                                             overlap)
+    # Place the clicks in blocks, to bound the size of the index arrays
     click_signal = np.zeros(length)
-    # Place clicks
-    for time in times:
-        # Compute the boundaries of the click
-        start = int(time*fs)
-        end = start + click.shape[0]
-        # Make sure we don't try to output past the end of the signal
-        if start >= length:
-            break
-        if end >= length:
-            click_signal[start:] = click[:length - start]
-            break
-        # Normally, just add a click here
-        click_signal[start:end] = click
+    for start in range(0, length, _CHUNK_SIZE):
+        synthesize(click_signal[start:start + _CHUNK_SIZE], start)
     return click_signal
 
 
+def iter_clicks(times, fs, click=None, length=None, overlap='overwrite',
+                block_size=16384):
+    """Generate the signal of :func:`mir_eval.sonify.clicks` block by block
+
+    Parameters
+    ----------
+    times : np.ndarray
+        times to place clicks, in seconds
+    fs : int
+        desired sampling rate of the output signal
+    click : np.ndarray
+        click signal, defaults to a 1 kHz blip
+    length : int
+        desired number of samples in the output signal,
+        defaults to ``times.max()*fs + click.shape[0] + 1``
+    overlap : str
+        How overlapping clicks are combined: with ``'overwrite'``, each
+        click overwrites the clicks placed before it; with ``'sum'``, the
+        clicks are added.
+        (Default value = 'overwrite')
+    block_size : int
+        number of samples per block; the last block may be shorter
+
+    Yields
+    ------
+    block : np.ndarray
+        Consecutive blocks of the synthesized click signal
+
+    """
+    length, synthesize = _clicks_synthesizer(times, fs, click, length,
+                                             overlap)
+    for start in range(0, length, block_size):
+        click_signal = np.zeros(min(block_size, length - start))
+        synthesize(click_signal, start)
+        yield click_signal
+
+
+def _time_frequency_synthesizer(gram, frequencies, times, fs, function,
+                                length, n_dec, dtype):
+    """Prepare the synthesis of :func:`mir_eval.sonify.time_frequency`.
+
+    Returns
+    -------
+    length : int
+        number of samples in the output signal
+    synthesize : function
+        ``synthesize(start, end)`` returns samples ``start:end`` of the
+        output signal, before normalization
+    """
+    # Default value for length
+    if times.ndim == 1:
+        # Convert to intervals
+        times = util.boundaries_to_intervals(times)
+
+    if length is None:
+        length = int(times[-1, 1] * fs)
+
+    times, _ = util.adjust_intervals(times, t_max=length)
+
+    # Truncate times so that the shape matches gram
+    n_times = gram.shape[1]
+    times = times[:n_times]
+
+    # Threshold the tfgram to remove non-positive values
+    gram = np.maximum(gram, 0)
+
+    # Round the frequencies so that n_period = 10**n_dec * fs samples span
+    # an integer number of periods of each of them.  Then a frequency spans
+    # cycles = 10**n_dec * frequency periods in n_period samples, and all the
+    # oscillators can be read from a single period of the waveform sampled
+    # at n_period points.
+    n_period = int(10.0**n_dec * fs)
+    cycles = np.round(np.asarray(frequencies, dtype=float) *
+                      10.0**n_dec).astype(np.int64)
+    period = function(2.0 * np.pi * np.arange(n_period) /
+                      n_period).astype(dtype, copy=False)
+
+    # Sample intervals of the columns.  Each sample is scaled by the number
+    # of intervals containing it (usually 0 or 1).
+    intervals = (times * fs).astype(int)
+    intervals = np.clip(intervals, 0, length)
+    intervals = intervals[intervals[:, 0] < intervals[:, 1]]
+    starts = np.sort(intervals[:, 0])
+    ends = np.sort(intervals[:, 1])
+
+    # The magnitudes are linearly interpolated between the interval centers
+    # and are zero outside of them.  Between two consecutive centers, the
+    # magnitudes of all rows are then affine functions of the sample index.
+    time_centers = np.mean(times, axis=1) * float(fs)
+    if len(time_centers) > 1:
+        order = np.argsort(time_centers, kind='mergesort')
+        time_centers = time_centers[order]
+        gram = gram[:, order]
+        # Sample segments between consecutive centers; the last one includes
+        # the last center
+        bounds = np.ceil(time_centers)
+        bounds[-1] = np.floor(time_centers[-1]) + 1
+        bounds = np.clip(bounds, 0, length).astype(int)
+    # If only one time point, the magnitudes are constant
+    else:
+        time_centers = np.array([0., 1.])
+        gram = gram[:, [0, 0]]
+        bounds = np.array([0, length])
+
+    def synthesize(start, end):
+        output = np.zeros(end - start, dtype=dtype)
+        # Segments overlapping [start, end)
+        first = max(np.searchsorted(bounds, start, side='right') - 1, 0)
+        last = np.searchsorted(bounds, end, side='left')
+        for m in range(first, min(last, len(bounds) - 1)):
+            segment_start = max(bounds[m], start)
+            segment_end = min(bounds[m + 1], end)
+            if segment_start >= segment_end:
+                continue
+            # Silent rows don't contribute to this segment
+            active = np.flatnonzero((gram[:, m] > 0) | (gram[:, m + 1] > 0))
+            if not len(active):
+                continue
+            offset = gram[active, m].astype(dtype)
+            slope = ((gram[active, m + 1] - gram[active, m]) /
+                     (time_centers[m + 1] - time_centers[m])).astype(dtype)
+
+            # Synthesize chunks of samples of all oscillators at once, with
+            # the number of samples per chunk chosen to keep the working set
+            # small
+            chunk = max(1, _CHUNK_SIZE // len(active))
+            for chunk_start in range(segment_start, segment_end, chunk):
+                chunk_end = min(chunk_start + chunk, segment_end)
+                samples = np.arange(chunk_start, chunk_end)
+                coverage = (np.searchsorted(starts, samples, side='right') -
+                            np.searchsorted(ends, samples, side='right'))
+                if not coverage.any():
+                    continue
+                # Look up the oscillators in the waveform period
+                wave = period[(samples % n_period) *
+                              cycles[active, np.newaxis] % n_period]
+                output[chunk_start - start:chunk_end - start] = coverage * (
+                    np.dot(offset, wave) +
+                    (samples - time_centers[m]) * np.dot(slope, wave))
+        return output
+
+    return length, synthesize
+
+
 def time_frequency(gram, frequencies, times, fs, function=np.sin, length=None,
-                   n_dec=1):
+                   n_dec=1, dtype=np.float64):
     """Reverse synthesis of a time-frequency representation of a signal
 
     Parameters
@@ -88,6 +334,10 @@ def time_frequency(gram, frequencies, times, fs, function=np.sin, length=None,
     n_dec : int
         the number of decimals used to approximate each sonfied frequency.
         Defaults to 1 decimal place. Higher precision will be slower.
+    dtype : np.dtype
+        data type of the output signal, e.g. ``np.float32`` to halve the
+        memory used by the synthesis.
+        (Default value = np.float64)
 
     Returns
     -------
@@ -95,93 +345,144 @@ def time_frequency(gram, frequencies, times, fs, function=np.sin, length=None,
         synthesized version of the piano roll
 
     """
-    # Default value for length
-    if times.ndim == 1:
-        # Convert to intervals
-        times = util.boundaries_to_intervals(times)
+    length, synthesize = _time_frequency_synthesizer(
+        gram, frequencies, times, fs, function, length, n_dec, dtype)
+    output = synthesize(0, length)
 
-    if length is None:
-        length = int(times[-1, 1] * fs)
+    # Normalize, but only if there's non-zero values
+    norm = np.abs(output).max()
+    if norm >= np.finfo(output.dtype).tiny:
+        output /= norm
 
-    times, _ = util.adjust_intervals(times, t_max=length)
+    return output
 
-    # Truncate times so that the shape matches gram
-    n_times = gram.shape[1]
-    times = times[:n_times]
 
-    def _fast_synthesize(frequency):
-        """A faster way to synthesize a signal.
-            Generate one cycle, and simulate arbitrary repetitions
-            using array indexing tricks.
-        """
-        # hack so that we can ensure an integer number of periods and samples
-        # rounds frequency to 1st decimal, s.t. 10 * frequency will be an int
-        frequency = np.round(frequency, n_dec)
-
-        # Generate 10*frequency periods at this frequency
-        # Equivalent to n_samples = int(n_periods * fs / frequency)
-        # n_periods = 10*frequency is the smallest integer that guarantees
-        # that n_samples will be an integer, since assuming 10*frequency
-        # is an integer
-        n_samples = int(10.0**n_dec * fs)
-
-        short_signal = function(2.0 * np.pi * np.arange(n_samples) *
-                                frequency / fs)
-
-        # Calculate the number of loops we need to fill the duration
-        n_repeats = int(np.ceil(length/float(short_signal.shape[0])))
-
-        # Simulate tiling the short buffer by using stride tricks
-        long_signal = as_strided(short_signal,
-                                 shape=(n_repeats, len(short_signal)),
-                                 strides=(0, short_signal.itemsize))
-
-        # Use a flatiter to simulate a long 1D buffer
-        return long_signal.flat
-
-    def _const_interpolator(value):
-        """Return a function that returns `value`
-            no matter the input.
-        """
-        def __interpolator(x):
-            return value
-        return __interpolator
+def iter_time_frequency(gram, frequencies, times, fs, function=np.sin,
+                        length=None, n_dec=1, dtype=np.float64,
+                        normalize=True, block_size=16384):
+    r"""Generate the signal of :func:`mir_eval.sonify.time_frequency` block by
+    block
 
-    # Threshold the tfgram to remove non-positive values
-    gram = np.maximum(gram, 0)
+    The oscillators are evaluated at the absolute sample index, so their
+    phase is continuous across blocks.
 
-    # Pre-allocate output signal
-    output = np.zeros(length)
-    time_centers = np.mean(times, axis=1) * float(fs)
+    Parameters
+    ----------
+    gram : np.ndarray
+        ``gram[n, m]`` is the magnitude of ``frequencies[n]``
+        from ``times[m]`` to ``times[m + 1]``
+
+        Non-positive magnitudes are interpreted as silence.
+
+    frequencies : np.ndarray
+        array of size ``gram.shape[0]`` denoting the frequency of
+        each row of gram
+    times : np.ndarray, shape= ``(gram.shape[1],)`` or ``(gram.shape[1], 2)``
+        Either the start time of each column in the gram,
+        or the time interval corresponding to each column.
+    fs : int
+        desired sampling rate of the output signal
+    function : function
+        function to use to synthesize notes, should be :math:`2\pi`-periodic
+    length : int
+        desired number of samples in the output signal,
+        defaults to ``times[-1]*fs``
+    n_dec : int
+        the number of decimals used to approximate each sonfied frequency.
+        Defaults to 1 decimal place. Higher precision will be slower.
+    dtype : np.dtype
+        data type of the output blocks
+        (Default value = np.float64)
+    normalize : bool
+        If True, the signal is normalized to a peak amplitude of 1 as in
+        :func:`mir_eval.sonify.time_frequency`.  The peak is found by
+        synthesizing the whole signal once before the first block is
+        generated, which doubles the synthesis time.  If False, blocks are
+        generated immediately, but are not normalized.
+        (Default value = True)
+    block_size : int
+        number of samples per block; the last block may be shorter
+
+    Yields
+    ------
+    block : np.ndarray
+        Consecutive blocks of the synthesized signal
+
+    """
+    length, synthesize = _time_frequency_synthesizer(
+        gram, frequencies, times, fs, function, length, n_dec, dtype)
+
+    norm = 1.
+    if normalize:
+        peak = 0.
+        for start in range(0, length, block_size):
+            block = synthesize(start, min(start + block_size, length))
+            peak = max(peak, np.abs(block).max())
+        if peak >= np.finfo(dtype).tiny:
+            norm = peak
+
+    for start in range(0, length, block_size):
+        block = synthesize(start, min(start + block_size, length))
+        if norm != 1.:
+            block /= norm
+        yield block
+
+
+def _pitch_contour_synthesizer(times, frequencies, fs, amplitudes, function,
+                               length, kind):
+    """Prepare the synthesis of :func:`mir_eval.sonify.pitch_contour`.
+
+    Returns
+    -------
+    length : int
+        number of samples in the output signal
+    synthesize : function
+        ``synthesize(start, end, phase)`` returns samples ``start:end`` of the
+        output signal and the phase at sample ``end - 1``, given the phase at
+        sample ``start - 1``
+    """
+    import scipy.interpolate
+
+    fs = float(fs)
+
+    if length is None:
+        length = int(times.max() * fs)
 
-    for n, frequency in enumerate(frequencies):
-        # Get a waveform of length samples at this frequency
-        wave = _fast_synthesize(frequency)
-
-        # Interpolate the values in gram over the time grid
-        if len(time_centers) > 1:
-            gram_interpolator = interp1d(
-                time_centers, gram[n, :],
-                kind='linear', bounds_error=False,
-                fill_value=0.0)
-        # If only one time point, create constant interpolator
+    # Squash the negative frequencies.
+    # wave(0) = 0, so clipping here will un-voice the corresponding instants
+    frequencies = np.maximum(frequencies, 0.0)
+
+    # Build a frequency interpolator
+    f_interp = scipy.interpolate.interp1d(
+        times * fs, 2 * np.pi * frequencies / fs, kind=kind,
+        fill_value=0.0, bounds_error=False, copy=False)
+
+    if amplitudes is not None:
+        # build an amplitude interpolator
+        a_interp = scipy.interpolate.interp1d(
+            times * fs, amplitudes, kind=kind,
+            fill_value=0.0, bounds_error=False, copy=False)
+
+    def synthesize(start, end, phase):
+        # Estimate frequency at sample points
+        f_est = f_interp(np.arange(start, end))
+
+        if amplitudes is None:
+            a_est = np.ones((end - start, ))
         else:
-            gram_interpolator = _const_interpolator(gram[n, 0])
+            a_est = a_interp(np.arange(start, end))
 
-        # Scale each time interval by the piano roll magnitude
-        for m, (start, end) in enumerate((times * fs).astype(int)):
-            # Clip the timings to make sure the indices are valid
-            start, end = max(start, 0), min(end, length)
-            # add to waveform
-            output[start:end] += (
-                wave[start:end] * gram_interpolator(np.arange(start, end)))
+        # Accumulate the phase from the end of the previous block
+        if len(f_est):
+            f_est[0] += phase
+        f_est = np.cumsum(f_est)
+        if len(f_est):
+            phase = f_est[-1]
 
-    # Normalize, but only if there's non-zero values
-    norm = np.abs(output).max()
-    if norm >= np.finfo(output.dtype).tiny:
-        output /= norm
+        # Sonify the waveform
+        return a_est * function(f_est), phase
 
-    return output
+    return length, synthesize
 
 
 def pitch_contour(times, frequencies, fs, amplitudes=None, function=np.sin,
@@ -220,34 +521,95 @@ def pitch_contour(times, frequencies, fs, amplitudes=None, function=np.sin,
     output : np.ndarray
         synthesized version of the pitch contour
     '''
+    length, synthesize = _pitch_contour_synthesizer(
+        times, frequencies, fs, amplitudes, function, length, kind)
+    return synthesize(0, length, 0.)[0]
 
-    fs = float(fs)
 
-    if length is None:
-        length = int(times.max() * fs)
+def iter_pitch_contour(times, frequencies, fs, amplitudes=None,
+                       function=np.sin, length=None, kind='linear',
+                       block_size=16384):
+    r'''Generate the signal of :func:`mir_eval.sonify.pitch_contour` block by
+    block
 
-    # Squash the negative frequencies.
-    # wave(0) = 0, so clipping here will un-voice the corresponding instants
-    frequencies = np.maximum(frequencies, 0.0)
+    The phase of the waveform is accumulated across blocks, so that the
+    blocks concatenate to the same signal as
+    :func:`mir_eval.sonify.pitch_contour`.
 
-    # Build a frequency interpolator
-    f_interp = interp1d(times * fs, 2 * np.pi * frequencies / fs, kind=kind,
-                        fill_value=0.0, bounds_error=False, copy=False)
+    Parameters
+    ----------
+    times : np.ndarray
+        time indices for each frequency measurement, in seconds
 
-    # Estimate frequency at sample points
-    f_est = f_interp(np.arange(length))
+    frequencies : np.ndarray
+        frequency measurements, in Hz.
+        Non-positive measurements will be interpreted as un-voiced samples.
 
-    if amplitudes is None:
-        a_est = np.ones((length, ))
-    else:
-        # build an amplitude interpolator
-        a_interp = interp1d(
-            times * fs, amplitudes, kind=kind,
-            fill_value=0.0, bounds_error=False, copy=False)
-        a_est = a_interp(np.arange(length))
+    fs : int
+        desired sampling rate of the output signal
 
-    # Sonify the waveform
-    return a_est * function(np.cumsum(f_est))
+    amplitudes : np.ndarray
+        amplitude measurments, nonnegative
+        defaults to ``np.ones((length,))``
+
+    function : function
+        function to use to synthesize notes, should be :math:`2\pi`-periodic
+
+    length : int
+        desired number of samples in the output signal,
+        defaults to ``max(times)*fs``
+
+    kind : str
+        Interpolation mode for the frequency and amplitude values.
+        See: ``scipy.interpolate.interp1d`` for valid settings.
+
+    block_size : int
+        number of samples per block; the last block may be shorter
+
+    Yields
+    ------
+    block : np.ndarray
+        Consecutive blocks of the synthesized pitch contour
+    '''
+    length, synthesize = _pitch_contour_synthesizer(
+        times, frequencies, fs, amplitudes, function, length, kind)
+    phase = 0.
+    for start in range(0, length, block_size):
+        block, phase = synthesize(start, min(start + block_size, length),
+                                  phase)
+        yield block
+
+
+def _shepard_gram(chromagram):
+    """Copy a chromagram across octaves into a Shepard tone-gram.
+
+    Returns
+    -------
+    gram : np.ndarray
+        Shepard tone-gram, with one row per semitone
+    frequencies : np.ndarray
+        frequency of each row of ``gram``, in Hz
+    """
+    # To create the Shepard tone-gram, we copy the chromagram across 7 octaves
+    n_octaves = 7
+    # starting from C2
+    base_note = 24
+    # and weight each octave by a normal distribution
+    # The normal distribution has mean 72 (one octave above middle C)
+    # and std 6 (one half octave)
+    mean = 72
+    std = 6
+    notes = np.arange(12*n_octaves) + base_note
+    shepard_weight = np.exp(-(notes - mean)**2./(2.*std**2.))
+    # Copy the chromagram matrix vertically n_octaves times
+    gram = np.tile(chromagram.T, n_octaves).T
+    # This fixes issues if the supplied chromagram is int type
+    gram = gram.astype(float)
+    # Apply Sheppard weighting
+    gram *= shepard_weight.reshape(-1, 1)
+    # Compute frequencies
+    frequencies = 440.0*(2.0**((notes - 69)/12.0))
+    return gram, frequencies
 
 
 def chroma(chromagram, times, fs, **kwargs):
@@ -275,28 +637,50 @@ def chroma(chromagram, times, fs, **kwargs):
 
     """
     # We'll just use time_frequency with a Shepard tone-gram
-    # To create the Shepard tone-gram, we copy the chromagram across 7 octaves
-    n_octaves = 7
-    # starting from C2
-    base_note = 24
-    # and weight each octave by a normal distribution
-    # The normal distribution has mean 72 (one octave above middle C)
-    # and std 6 (one half octave)
-    mean = 72
-    std = 6
-    notes = np.arange(12*n_octaves) + base_note
-    shepard_weight = np.exp(-(notes - mean)**2./(2.*std**2.))
-    # Copy the chromagram matrix vertically n_octaves times
-    gram = np.tile(chromagram.T, n_octaves).T
-    # This fixes issues if the supplied chromagram is int type
-    gram = gram.astype(float)
-    # Apply Sheppard weighting
-    gram *= shepard_weight.reshape(-1, 1)
-    # Compute frequencies
-    frequencies = 440.0*(2.0**((notes - 69)/12.0))
+    gram, frequencies = _shepard_gram(chromagram)
     return time_frequency(gram, frequencies, times, fs, **kwargs)
 
 
+def iter_chroma(chromagram, times, fs, **kwargs):
+    """Generate the signal of :func:`mir_eval.sonify.chroma` block by block
+
+    Parameters
+    ----------
+    chromagram : np.ndarray, shape=(12, times.shape[0])
+        Chromagram matrix, where each row represents a semitone [C->Bb]
+        i.e., ``chromagram[3, j]`` is the magnitude of D# from ``times[j]`` to
+        ``times[j + 1]``
+    times: np.ndarray, shape=(len(chord_labels),) or (len(chord_labels), 2)
+        Either the start time of each column in the chromagram,
+        or the time interval corresponding to each column.
+    fs : int
+        Sampling rate to synthesize audio data at
+    kwargs
+        Additional keyword arguments to pass to
+        :func:`mir_eval.sonify.iter_time_frequency`
+
+    Yields
+    ------
+    block : np.ndarray
+        Consecutive blocks of the synthesized chromagram
+
+    """
+    gram, frequencies = _shepard_gram(chromagram)
+    return iter_time_frequency(gram, frequencies, times, fs, **kwargs)
+
+
+def _chord_chromagram(chord_labels, intervals):
+    """Convert chord labels to a chromagram with one column per label."""
+    util.validate_intervals(intervals)
+
+    # Convert from labels to chroma
+    roots, interval_bitmaps, _ = chord.encode_many(chord_labels)
+    chromagram = np.array([np.roll(interval_bitmap, root)
+                           for (interval_bitmap, root)
+                           in zip(interval_bitmaps, roots)]).T
+    return chromagram
+
+
 def chords(chord_labels, intervals, fs, **kwargs):
     """Synthesizes chord labels
 
@@ -318,12 +702,101 @@ def chords(chord_labels, intervals, fs, **kwargs):
         Synthesized chord labels
 
     """
-    util.validate_intervals(intervals)
+    chromagram = _chord_chromagram(chord_labels, intervals)
+    return chroma(chromagram, intervals, fs, **kwargs)
 
-    # Convert from labels to chroma
-    roots, interval_bitmaps, _ = chord.encode_many(chord_labels)
-    chromagram = np.array([np.roll(interval_bitmap, root)
-                           for (interval_bitmap, root)
-                           in zip(interval_bitmaps, roots)]).T
 
-    return chroma(chromagram, intervals, fs, **kwargs)
+def iter_chords(chord_labels, intervals, fs, **kwargs):
+    """Generate the signal of :func:`mir_eval.sonify.chords` block by block
+
+    Parameters
+    ----------
+    chord_labels : list of str
+        List of chord label strings.
+    intervals : np.ndarray, shape=(len(chord_labels), 2)
+        Start and end times of each chord label
+    fs : int
+        Sampling rate to synthesize at
+    kwargs
+        Additional keyword arguments to pass to
+        :func:`mir_eval.sonify.iter_time_frequency`
+
+    Yields
+    ------
+    block : np.ndarray
+        Consecutive blocks of the synthesized chord labels
+
+    """
+    chromagram = _chord_chromagram(chord_labels, intervals)
+    return iter_chroma(chromagram, intervals, fs, **kwargs)
+
+
+def write_wav(filename, blocks, fs):
+    """Write blocks of a signal to a 16-bit PCM mono wav file as they are
+    generated
+
+    Samples are clipped to ``[-1, 1]``.  Unlike ``scipy.io.wavfile.write``,
+    this does not require the whole signal to be in memory.
+
+    Parameters
+    ----------
+    filename : str or file
+        Path of the output file, or a seekable file object opened for writing
+        in binary mode
+    blocks : iterable of np.ndarray
+        Blocks of the signal, e.g. generated by
+        :func:`mir_eval.sonify.iter_chords`
+    fs : int
+        Sampling rate of the signal
+
+    Returns
+    -------
+    n_samples : int
+        Number of samples written
+
+    """
+    n_samples = 0
+    with contextlib.closing(wave.open(filename, 'wb')) as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(int(fs))
+        for block in blocks:
+            block = np.clip(block, -1., 1.) * 32767
+            wav_file.writeframes(block.astype('<i2').tobytes())
+            n_samples += len(block)
+    return n_samples
+
+
+def write_raw(buffer, blocks, dtype=np.float32):
+    """Write blocks of a signal to a raw buffer as they are generated
+
+    Parameters
+    ----------
+    buffer : file or np.ndarray
+        File object opened for writing in binary mode, to which the samples
+        are written in native byte order, or array (e.g. a ``np.memmap``)
+        which is filled from the start
+    blocks : iterable of np.ndarray
+        Blocks of the signal, e.g. generated by
+        :func:`mir_eval.sonify.iter_chords`
+    dtype : np.dtype
+        Data type of the samples written to a file object.  Ignored when
+        ``buffer`` is an array.
+        (Default value = np.float32)
+
+    Returns
+    -------
+    n_samples : int
+        Number of samples written
+
+    """
+    n_samples = 0
+    for block in blocks:
+        if hasattr(buffer, 'write'):
+            buffer.write(block.astype(dtype).tobytes())
+        else:
+            if n_samples + len(block) > len(buffer):
+                raise ValueError('The signal does not fit into the buffer.')
+            buffer[n_samples:n_samples + len(block)] = block
+        n_samples += len(block)
+    return n_samples
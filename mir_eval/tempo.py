@@ -18,6 +18,8 @@ Metrics
 -------
 * :func:`mir_eval.tempo.detection`: Relative error, hits, and weighted
   precision of tempo estimation.
+* :func:`mir_eval.tempo.detection_batch`: The same metrics for many tracks at
+  once.
 
 '''
 
@@ -43,6 +45,7 @@ def validate_tempi(tempi):
         raise ValueError('tempi={} must be non-negative numbers'.format(tempi))
 
 
+@util.validator
 def validate(reference_tempi, reference_weight, estimated_tempi):
     """Checks that the input annotations to a metric look like valid tempo
     annotations.
@@ -137,6 +140,97 @@ def detection(reference_tempi, reference_weight, estimated_tempi, tol=0.08):
     return p_score, one_correct, both_correct
 
 
+def detection_batch(reference_tempi, reference_weights, estimated_tempi,
+                    tol=0.08):
+    """Compute the tempo detection accuracy metric for many tracks at once.
+
+    Examples
+    --------
+    >>> p_score, one_correct, both_correct = mir_eval.tempo.detection_batch(
+    ...     np.array([[60., 120.], [80., 160.]]), np.array([.5, .3]),
+    ...     np.array([[61., 90.], [40., 80.]]))
+    >>> p_score
+    array([0.5, 0.3])
+
+    Parameters
+    ----------
+    reference_tempi : np.ndarray, shape=(n, 2)
+        Two non-negative reference tempi per track
+
+    reference_weights : np.ndarray, shape=(n,)
+        The relative strength of ``reference_tempi[:, 0]`` vs
+        ``reference_tempi[:, 1]`` of each track.
+
+    estimated_tempi : np.ndarray, shape=(n, 2)
+        Two non-negative estimated tempi per track.
+
+    tol : float in [0, 1]:
+        The maximum allowable deviation from a reference tempo to
+        count as a hit.
+        ``|est_t - ref_t| <= tol * ref_t``
+        (Default value = 0.08)
+
+    Returns
+    -------
+    p_score : np.ndarray, shape=(n,)
+        P-score of each track, as returned by
+        :func:`mir_eval.tempo.detection`
+
+    one_correct : np.ndarray, shape=(n,), dtype=bool
+        True where at least one reference tempo was correctly estimated
+
+    both_correct : np.ndarray, shape=(n,), dtype=bool
+        True where both reference tempi were correctly estimated
+
+    Raises
+    ------
+    ValueError
+        If the input tempi are ill-formed
+
+        If a reference weight is not in the range [0, 1]
+
+        If ``tol < 0`` or ``tol > 1``.
+    """
+    reference_tempi = np.asarray(reference_tempi)
+    reference_weights = np.asarray(reference_weights)
+    estimated_tempi = np.asarray(estimated_tempi)
+
+    for tempi in [reference_tempi, estimated_tempi]:
+        if tempi.ndim != 2 or tempi.shape[1] != 2:
+            raise ValueError('tempi must have exactly two values per track')
+        if not np.all(np.isfinite(tempi)) or np.any(tempi <= 0):
+            raise ValueError('tempi must be non-negative numbers')
+    if (estimated_tempi.shape != reference_tempi.shape or
+            reference_weights.shape != reference_tempi.shape[:1]):
+        raise ValueError('There must be one reference weight, and one pair '
+                         'of reference and estimated tempi per track')
+    if np.any((reference_weights < 0) | (reference_weights > 1)):
+        raise ValueError('Reference weight must lie in range [0, 1]')
+
+    if tol < 0 or tol > 1:
+        raise ValueError('invalid tolerance {}: must lie in the range '
+                         '[0, 1]'.format(tol))
+    if tol == 0.:
+        warnings.warn('A tolerance of 0.0 may not '
+                      'lead to the results you expect.')
+
+    # Relative error of each reference tempo, shape=(n, 2)
+    relative_errors = np.min(
+        np.abs(reference_tempi[:, :, np.newaxis] -
+               estimated_tempi[:, np.newaxis, :]) /
+        reference_tempi[:, :, np.newaxis].astype(float), axis=-1)
+    hits = relative_errors <= tol
+
+    p_score = (reference_weights * hits[:, 0] +
+               (1.0 - reference_weights) * hits[:, 1])
+
+    one_correct = np.any(hits, axis=1)
+    both_correct = np.all(hits, axis=1)
+
+    return p_score, one_correct, both_correct
+
+
+@util.validate_once()
 def evaluate(reference_tempi, reference_weight, estimated_tempi, **kwargs):
     """Compute all metrics for the given reference and estimated annotations.
 
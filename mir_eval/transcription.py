@@ -114,6 +114,7 @@ import warnings
 N_DECIMALS = 4
 
 
+@util.validator
 def validate(ref_intervals, ref_pitches, est_intervals, est_pitches):
     """Checks that the input annotations to a metric look like time intervals
     and a pitch list, and throws helpful errors if not.
@@ -149,6 +150,7 @@ def validate(ref_intervals, ref_pitches, est_intervals, est_pitches):
                          "value")
 
 
+@util.validator
 def validate_intervals(ref_intervals, est_intervals):
     """Checks that the input annotations to a metric look like time intervals,
     and throws helpful errors if not.
@@ -754,6 +756,7 @@ def offset_precision_recall_f1(ref_intervals, est_intervals, offset_ratio=0.2,
     return offset_precision, offset_recall, offset_f_measure
 
 
+@util.validate_once()
 def evaluate(ref_intervals, ref_pitches, est_intervals, est_pitches, **kwargs):
     """Compute all metrics for the given reference and estimated annotations.
 
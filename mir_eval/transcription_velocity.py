@@ -59,6 +59,7 @@ from . import transcription
 from . import util
 
 
+@util.validator
 def validate(ref_intervals, ref_pitches, ref_velocities, est_intervals,
              est_pitches, est_velocities):
     """Checks that the input annotations have valid time intervals, pitches,
@@ -303,6 +304,7 @@ def precision_recall_f1_overlap(
     return precision, recall, f_measure, avg_overlap_ratio
 
 
+@util.validate_once()
 def evaluate(ref_intervals, ref_pitches, ref_velocities, est_intervals,
              est_pitches, est_velocities, **kwargs):
     """Compute all metrics for the given reference and estimated annotations.
@@ -3,8 +3,10 @@ This submodule collects useful functionality required across the task
 submodules, such as preprocessing, validation, and common computations.
 '''
 
+import functools
 import os
 import inspect
+import threading
 import six
 
 import numpy as np
@@ -25,7 +27,7 @@ def index_labels(labels, case_sensitive=False):
 
     Returns
     -------
-    indices : list, shape=(n,)
+    indices : np.ndarray, shape=(n,)
         Numerical representation of ``labels``
     index_to_label : dict
         Mapping to convert numerical indices back to labels.
@@ -33,23 +35,23 @@ def index_labels(labels, case_sensitive=False):
 
     """
 
-    label_to_index = {}
-    index_to_label = {}
-
-    # If we're not case-sensitive,
+    labels = np.asarray(labels)
     if not case_sensitive:
-        labels = [str(s).lower() for s in labels]
+        labels = labels.astype(str)
 
-    # First, build the unique label mapping
-    for index, s in enumerate(sorted(set(labels))):
-        label_to_index[s] = index
-        index_to_label[index] = s
+    # The unique labels are sorted, and each label is mapped to the index of
+    # its unique label
+    unique_labels, indices = np.unique(labels, return_inverse=True)
 
-    # Remap the labels to indices
-    indices = [label_to_index[s] for s in labels]
+    # If we're not case-sensitive, only the unique labels are lower-cased,
+    # and the ones which become equal are merged
+    if not case_sensitive:
+        unique_labels, merged = np.unique(np.char.lower(unique_labels),
+                                          return_inverse=True)
+        indices = merged[indices]
 
     # Return the converted labels, and the inverse mapping
-    return indices, index_to_label
+    return indices, dict(enumerate(unique_labels.tolist()))
 
 
 def generate_labels(items, prefix='__'):
@@ -74,7 +76,7 @@ def generate_labels(items, prefix='__'):
 
 
 def intervals_to_samples(intervals, labels, offset=0, sample_size=0.1,
-                         fill_value=None):
+                         fill_value=None, return_index=False):
     """Convert an array of labeled time intervals to annotated samples.
 
     Parameters
@@ -101,14 +103,27 @@ def intervals_to_samples(intervals, labels, offset=0, sample_size=0.1,
         Object to use for the label with out-of-range time points.
         (Default value = None)
 
+    return_index : bool
+        If True, return the sample times as an array, and the sample labels
+        as label indices, see :func:`interpolate_intervals`.
+        (Default value = False)
+
     Returns
     -------
-    sample_times : list
+    sample_times : list or np.ndarray
         list of sample times
 
     sample_labels : list
         array of labels for each generated sample
 
+    sample_indices : np.ndarray, shape=(m,)
+        index of the label of each generated sample
+        (only if ``return_index`` is True, instead of ``sample_labels``)
+
+    index_to_label : dict
+        Mapping to convert indices back to labels
+        (only if ``return_index`` is True)
+
     Notes
     -----
         Intervals will be rounded down to the nearest multiple
@@ -119,14 +134,21 @@ def intervals_to_samples(intervals, labels, offset=0, sample_size=0.1,
     # Round intervals to the sample size
     num_samples = int(np.floor(intervals.max() / sample_size))
     sample_indices = np.arange(num_samples, dtype=np.float32)
-    sample_times = (sample_indices*sample_size + offset).tolist()
+    sample_times = sample_indices*sample_size + offset
+    if return_index:
+        sample_times = sample_times.astype(np.float64)
+        return (sample_times,) + interpolate_intervals(
+            intervals, labels, sample_times, fill_value, return_index=True)
+
+    sample_times = sample_times.tolist()
     sampled_labels = interpolate_intervals(
         intervals, labels, sample_times, fill_value)
 
     return sample_times, sampled_labels
 
 
-def interpolate_intervals(intervals, labels, time_points, fill_value=None):
+def interpolate_intervals(intervals, labels, time_points, fill_value=None,
+                          return_index=False):
     """Assign labels to a set of points in time given a set of intervals.
 
     Time points that do not lie within an interval are mapped to `fill_value`.
@@ -152,11 +174,25 @@ def interpolate_intervals(intervals, labels, time_points, fill_value=None):
         Object to use for the label with out-of-range time points.
         (Default value = None)
 
+    return_index : bool
+        If True, return the labels as indices and the mapping back to
+        labels, exactly as ``index_labels(aligned_labels)`` would, without
+        building the list of labels of every time point.
+        (Default value = False)
+
     Returns
     -------
     aligned_labels : list
         Labels corresponding to the given time points.
 
+    label_indices : np.ndarray, shape=(m,)
+        Indices of the labels corresponding to the given time points
+        (only if ``return_index`` is True, instead of ``aligned_labels``)
+
+    index_to_label : dict
+        Mapping to convert indices back to labels, see :func:`index_labels`
+        (only if ``return_index`` is True)
+
     Raises
     ------
     ValueError
@@ -169,17 +205,70 @@ def interpolate_intervals(intervals, labels, time_points, fill_value=None):
     if np.any(time_points[1:] < time_points[:-1]):
         raise ValueError('time_points must be in non-decreasing order')
 
-    aligned_labels = [fill_value] * len(time_points)
-
     starts = np.searchsorted(time_points, intervals[:, 0], side='left')
     ends = np.searchsorted(time_points, intervals[:, 1], side='right')
 
+    if return_index:
+        # Index of the interval of each time point, len(labels) standing
+        # for fill_value
+        interval_indices = _interval_indices(starts, ends, len(time_points))
+        # Index the labels of the intervals, and keep only the labels which
+        # are used, in the same order
+        label_indices, index_to_label = index_labels(
+            list(labels) + [fill_value])
+        label_indices = np.asarray(label_indices)[interval_indices]
+        used = np.zeros(len(index_to_label), dtype=bool)
+        used[label_indices] = True
+        label_indices = np.cumsum(used)[label_indices] - 1
+        index_to_label = dict(enumerate(index_to_label[index]
+                                        for index in np.flatnonzero(used)))
+        return label_indices, index_to_label
+
+    aligned_labels = [fill_value] * len(time_points)
+
     for (start, end, lab) in zip(starts, ends, labels):
         aligned_labels[start:end] = [lab] * (end - start)
 
     return aligned_labels
 
 
+def _interval_indices(starts, ends, n_points):
+    """Index of the interval containing each point, given the range
+    ``starts[i]:ends[i]`` of the points contained in each interval.  As when
+    assigning the ranges one after the other, a point contained in several
+    intervals gets the last one, and a point outside of all intervals gets
+    ``len(starts)``.
+    """
+    n_intervals = len(starts)
+    if np.all(starts[1:] >= starts[:-1]) and np.all(ends[1:] >= ends[:-1]):
+        # Ordered intervals only overlap their successors, which take over the
+        # shared points, so the ranges are made disjoint and the indices are
+        # repeated over them, with fill segments in between
+        ends = np.maximum(np.minimum(ends, np.append(starts[1:], n_points)),
+                          starts)
+        values = np.full(2 * n_intervals + 1, n_intervals, dtype=int)
+        values[1::2] = np.arange(n_intervals)
+        lengths = np.empty(2 * n_intervals + 1, dtype=int)
+        lengths[::2] = np.append(starts, n_points) - np.append(0, ends)
+        lengths[1::2] = ends - starts
+        return np.repeat(values, lengths)
+
+    # Otherwise, list the points of every interval, and keep the last
+    # interval of each point
+    lengths = np.maximum(ends - starts, 0)
+    intervals = np.repeat(np.arange(n_intervals), lengths)
+    points = (np.arange(lengths.sum()) +
+              np.repeat(starts - np.cumsum(lengths) + lengths, lengths))
+    # A stable sort keeps the intervals of each point in order
+    order = np.argsort(points, kind='mergesort')
+    points, intervals = points[order], intervals[order]
+    last = np.ones(len(points), dtype=bool)
+    last[:-1] = points[1:] != points[:-1]
+    interval_indices = np.full(n_points, n_intervals, dtype=int)
+    interval_indices[points[last]] = intervals[last]
+    return interval_indices
+
+
 def sort_labeled_intervals(intervals, labels=None):
     '''Sort intervals, and optionally, their corresponding labels
     according to start time.
@@ -533,17 +622,37 @@ def merge_labeled_intervals(x_intervals, x_labels, y_intervals, y_labels):
     output_intervals = np.array(
         [time_boundaries[:-1], time_boundaries[1:]]).T
 
-    x_labels_out, y_labels_out = [], []
-    x_label_range = np.arange(len(x_labels))
-    y_label_range = np.arange(len(y_labels))
-    for t0, _ in output_intervals:
-        x_idx = x_label_range[(t0 >= x_intervals[:, 0])]
-        x_labels_out.append(x_labels[x_idx[-1]])
-        y_idx = y_label_range[(t0 >= y_intervals[:, 0])]
-        y_labels_out.append(y_labels[y_idx[-1]])
+    x_idx = _last_interval_starting(x_intervals, time_boundaries[:-1])
+    y_idx = _last_interval_starting(y_intervals, time_boundaries[:-1])
+    x_labels_out = [x_labels[i] for i in x_idx]
+    y_labels_out = [y_labels[i] for i in y_idx]
     return output_intervals, x_labels_out, y_labels_out
 
 
+def _last_interval_starting(intervals, times):
+    """Index of the last interval starting at or before each of the given
+    times.
+
+    Parameters
+    ----------
+    intervals : np.ndarray, shape=(n, 2)
+        Array of interval times (seconds)
+    times : np.ndarray, shape=(m,)
+        Array of times (seconds), none of them before all the intervals
+
+    Returns
+    -------
+    idx : np.ndarray, shape=(m,)
+        ``idx[k]`` is the largest ``i`` with
+        ``intervals[i, 0] <= times[k]``
+    """
+    # The minimum start of the intervals from i on is non-decreasing in i,
+    # and is at most t exactly for the i up to the last interval starting
+    # at or before t, even if the intervals are not sorted
+    min_starts = np.minimum.accumulate(intervals[::-1, 0])[::-1]
+    return np.searchsorted(min_starts, times, side='right') - 1
+
+
 def _bipartite_match(graph):
     """Find maximum cardinality matching of a bipartite graph (U,V,E).
     The input format is a dictionary mapping members of U to a list
@@ -755,6 +864,136 @@ def _fast_hit_windows(ref, est, window):
     return hit_ref, hit_est
 
 
+# Per-thread state of the validation functions, see validate_once and
+# trusted_inputs
+_VALIDATION = threading.local()
+
+
+def validator(function):
+    """Decorator marking a function as an input validation function, which
+    raises errors on malformed inputs and otherwise returns nothing.
+
+    A validation function is skipped within :func:`trusted_inputs`, and runs
+    only once for the same input objects within :func:`validate_once`.
+
+    Parameters
+    ----------
+    function : function
+        The validation function
+
+    Returns
+    -------
+    validate_function : function
+        The decorated validation function
+
+    """
+
+    @functools.wraps(function)
+    def validate_function(*args, **kwargs):
+        if getattr(_VALIDATION, 'trusted', False):
+            return
+        validated = getattr(_VALIDATION, 'validated', None)
+        if validated is None:
+            function(*args, **kwargs)
+            return
+        # The inputs are identified by the objects themselves, which are kept
+        # in ``validated`` so that their ids can't be reused by other objects
+        key = (function, tuple(id(arg) for arg in args),
+               tuple(sorted((name, id(value))
+                            for name, value in kwargs.items())))
+        if key not in validated:
+            function(*args, **kwargs)
+            validated[key] = (args, kwargs)
+
+    # functools.wraps only sets __wrapped__ on Python 3
+    validate_function.__wrapped__ = function
+    return validate_function
+
+
+class _ValidationContext(object):
+    """Context manager, also usable as a function decorator, changing how the
+    validation functions run in the current thread."""
+
+    def __init__(self, trusted):
+        self.trusted = trusted
+        self._saved = []
+
+    def __enter__(self):
+        validated = getattr(_VALIDATION, 'validated', None)
+        trusted = getattr(_VALIDATION, 'trusted', False)
+        self._saved.append((validated, trusted))
+        # Nested contexts share the inputs validated by the outer one
+        if validated is None:
+            _VALIDATION.validated = {}
+        _VALIDATION.trusted = trusted or self.trusted
+        return self
+
+    def __exit__(self, *exc_info):
+        _VALIDATION.validated, _VALIDATION.trusted = self._saved.pop()
+
+    def __call__(self, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _ValidationContext(self.trusted):
+                return function(*args, **kwargs)
+
+        wrapper.__wrapped__ = function
+        return wrapper
+
+
+def validate_once():
+    """Validate each set of inputs only once.
+
+    Within this context, the validation functions of the task submodules
+    (e.g. :func:`mir_eval.beat.validate`) and of this submodule run only the
+    first time they are called on the same input objects, so that a
+    pipeline computing several metrics of the same inputs validates them
+    once.  The inputs must not be modified in place within the context.
+    The ``evaluate`` functions of the task submodules run within this
+    context.  It can also be used as a function decorator.
+
+    Examples
+    --------
+    >>> with mir_eval.util.validate_once():
+    ...     f_measure = mir_eval.beat.f_measure(reference_beats,
+    ...                                         estimated_beats)
+    ...     p_score = mir_eval.beat.p_score(reference_beats,
+    ...                                     estimated_beats)
+
+    Returns
+    -------
+    context : context manager
+        The validation context, valid in the current thread
+
+    """
+    return _ValidationContext(trusted=False)
+
+
+def trusted_inputs():
+    """Skip the validation of the inputs.
+
+    Within this context, the validation functions of the task submodules
+    and of this submodule are not run at all.  This is only safe for inputs
+    which were already validated, e.g. once when they were loaded, as the
+    metrics may otherwise fail or return wrong scores on malformed inputs.
+    It can also be used as a function decorator.
+
+    Examples
+    --------
+    >>> mir_eval.beat.validate(reference_beats, estimated_beats)
+    >>> with mir_eval.util.trusted_inputs():
+    ...     scores = mir_eval.beat.evaluate(reference_beats, estimated_beats)
+
+    Returns
+    -------
+    context : context manager
+        The validation context, valid in the current thread
+
+    """
+    return _ValidationContext(trusted=True)
+
+
+@validator
 def validate_intervals(intervals):
     """Checks that an (n, 2) interval ndarray is well-formed, and raises errors
     if not.
@@ -780,6 +1019,7 @@ def validate_intervals(intervals):
         raise ValueError('All interval durations must be strictly positive')
 
 
+@validator
 def validate_events(events, max_time=30000.):
     """Checks that a 1-d event location ndarray is well-formed, and raises
     errors if not.
@@ -808,6 +1048,7 @@ def validate_events(events, max_time=30000.):
         raise ValueError('Events should be in increasing order.')
 
 
+@validator
 def validate_frequencies(frequencies, max_freq, min_freq,
                          allow_negatives=False):
     """Checks that a 1-d frequency ndarray is well-formed, and raises
@@ -874,7 +1115,7 @@ def has_kwargs(function):
 
 
 def filter_kwargs(_function, *args, **kwargs):
-    """Given a function and args and keyword args to pass to it, call the function
+    r"""Given a function and args and keyword args to pass to it, call the function
     but using only the keyword arguments which it accepts.  This is equivalent
     to redefining the function with an additional \*\*kwargs to accept slop
     keyword args.
@@ -889,11 +1130,15 @@ def filter_kwargs(_function, *args, **kwargs):
 
     """
 
-    if has_kwargs(_function):
+    # Inspect the original function if it has been wrapped, e.g. by
+    # mir_eval.profiling
+    wrapped_function = getattr(_function, '__wrapped__', _function)
+
+    if has_kwargs(wrapped_function):
         return _function(*args, **kwargs)
 
     # Get the list of function arguments
-    func_code = six.get_function_code(_function)
+    func_code = six.get_function_code(wrapped_function)
     function_args = func_code.co_varnames[:func_code.co_argcount]
     # Construct a dict of those kwargs which appear in the function
     filtered_kwargs = {}
@@ -0,0 +1,99 @@
+'''
+Tests for mir_eval.cache
+'''
+
+import glob
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import nose.tools
+import mir_eval
+
+A_TOL = 1e-12
+
+# Path to the fixture files
+REF_GLOB = 'data/onset/ref*.txt'
+EST_GLOB = 'data/onset/est*.txt'
+
+
+def _cache_files(cache_dir):
+    return sorted(glob.glob(os.path.join(cache_dir, 'onset', '*.json')))
+
+
+def test_cache_evaluate():
+    ref_f = sorted(glob.glob(REF_GLOB))[0]
+    est_f = sorted(glob.glob(EST_GLOB))[0]
+    cache_dir = tempfile.mkdtemp()
+    loaded = []
+
+    def loader(filename):
+        loaded.append(filename)
+        return mir_eval.io.load_events(filename)
+
+    try:
+        expected_scores = mir_eval.onset.evaluate(
+            mir_eval.io.load_events(ref_f), mir_eval.io.load_events(est_f))
+        scores = mir_eval.cache.evaluate(mir_eval.onset, ref_f, est_f,
+                                         loader, cache_dir)
+        assert len(_cache_files(cache_dir)) == 1
+        assert loaded == [ref_f, est_f]
+        # A second call should be read back from the cache, without loading
+        # or evaluating anything
+        cached_scores = mir_eval.cache.evaluate(
+            mir_eval.onset, ref_f, est_f, loader, cache_dir)
+        assert len(_cache_files(cache_dir)) == 1
+        assert loaded == [ref_f, est_f]
+        assert cached_scores == scores
+        for scores_ in [scores, cached_scores]:
+            assert list(scores_.keys()) == list(expected_scores.keys())
+            for metric in expected_scores:
+                assert np.allclose(scores_[metric], expected_scores[metric],
+                                   atol=A_TOL)
+        # Changing a metric keyword argument creates a new entry
+        mir_eval.cache.evaluate(mir_eval.onset, ref_f, est_f,
+                                mir_eval.io.load_events, cache_dir, window=.1)
+        assert len(_cache_files(cache_dir)) == 2
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_cache_evaluate_types():
+    # Array-valued scores have the same type whether or not they are cached
+    ref_f = 'data/separation/ref01/0.wav'
+    est_f = 'data/separation/est01/0.wav'
+
+    def loader(filename):
+        return mir_eval.io.load_wav(filename)[0][np.newaxis, :5000]
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        scores = mir_eval.cache.evaluate(mir_eval.separation, ref_f, est_f,
+                                         loader, cache_dir)
+        cached_scores = mir_eval.cache.evaluate(
+            mir_eval.separation, ref_f, est_f, loader, cache_dir)
+        assert cached_scores == scores
+        for metric in scores:
+            assert isinstance(cached_scores[metric], type(scores[metric]))
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_cache_key():
+    ref_f, ref_g = sorted(glob.glob(REF_GLOB))[:2]
+    est_f = sorted(glob.glob(EST_GLOB))[0]
+    key = mir_eval.cache.cache_key(mir_eval.onset, ref_f, est_f)
+    assert key == mir_eval.cache.cache_key(mir_eval.onset, ref_f, est_f)
+    assert key != mir_eval.cache.cache_key(mir_eval.beat, ref_f, est_f)
+    assert key != mir_eval.cache.cache_key(mir_eval.onset, ref_g, est_f)
+    assert key != mir_eval.cache.cache_key(mir_eval.onset, ref_f, est_f,
+                                           window=.1)
+    # Keyword argument order does not matter
+    assert (mir_eval.cache.cache_key(mir_eval.onset, ref_f, est_f,
+                                     window=.1, beta=2.) ==
+            mir_eval.cache.cache_key(mir_eval.onset, ref_f, est_f,
+                                     beta=2., window=.1))
+    # Keyword arguments whose representation isn't stable are rejected
+    nose.tools.assert_raises(TypeError, mir_eval.cache.cache_key,
+                             mir_eval.onset, ref_f, est_f, window=len)
@@ -449,6 +449,12 @@ def test_directional_hamming_distance():
     assert np.allclose(0, dhd(ref_ivs, ref_ivs))
     assert np.allclose(0, dhd(est_ivs, est_ivs))
 
+    # Reference intervals with a gap, and estimated boundaries on their
+    # starts
+    gap_ivs = np.array([[0., 1.], [2., 3.]])
+    gap_est_ivs = np.array([[0., 0.5], [0.5, 2.5], [2.5, 3.]])
+    assert np.allclose((0.5 + 0.5) / 3., dhd(gap_ivs, gap_est_ivs))
+
     ivs_overlap_all = np.array([[0., 1.], [0.9, 2.]])
     ivs_overlap_one = np.array([[0., 1.], [0.9, 2.], [2., 3.]])
     nose.tools.assert_raises(ValueError, dhd, ivs_overlap_all, est_ivs)
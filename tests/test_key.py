@@ -64,3 +64,31 @@ def test_key_functions():
             # This is a simple hack to make nosetest's messages more useful
             yield (__check_score, sco_f, metric, scores[metric],
                    expected_scores[metric])
+
+
+def test_weighted_score_batch():
+    tonics = ['C', 'C#', 'Db', 'D', 'Eb', 'E', 'F', 'F#', 'G', 'Ab', 'A', 'Bb',
+              'B']
+    keys = ['{} {}'.format(tonic, mode) for tonic in tonics
+            for mode in ['major', 'minor']]
+    reference_keys = [ref for ref in keys for _ in keys]
+    estimated_keys = [est for _ in keys for est in keys]
+    reference_tonics, reference_modes = mir_eval.key.encode_keys(
+        reference_keys)
+    estimated_tonics, estimated_modes = mir_eval.key.encode_keys(
+        estimated_keys)
+    scores = mir_eval.key.weighted_score_batch(
+        reference_tonics, reference_modes, estimated_tonics, estimated_modes)
+    # Scores match the per-track scores
+    assert np.array_equal(scores, [mir_eval.key.weighted_score(ref, est)
+                                   for ref, est in zip(reference_keys,
+                                                       estimated_keys)])
+
+    nose.tools.assert_raises(ValueError, mir_eval.key.encode_keys,
+                             ['C major', 'C maj'])
+    for bad_tonics, bad_modes in [([12], [0]), ([1.5], [0]), ([0], [2]),
+                                  ([0, 1], [0])]:
+        nose.tools.assert_raises(ValueError, mir_eval.key.weighted_score_batch,
+                                 bad_tonics, bad_modes, [0], [0])
+        nose.tools.assert_raises(ValueError, mir_eval.key.weighted_score_batch,
+                                 [0], [0], bad_tonics, bad_modes)
@@ -75,6 +75,54 @@ def test_resample_melody_series_same_times():
     assert np.allclose(res_voicing, expected_voicing)
 
 
+def __scipy_resample_melody_series(times, frequencies, voicing, times_new,
+                                   kind):
+    # Reference implementation of the resampling, using interp1d throughout
+    import scipy.interpolate
+    times = np.round(times, 10)
+    times_new = np.round(times_new, 10)
+    if times_new.max() > times.max():
+        times = np.append(times, times_new.max())
+        frequencies = np.append(frequencies, 0)
+        voicing = np.append(voicing, 0)
+    if kind != 'zero' and kind != 'nearest':
+        frequencies_held = np.array(frequencies)
+        for n, frequency in enumerate(frequencies[1:]):
+            if frequency == 0:
+                frequencies_held[n + 1] = frequencies_held[n]
+        frequencies_resampled = scipy.interpolate.interp1d(
+            times, frequencies_held, kind)(times_new)
+        frequencies_resampled *= scipy.interpolate.interp1d(
+            times, frequencies, 'zero')(times_new) != 0
+    else:
+        frequencies_resampled = scipy.interpolate.interp1d(
+            times, frequencies, kind)(times_new)
+    voicing_resampled = scipy.interpolate.interp1d(
+        times, voicing, 'nearest' if kind == 'nearest' else 'zero')(times_new)
+    return frequencies_resampled, voicing_resampled.astype(bool)
+
+
+def test_resample_melody_series_scipy():
+    # The numpy resampling must match interp1d exactly
+    def __test(kind, times_new):
+        expected = __scipy_resample_melody_series(times, frequencies, voicing,
+                                                  times_new, kind)
+        result = mir_eval.melody.resample_melody_series(
+            times, frequencies, voicing, times_new, kind)
+        assert np.array_equal(result[0], expected[0])
+        assert np.array_equal(result[1], expected[1])
+
+    rng = np.random.RandomState(0)
+    times = np.arange(200)*.01
+    frequencies = rng.uniform(100, 1000, 200)*(rng.rand(200) > .3)
+    voicing = rng.rand(200) > .2
+    for kind in ['linear', 'zero', 'nearest']:
+        # Finer timebase, coarser timebase with exact ties, and a longer one
+        for times_new in [np.arange(800)*.0025, np.arange(100)*.02,
+                          np.arange(150)*.0137]:
+            yield __test, kind, times_new
+
+
 def test_to_cent_voicing():
     # We'll just test a few values from one of the test annotations
     ref_file = sorted(glob.glob(REF_GLOB))[0]
@@ -199,3 +247,93 @@ def test_melody_functions():
             # This is a simple hack to make nosetest's messages more useful
             yield (__check_score, sco_f, metric, scores[metric],
                    expected_scores[metric])
+
+
+def test_evaluate_cent_voicing():
+    def __test(ref_v, ref_c, est_v, est_c, dtype):
+        scores = mir_eval.melody.evaluate_cent_voicing(ref_v, ref_c,
+                                                       est_v, est_c,
+                                                       dtype=dtype)
+        expected = [mir_eval.melody.voicing_measures(ref_v, est_v)[0],
+                    mir_eval.melody.voicing_measures(ref_v, est_v)[1],
+                    mir_eval.melody.raw_pitch_accuracy(ref_v, ref_c,
+                                                       est_v, est_c),
+                    mir_eval.melody.raw_chroma_accuracy(ref_v, ref_c,
+                                                        est_v, est_c),
+                    mir_eval.melody.overall_accuracy(ref_v, ref_c,
+                                                     est_v, est_c)]
+        assert list(scores.keys()) == ['Voicing Recall',
+                                       'Voicing False Alarm',
+                                       'Raw Pitch Accuracy',
+                                       'Raw Chroma Accuracy',
+                                       'Overall Accuracy']
+        if dtype == np.float64:
+            # The fused computation must be exact
+            assert list(scores.values()) == expected
+        else:
+            assert np.allclose(list(scores.values()), expected, atol=1e-3)
+
+    for ref_f, est_f in zip(sorted(glob.glob(REF_GLOB)),
+                            sorted(glob.glob(EST_GLOB))):
+        ref_time, ref_freq = mir_eval.io.load_time_series(ref_f)
+        est_time, est_freq = mir_eval.io.load_time_series(est_f)
+        arrays = mir_eval.melody.to_cent_voicing(ref_time, ref_freq,
+                                                 est_time, est_freq)
+        for dtype in [np.float64, np.float32]:
+            yield (__test,) + arrays + (dtype,)
+
+    # Empty arrays give scores of 0
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        scores = mir_eval.melody.evaluate_cent_voicing(
+            np.array([]), np.array([]), np.array([]), np.array([]))
+    assert list(scores.values()) == [0.]*5
+
+
+def test_evaluate_batch():
+    ref_files = sorted(glob.glob(REF_GLOB))
+    est_files = sorted(glob.glob(EST_GLOB))
+    ref_time, ref_freq = mir_eval.io.load_time_series(ref_files[0])
+    est_times, est_freqs = zip(*[mir_eval.io.load_time_series(est_f)
+                                 for est_f in est_files])
+
+    def __test(est_times, est_freqs, kwargs):
+        scores = mir_eval.melody.evaluate_batch(ref_time, ref_freq,
+                                                est_times, est_freqs, **kwargs)
+        assert len(scores) == len(est_freqs)
+        if isinstance(est_times, np.ndarray):
+            est_times = [est_times]*len(est_freqs)
+        for est_time, est_freq, score in zip(est_times, est_freqs, scores):
+            expected = mir_eval.melody.evaluate(ref_time, ref_freq,
+                                                est_time, est_freq, **kwargs)
+            assert score == expected
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for kwargs in [{}, {'hop': .01}, {'kind': 'zero'}]:
+            # Ragged estimates with their own timebases
+            yield __test, est_times, est_freqs, kwargs
+            # Padded estimates sharing a timebase
+            yield (__test, est_times[0],
+                   np.array([est_freqs[0], -est_freqs[0],
+                             2*est_freqs[0]]), kwargs)
+    nose.tools.assert_raises(ValueError, mir_eval.melody.evaluate_batch,
+                             ref_time, ref_freq, est_times[:2], est_freqs)
+
+
+def test_evaluate_batch_warnings():
+    # Each estimate is validated, and warned about, as in evaluate
+    times = np.arange(10) * .01
+    voiced = np.full(10, 220.)
+    unvoiced = -voiced
+    for ref_freq, est_freq in [(voiced, unvoiced), (unvoiced, voiced)]:
+        with warnings.catch_warnings(record=True) as expected:
+            warnings.simplefilter('always')
+            mir_eval.melody.evaluate(times, ref_freq, times, est_freq)
+        with warnings.catch_warnings(record=True) as out:
+            warnings.simplefilter('always')
+            mir_eval.melody.evaluate_batch(times, ref_freq, times,
+                                           [est_freq, est_freq])
+        expected = [str(w.message) for w in expected]
+        assert len(expected) > 0
+        assert [str(w.message) for w in out] == 2 * expected
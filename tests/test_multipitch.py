@@ -169,6 +169,84 @@ def test_compute_num_true_positives():
     assert np.allclose(actual, expected, atol=A_TOL)
 
 
+def test_compute_num_true_positives_match_events():
+    # The frame-batched matching must agree with util.match_events
+    def __test(ref_freqs, est_freqs, window, chroma):
+        if chroma:
+            distance = mir_eval.util._outer_distance_mod_n
+        else:
+            distance = None
+        expected = [len(mir_eval.util.match_events(ref, est, window,
+                                                   distance=distance))
+                    for ref, est in zip(ref_freqs, est_freqs)]
+        actual = mir_eval.multipitch.compute_num_true_positives(
+            ref_freqs, est_freqs, window=window, chroma=chroma)
+        assert np.array_equal(actual, expected)
+
+    rng = np.random.RandomState(0)
+    for window in [0., .25, .5, 1., 7.]:
+        # Quantized values produce many ties and values exactly one window
+        # apart
+        ref_freqs = [np.round(4*rng.uniform(30, 90, rng.randint(0, 8)))/4
+                     for _ in range(300)]
+        est_freqs = [np.round(4*rng.uniform(30, 90, rng.randint(0, 8)))/4
+                     for _ in range(300)]
+        yield __test, ref_freqs, est_freqs, window, False
+        yield (__test, mir_eval.multipitch.midi_to_chroma(ref_freqs),
+               mir_eval.multipitch.midi_to_chroma(est_freqs), window, True)
+
+
+def test_flat_frequencies():
+    freqs = [
+        np.array([200.]),
+        np.array([]),
+        np.array([300., 400., 500.]),
+        np.array([300., 500.])
+    ]
+    flat = mir_eval.multipitch.flatten_frequencies(freqs)
+    assert np.allclose(flat.values, [200., 300., 400., 500., 300., 500.])
+    assert np.array_equal(flat.offsets, [0, 1, 1, 4, 6])
+    assert __frequencies_equal(
+        mir_eval.multipitch.unflatten_frequencies(flat), freqs)
+    # Conversions are no-ops on the target representation
+    assert mir_eval.multipitch.flatten_frequencies(flat) is flat
+    assert mir_eval.multipitch.unflatten_frequencies(freqs) is freqs
+    empty = mir_eval.multipitch.flatten_frequencies([])
+    assert mir_eval.multipitch.unflatten_frequencies(empty) == []
+
+    # All functions accept the flat representation and return it
+    assert np.array_equal(mir_eval.multipitch.compute_num_freqs(flat),
+                          [1, 0, 3, 2])
+    times = np.array([0.00, 0.01, 0.02, 0.03])
+    target_times = np.array([0.001, 0.002, 0.01, 0.029, 0.05])
+    for function, args in [
+            (mir_eval.multipitch.frequencies_to_midi, ()),
+            (mir_eval.multipitch.midi_to_chroma, ()),
+            (mir_eval.multipitch.resample_multipitch, (times, target_times))]:
+        if args:
+            expected = function(args[0], freqs, args[1])
+            actual = function(args[0], flat, args[1])
+        else:
+            expected = function(freqs)
+            actual = function(flat)
+        assert isinstance(actual, mir_eval.multipitch.FlatFrequencies)
+        assert __frequencies_equal(
+            mir_eval.multipitch.unflatten_frequencies(actual), expected)
+
+
+def test_metrics_flat():
+    ref_time, ref_freqs = mir_eval.io.load_ragged_time_series(
+        sorted(glob.glob(REF_GLOB))[0])
+    est_time, est_freqs = mir_eval.io.load_ragged_time_series(
+        sorted(glob.glob(EST_GLOB))[0])
+    expected = mir_eval.multipitch.metrics(ref_time, ref_freqs,
+                                           est_time, est_freqs)
+    actual = mir_eval.multipitch.metrics(
+        ref_time, mir_eval.multipitch.flatten_frequencies(ref_freqs),
+        est_time, mir_eval.multipitch.flatten_frequencies(est_freqs))
+    assert actual == expected
+
+
 def test_accuracy_metrics():
     true_positives = np.array([1, 0, 0, 3, 2])
     n_ref = np.array([2, 0, 1, 3, 2])
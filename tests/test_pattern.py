@@ -79,3 +79,51 @@ def test_pattern_functions():
             # This is a simple hack to make nosetest's messages more useful
             yield (__check_score, sco_f, metric, scores[metric],
                    expected_scores[metric])
+
+
+def test_intersection_counts():
+    # Bulk intersection sizes must match the set-based intersections,
+    # including duplicated (onset, midi) pairs and int/float/-0. values
+    reference_patterns = [[[(0, 60), (1, 62), (1, 62), (2., 64)],
+                           [(4, 60), (5, 62)]],
+                          [[(-0., 60), (1.5, 61)]]]
+    estimated_patterns = [[[(0., 60.), (1, 62)], [(5, 62), (6, 63)]],
+                          [[(1.5, 61), (2, 64), (4, 60), (0, 61)]],
+                          [[(7, 70)]]]
+    (counts, ref_lengths, est_lengths,
+     ref_bounds, est_bounds) = mir_eval.pattern._intersection_counts(
+         reference_patterns, estimated_patterns)
+    ref_occs = [occ for pattern in reference_patterns for occ in pattern]
+    est_occs = [occ for pattern in estimated_patterns for occ in pattern]
+    expected = [[len(set(map(tuple, occ_P)) & set(map(tuple, occ_Q)))
+                 for occ_Q in est_occs] for occ_P in ref_occs]
+    assert np.array_equal(counts, expected)
+    assert np.array_equal(ref_lengths, [len(occ) for occ in ref_occs])
+    assert np.array_equal(est_lengths, [len(occ) for occ in est_occs])
+    assert np.array_equal(ref_bounds, [0, 2, 3])
+    assert np.array_equal(est_bounds, [0, 2, 3, 4])
+
+
+def test_evaluate_shared_scores():
+    # evaluate derives all metrics from shared scores, which must give the
+    # same results as the individual metric functions
+    reference_patterns = mir_eval.io.load_patterns(sorted(glob.glob(
+        REF_GLOB))[0])
+    estimated_patterns = mir_eval.io.load_patterns(sorted(glob.glob(
+        EST_GLOB))[0])
+    for n in [1, 2, 100]:
+        scores = mir_eval.pattern.evaluate(reference_patterns,
+                                           estimated_patterns, n=n)
+        assert scores['FFP'] == mir_eval.pattern.first_n_three_layer_P(
+            reference_patterns, estimated_patterns, n=n)
+        assert scores['FFTP_est'] == \
+            mir_eval.pattern.first_n_target_proportion_R(
+                reference_patterns, estimated_patterns, n=n)
+        assert (scores['F_3'], scores['P_3'], scores['R_3']) == \
+            mir_eval.pattern.three_layer_FPR(reference_patterns,
+                                             estimated_patterns)
+        # The first n scores are those of the first n estimated patterns
+        assert scores['FFP'] == mir_eval.pattern.three_layer_FPR(
+            reference_patterns, estimated_patterns[:n])[1]
+        assert scores['FFTP_est'] == mir_eval.pattern.establishment_FPR(
+            reference_patterns, estimated_patterns[:n])[2]
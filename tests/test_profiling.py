@@ -0,0 +1,62 @@
+'''
+Tests for mir_eval.profiling
+'''
+
+import glob
+import json
+
+import numpy as np
+import nose.tools
+import mir_eval
+
+A_TOL = 1e-12
+
+# Path to the fixture files
+REF_GLOB = 'data/beat/ref*.txt'
+EST_GLOB = 'data/beat/est*.txt'
+
+
+def test_profiler():
+    reference_beats = mir_eval.io.load_events(sorted(glob.glob(REF_GLOB))[0])
+    estimated_beats = mir_eval.io.load_events(sorted(glob.glob(EST_GLOB))[0])
+    expected_scores = mir_eval.beat.evaluate(reference_beats, estimated_beats)
+    original = mir_eval.beat.f_measure
+
+    events = []
+    with mir_eval.profiling.Profiler(callback=events.append) as profiler:
+        assert mir_eval.beat.f_measure is not original
+        scores = mir_eval.beat.evaluate(reference_beats, estimated_beats,
+                                        f_measure_threshold=.07)
+    # The original functions are restored
+    assert mir_eval.beat.f_measure is original
+
+    # Instrumentation doesn't change the scores
+    for metric in expected_scores:
+        assert np.allclose(scores[metric], expected_scores[metric],
+                           atol=A_TOL)
+
+    stats = profiler.to_dict()
+    functions = stats['functions']
+    assert functions['mir_eval.beat.evaluate']['calls'] == 1
+    assert functions['mir_eval.beat.evaluate']['stage'] == 'evaluate'
+    assert functions['mir_eval.beat.f_measure']['calls'] == 1
+    assert functions['mir_eval.beat.f_measure']['stage'] == 'scoring'
+    assert functions['mir_eval.beat.validate']['stage'] == 'validation'
+    assert functions['mir_eval.util.match_events']['stage'] == 'matching'
+    # Total time includes nested calls, self time doesn't
+    evaluate_stats = functions['mir_eval.beat.evaluate']
+    assert evaluate_stats['self_time'] <= evaluate_stats['time']
+    assert (sum(s['self_time'] for s in stats['stages'].values()) <=
+            evaluate_stats['time'] + 1e-6)
+    assert len(events) == sum(f['calls'] for f in functions.values())
+
+    trace = profiler.to_chrome_trace()
+    assert len(trace['traceEvents']) == len(events)
+    # Must be JSON-serializable
+    json.dumps(trace)
+
+
+def test_profiler_nesting():
+    with mir_eval.profiling.Profiler():
+        nose.tools.assert_raises(RuntimeError,
+                                 mir_eval.profiling.Profiler().start)
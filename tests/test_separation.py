@@ -8,12 +8,19 @@ from mir_eval numerically match.
 
 import numpy as np
 import mir_eval
+import collections
 import glob
+import itertools
 import nose.tools
 import json
 import os
 import warnings
 
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
 A_TOL = 1e-2
 
 REF_GLOB = 'data/separation/ref*'
@@ -336,3 +343,204 @@ def test_separation_functions():
     image_scores = mir_eval.separation.evaluate(ref_images, est_images)
     # make sure sources is not being evaluated on images
     assert 'Sources - Source to Distortion' not in image_scores
+
+
+def test_best_permutation():
+    # The assignment matches the exhaustive search of the best mean SIR,
+    # including ties, which go to the first permutation
+    rng = np.random.RandomState(0)
+    for nsrc in range(1, 6):
+        for sir in [10 * rng.randn(nsrc, nsrc),
+                    rng.randint(-2, 3, (nsrc, nsrc)).astype(float),
+                    np.ones((nsrc, nsrc)),
+                    np.where(np.eye(nsrc), np.inf, 0.)]:
+            perms = list(itertools.permutations(range(nsrc)))
+            mean_sir = [np.mean(sir[perm, np.arange(nsrc)])
+                        for perm in perms]
+            assert np.array_equal(
+                mir_eval.separation._best_permutation(sir),
+                perms[np.argmax(mean_sir)])
+
+
+def test_best_permutation_infinite():
+    # Non-finite SIRs select the same ordering as the exhaustive search
+    rng = np.random.RandomState(0)
+    for nsrc in range(1, 6):
+        for _ in range(200):
+            sir = np.round(3 * rng.randn(nsrc, nsrc))
+            mask = rng.rand(nsrc, nsrc)
+            sir[mask < .15] = np.inf
+            sir[(mask >= .15) & (mask < .3)] = -np.inf
+            sir[(mask >= .3) & (mask < .35)] = np.nan
+            perms = list(itertools.permutations(range(nsrc)))
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                mean_sir = [np.mean(sir[perm, np.arange(nsrc)])
+                            for perm in perms]
+            assert np.array_equal(
+                mir_eval.separation._best_permutation(sir),
+                perms[np.argmax(mean_sir)])
+    # Without an exhaustive search, even for many sources: the first ordering
+    # including the infinite SIR is returned
+    nsrc = 20
+    sir = 10 * rng.randn(nsrc, nsrc)
+    sir[3, 5] = np.inf
+    assert np.array_equal(mir_eval.separation._best_permutation(sir),
+                          [0, 1, 2, 4, 5, 3] + list(range(6, nsrc)))
+
+
+def test_bss_decomp_mtifilt():
+    # Decomposing all the estimates together gives the same components as
+    # decomposing each one on its own, and the components sum to the estimate
+    rng = np.random.RandomState(0)
+    reference_sources = rng.randn(3, 2, 1000)
+    estimated_sources = (reference_sources[::-1] +
+                         .1 * rng.randn(*reference_sources.shape))
+    pairs = list(itertools.product(range(3), repeat=2))
+    decomposition = mir_eval.separation._bss_decomp_mtifilt(
+        reference_sources, estimated_sources, pairs, 32)
+    for k, components in decomposition:
+        jest, jtrue = pairs[k]
+        _, single = next(mir_eval.separation._bss_decomp_mtifilt(
+            reference_sources, estimated_sources[jest:jest + 1],
+            [(0, jtrue)], 32))
+        for component, expected in zip(components, single):
+            assert np.allclose(component, expected)
+        assert np.allclose(np.sum(components, axis=0)[:, :1000],
+                           estimated_sources[jest])
+        assert np.allclose(np.sum(components, axis=0)[:, 1000:], 0)
+
+    # The block-wise decomposition gives the same components, block by block
+    for block_size in [20, 100, 2000]:
+        blocks = collections.defaultdict(list)
+        for k, components in mir_eval.separation._bss_decomp_mtifilt_blocks(
+                reference_sources, estimated_sources, pairs, 32, block_size):
+            blocks[k].append(components)
+        for k, components in mir_eval.separation._bss_decomp_mtifilt(
+                reference_sources, estimated_sources, pairs, 32):
+            for n, component in enumerate(components):
+                blockwise = np.hstack([block[n] for block in blocks[k]])
+                assert np.allclose(blockwise[:, :1031], component)
+                assert np.allclose(blockwise[:, 1031:], 0)
+
+
+def test_bss_eval_images_blocks():
+    rng = np.random.RandomState(0)
+    reference_sources = rng.randn(2, 3000, 2)
+    estimated_sources = (reference_sources[::-1] +
+                         .1 * rng.randn(*reference_sources.shape))
+    for compute_permutation in [True, False]:
+        expected = mir_eval.separation.bss_eval_images(
+            reference_sources, estimated_sources, compute_permutation)
+        scores = mir_eval.separation.bss_eval_images(
+            reference_sources, estimated_sources, compute_permutation,
+            block_size=1000)
+        for score, expected_score in zip(scores, expected):
+            assert np.allclose(score, expected_score)
+
+
+def test_single_precision():
+    rng = np.random.RandomState(0)
+    reference_sources = rng.randn(2, 8000)
+    estimated_sources = (reference_sources[::-1] +
+                         .1 * rng.randn(*reference_sources.shape))
+    for metric, ref, est in [
+            (mir_eval.separation.bss_eval_sources,
+             reference_sources, estimated_sources),
+            (mir_eval.separation.bss_eval_images,
+             np.dstack([reference_sources, reference_sources[:, ::-1]]),
+             np.dstack([estimated_sources, estimated_sources[:, ::-1]]))]:
+        expected = metric(ref, est)
+        scores = metric(ref, est, dtype=np.float32)
+        for score, expected_score in zip(scores, expected):
+            assert score.dtype == expected_score.dtype
+            assert np.allclose(score, expected_score, atol=.05)
+        # The inputs are left untouched
+        assert ref.dtype == est.dtype == np.float64
+
+
+def test_filter_length():
+    rng = np.random.RandomState(0)
+    reference_sources = rng.randn(2, 4000)
+    # The estimates are delayed by 10 samples, which only filters of more
+    # than 10 coefficients can model, leaving the truncated ends as artifacts
+    estimated_sources = np.zeros_like(reference_sources)
+    estimated_sources[:, 10:] = reference_sources[:, :-10]
+    for metric in [mir_eval.separation.bss_eval_sources,
+                   mir_eval.separation.bss_eval_images]:
+        sar_short = metric(reference_sources, estimated_sources, flen=8)[-2]
+        sar_long = metric(reference_sources, estimated_sources, flen=16)[-2]
+        assert np.all(sar_short < 0)
+        assert np.all(sar_long > 20)
+    sar = mir_eval.separation.bss_eval_images_framewise(
+        reference_sources, estimated_sources, window=1000, hop=1000,
+        flen=16, block_size=512)[-2]
+    assert sar.shape == (2, 4) and np.all(sar > 15)
+
+    # The filter length must be a positive integer no larger than the signals
+    # or windows
+    reference_sources = reference_sources[:, :300]
+    estimated_sources = estimated_sources[:, :300]
+    for metric in [mir_eval.separation.bss_eval_sources,
+                   mir_eval.separation.bss_eval_sources_framewise,
+                   mir_eval.separation.bss_eval_images,
+                   mir_eval.separation.bss_eval_images_framewise]:
+        for flen in [0, -8, 16., 301]:
+            nose.tools.assert_raises(ValueError, metric, reference_sources,
+                                     estimated_sources, flen=flen)
+        metric(reference_sources, estimated_sources, flen=np.int64(300))
+    # A filter longer than the windows fails before evaluating any window
+    for metric, name in [
+            (mir_eval.separation.bss_eval_sources_framewise,
+             'bss_eval_sources'),
+            (mir_eval.separation.bss_eval_images_framewise,
+             'bss_eval_images')]:
+        evaluate_window = getattr(mir_eval.separation, name)
+
+        def unexpected(*args, **kwargs):
+            raise AssertionError('A window was evaluated')
+
+        setattr(mir_eval.separation, name, unexpected)
+        try:
+            nose.tools.assert_raises(
+                ValueError, metric, reference_sources, estimated_sources,
+                window=100, hop=100, flen=101)
+        finally:
+            setattr(mir_eval.separation, name, evaluate_window)
+
+
+def test_bss_eval_cost():
+    cost = mir_eval.separation.bss_eval_cost
+    # The estimated memory is close to the measured one
+    if tracemalloc is not None:
+        rng = np.random.RandomState(0)
+        reference_sources = rng.randn(3, 20000, 2)
+        estimated_sources = reference_sources + .1 * rng.randn(3, 20000, 2)
+        for kwargs in [{}, {'block_size': 4096}, {'flen': 256},
+                       {'dtype': np.float32}]:
+            tracemalloc.start()
+            mir_eval.separation.bss_eval_images(reference_sources,
+                                                estimated_sources, **kwargs)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert .5 < cost(3, 2, 20000, **kwargs)[0] / float(peak) < 2
+
+    # The cost grows with the filter length and the number of pairs
+    assert np.all(np.less(cost(2, 1, 44100, flen=256), cost(2, 1, 44100)))
+    assert (cost(4, 1, 44100, compute_permutation=False)[1] <
+            cost(4, 1, 44100)[1])
+    # Blocks bound the memory of long signals
+    assert (cost(2, 2, 44100 * 600, block_size=8192)[0] <
+            cost(2, 2, 44100 * 600)[0] / 10)
+    # Windows are evaluated one after the other
+    memory, time = cost(2, 1, 44100, window=4410, hop=4410)
+    assert memory == cost(2, 1, 4410)[0]
+    assert np.isclose(time, 10 * cost(2, 1, 4410)[1])
+    # Unless there is a single one
+    assert cost(2, 1, 44100, window=44100, hop=22050) == cost(2, 1, 44100)
+    # The filter length is resolved and checked as by the metrics
+    assert cost(2, 1, 10000, flen=None) == cost(2, 1, 10000, flen=512)
+    for flen in [0, 16., 10001]:
+        nose.tools.assert_raises(ValueError, cost, 2, 1, 10000, flen=flen)
+    nose.tools.assert_raises(ValueError, cost, 2, 1, 10000, flen=1001,
+                             window=1000, hop=1000)
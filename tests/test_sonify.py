@@ -1,8 +1,13 @@
 """ Unit tests for sonification methods """
 
+import io
+
 import mir_eval
+import nose.tools
 import numpy as np
 import scipy
+import scipy.io.wavfile
+import scipy.ndimage
 
 
 def test_clicks():
@@ -18,6 +23,37 @@ def test_clicks():
             assert len(click_signal) == times.max()*fs + 1000 + 1
 
 
+def test_clicks_overlap():
+    fs = 10
+    times = np.array([0., .2, .3, 1.])
+    for click in [np.arange(1., 6.), np.arange(1., 101.)]:
+        n = len(click)
+        # Later clicks overwrite earlier ones
+        expected = np.zeros(10 + n + 1)
+        for start in [0, 2, 3, 10]:
+            expected[start:start + n] = click
+        click_signal = mir_eval.sonify.clicks(times, fs, click=click)
+        assert np.allclose(click_signal, expected)
+        # Unless they are out of order
+        click_signal = mir_eval.sonify.clicks(times[::-1], fs, click=click)
+        assert np.allclose(click_signal[:n], click)
+        # Overlapping clicks are summed
+        expected = np.zeros(10 + n + 1)
+        for start in [0, 2, 3, 10]:
+            expected[start:start + n] += click
+        for order in [slice(None), slice(None, None, -1)]:
+            click_signal = mir_eval.sonify.clicks(times[order], fs,
+                                                  click=click, overlap='sum')
+            assert np.allclose(click_signal, expected)
+        # Clicks are placed up to the first one reaching the end of the
+        # signal, which is truncated
+        click_signal = mir_eval.sonify.clicks(times, fs, click=click,
+                                              length=4, overlap='sum')
+        assert np.allclose(click_signal, click[:4])
+    nose.tools.assert_raises(ValueError, mir_eval.sonify.clicks, times, fs,
+                             overlap='max')
+
+
 def test_time_frequency():
     # Test length for different inputs
     for fs in [8000, 44100]:
@@ -31,6 +67,31 @@ def test_time_frequency():
         assert len(signal) == 11*fs
 
 
+def test_time_frequency_values():
+    # A single column sonifies as a pure (normalized) tone
+    fs = 8000
+    signal = mir_eval.sonify.time_frequency(
+        np.ones((1, 1)), np.array([440.]), np.array([0., 1.]), fs)
+    assert np.allclose(signal, np.sin(2*np.pi*440*np.arange(fs)/fs))
+
+    # Magnitudes are interpolated between the column centers
+    gram = np.array([[1., 0., 2.], [0., 0., 0.]])
+    signal = mir_eval.sonify.time_frequency(
+        gram, np.array([100., 300.]), np.array([0., 1., 2., 3.]), fs)
+    t = np.arange(3*fs)
+    envelope = np.interp(t, fs*np.array([.5, 1.5, 2.5]), gram[0],
+                         left=0, right=0)
+    expected = envelope * np.sin(2*np.pi*100*t/fs)
+    assert np.allclose(signal, expected / np.abs(expected).max())
+
+    # Single precision output
+    signal32 = mir_eval.sonify.time_frequency(
+        gram, np.array([100., 300.]), np.array([0., 1., 2., 3.]), fs,
+        dtype=np.float32)
+    assert signal32.dtype == np.float32
+    assert np.allclose(signal32, signal, atol=1e-5)
+
+
 def test_chroma():
     for fs in [8000, 44100]:
         signal = mir_eval.sonify.chroma(
@@ -102,3 +163,68 @@ def test_pitch_contour():
                                       amplitudes=amps)
     assert len(x) == fs * 7
     assert np.allclose(x[0], 0)
+
+
+def test_iter_blocks():
+    # Blocks concatenate to the signal of the non-streaming functions
+    fs = 8000
+    times = np.array([.1, .5, .55, 1.2])
+    intervals = np.array([np.arange(5), np.arange(1, 6)]).T * .3
+    labels = ['C', 'A:min', 'N', 'G:7', 'D:min7']
+    contour_times = np.linspace(0, 1, 100)
+    contour = 220 * 2**np.sin(contour_times * 10)
+    chromagram = np.random.random_sample((12, 50))
+    chroma_times = np.linspace(0, 2, 50)
+    for block_size in [1000, 4096, 100000]:
+        for full, blocks in [
+                (mir_eval.sonify.clicks(times, fs),
+                 mir_eval.sonify.iter_clicks(times, fs,
+                                             block_size=block_size)),
+                (mir_eval.sonify.pitch_contour(contour_times, contour, fs),
+                 mir_eval.sonify.iter_pitch_contour(contour_times, contour, fs,
+                                                    block_size=block_size)),
+                (mir_eval.sonify.chroma(chromagram, chroma_times, fs),
+                 mir_eval.sonify.iter_chroma(chromagram, chroma_times, fs,
+                                             block_size=block_size)),
+                (mir_eval.sonify.chords(labels, intervals, fs),
+                 mir_eval.sonify.iter_chords(labels, intervals, fs,
+                                             block_size=block_size))]:
+            blocks = list(blocks)
+            assert all(len(block) == block_size for block in blocks[:-1])
+            assert np.allclose(np.concatenate(blocks), full)
+
+    # Without normalization, blocks are only scaled
+    full = mir_eval.sonify.chords(labels, intervals, fs)
+    signal = np.concatenate(list(mir_eval.sonify.iter_chords(
+        labels, intervals, fs, normalize=False, block_size=1000)))
+    assert np.allclose(signal / np.abs(signal).max(), full)
+
+
+def test_write():
+    fs = 8000
+    intervals = np.array([np.arange(5), np.arange(1, 6)]).T * .3
+    labels = ['C', 'A:min', 'N', 'G:7', 'D:min7']
+    full = mir_eval.sonify.chords(labels, intervals, fs)
+
+    wav_file = io.BytesIO()
+    n_samples = mir_eval.sonify.write_wav(
+        wav_file, mir_eval.sonify.iter_chords(labels, intervals, fs), fs)
+    assert n_samples == len(full)
+    wav_file.seek(0)
+    rate, signal = scipy.io.wavfile.read(wav_file)
+    assert rate == fs
+    assert np.allclose(signal / 32767., full, atol=1e-4)
+
+    raw_file = io.BytesIO()
+    mir_eval.sonify.write_raw(
+        raw_file, mir_eval.sonify.iter_chords(labels, intervals, fs))
+    assert np.allclose(np.frombuffer(raw_file.getvalue(), dtype=np.float32),
+                       full, atol=1e-6)
+
+    buffer = np.zeros(len(full))
+    mir_eval.sonify.write_raw(
+        buffer, mir_eval.sonify.iter_chords(labels, intervals, fs))
+    assert np.allclose(buffer, full)
+    nose.tools.assert_raises(
+        ValueError, mir_eval.sonify.write_raw, buffer[:-1],
+        mir_eval.sonify.iter_chords(labels, intervals, fs))
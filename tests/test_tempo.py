@@ -88,3 +88,46 @@ def test_tempo_regression():
         for metric in scores:
             yield (__check_score, sco_f, metric, scores[metric],
                    expected_scores[metric])
+
+
+def test_detection_batch():
+    rng = np.random.RandomState(0)
+    reference_tempi = np.sort(rng.uniform(60, 180, (1000, 2)), axis=1)
+    estimated_tempi = reference_tempi * rng.choice(
+        [.5, 1., 1.02, 1.08, 1.1, 2., 3.], (1000, 2))
+    reference_weights = rng.rand(1000)
+    for tol in [0.04, 0.08, 1.]:
+        scores = mir_eval.tempo.detection_batch(
+            reference_tempi, reference_weights, estimated_tempi, tol=tol)
+        # Scores match the per-track scores
+        expected_scores = np.array([
+            mir_eval.tempo.detection(ref, weight, est, tol=tol)
+            for ref, weight, est in zip(reference_tempi, reference_weights,
+                                        estimated_tempi)]).T
+        for score, expected_score in zip(scores, expected_scores):
+            assert np.array_equal(score, expected_score)
+
+
+def test_detection_batch_fail():
+
+    @raises(ValueError)
+    def __test(ref, weight, est, tol):
+        mir_eval.tempo.detection_batch(ref, weight, est, tol=tol)
+
+    good_ref = np.array([[60, 120], [70, 140]])
+    good_weight = np.array([0.5, 0.2])
+    good_est = np.array([[120, 180], [70, 71]])
+    good_tol = 0.08
+
+    for bad_tempo in [np.array([[-1, 50], [60, 120]]),
+                      np.array([[0, 1, 2], [1, 2, 3]]), np.array([60, 120]),
+                      np.array([[60, 120]])]:
+        yield __test, bad_tempo, good_weight, good_est, good_tol
+        yield __test, good_ref, good_weight, bad_tempo, good_tol
+
+    for bad_weight in [np.array([-1, .5]), np.array([.5, 1.5]),
+                       np.array([.5])]:
+        yield __test, good_ref, bad_weight, good_est, good_tol
+
+    for bad_tol in [-1, 1.5]:
+        yield __test, good_ref, good_weight, good_est, bad_tol
@@ -2,6 +2,7 @@
 '''
 
 import collections
+import itertools
 
 import numpy as np
 import nose.tools
@@ -31,6 +32,26 @@ def test_interpolate_intervals_gap():
             expected_ans)
 
 
+def test_interpolate_intervals_index():
+    """Check that the index mode indexes the interpolated labels."""
+    labels = ['b', 'A', 'c', 'a']
+    intervals = np.array([[0.5, 1.0], [1.5, 2.0], [2.5, 3.0], [3.0, 3.5]])
+    # Points on shared boundaries get the last interval, in order or not
+    for (intervals_, labels_), time_points in itertools.product(
+            [(intervals, labels), (intervals[::-1], labels[::-1])],
+            [[0.0, 0.75, 1.25, 1.75, 2.25, 2.75, 3.25],
+             [0.75, 1.75, 3.25], [0.0, 3.6], [1.0, 3.0, 3.0, 3.5], []]):
+        aligned_labels = util.interpolate_intervals(intervals_, labels_,
+                                                    time_points, 'N')
+        indices, index_to_label = util.interpolate_intervals(
+            intervals_, labels_, time_points, 'N', return_index=True)
+        assert isinstance(indices, np.ndarray)
+        expected_indices, expected_index_to_label = util.index_labels(
+            aligned_labels)
+        assert np.array_equal(indices, expected_indices)
+        assert index_to_label == expected_index_to_label
+
+
 @nose.tools.raises(ValueError)
 def test_interpolate_intervals_badtime():
     """Check that interpolate_intervals throws an exception if
@@ -42,6 +63,22 @@ def test_interpolate_intervals_badtime():
     mir_eval.util.interpolate_intervals(intervals, labels, time_points)
 
 
+def test_index_labels():
+    labels = ['b', 'A', 'c', 'a', None, 'B']
+    indices, index_to_label = util.index_labels(labels)
+    assert isinstance(indices, np.ndarray)
+    assert indices.tolist() == [1, 0, 2, 0, 3, 1]
+    assert index_to_label == {0: 'a', 1: 'b', 2: 'c', 3: 'none'}
+
+    indices, index_to_label = util.index_labels(labels[:4],
+                                                case_sensitive=True)
+    assert indices.tolist() == [2, 0, 3, 1]
+    assert index_to_label == {0: 'A', 1: 'a', 2: 'b', 3: 'c'}
+
+    indices, index_to_label = util.index_labels([])
+    assert len(indices) == 0 and index_to_label == {}
+
+
 def test_intervals_to_samples():
     """Check that an interval set is sampled properly, with boundaries
     conditions and out-of-range values.
@@ -63,6 +100,13 @@ def test_intervals_to_samples():
     assert result[0] == expected_times
     assert result[1] == expected_labels
 
+    times, indices, index_to_label = util.intervals_to_samples(
+        intervals, labels, offset=0.25, sample_size=0.5, fill_value='N',
+        return_index=True)
+    assert np.allclose(times, expected_times)
+    assert indices.tolist() == [0, 0, 1, 1, 2, 2]
+    assert index_to_label == {0: 'a', 1: 'b', 2: 'c'}
+
 
 def test_intersect_files():
     """Check that two non-identical yield correct results.
@@ -109,6 +153,14 @@ def test_merge_labeled_intervals():
     assert new_y_labels == expected_y_labels
     assert new_intvs.tolist() == expected_intvs
 
+    # Each merged interval takes the label of the last interval starting at
+    # or before it, even if the intervals are not sorted
+    new_intvs, new_x_labels, new_y_labels = util.merge_labeled_intervals(
+        x_intvs[[0, 2, 1, 3]], ['A', 'C', 'B', 'D'], y_intvs, y_labels)
+    assert new_x_labels == ['A', 'B', 'B', 'B', 'B', 'D', 'D']
+    assert new_y_labels == expected_y_labels
+    assert new_intvs.tolist() == expected_intvs
+
     # Check that invalid inputs raise a ValueError
     y_intvs[-1, -1] = 10.0
     nose.tools.assert_raises(ValueError, util.merge_labeled_intervals, x_intvs,
@@ -338,3 +390,79 @@ def test_sort_labeled_intervals():
     yield __test, x1, x1_true
     yield __test_labeled, x1_true, labels_true, x1_true, labels_true
     yield __test, x1_true, x1_true
+
+
+def test_validation_contexts():
+    calls = []
+
+    @mir_eval.util.validator
+    def validate(values):
+        calls.append(values)
+        if (values < 0).any():
+            raise ValueError('Negative values')
+
+    values = np.arange(3)
+    other_values = np.arange(3)
+
+    # By default, the inputs are validated on every call
+    validate(values)
+    validate(values)
+    assert len(calls) == 2
+
+    # Within validate_once, only once for the same objects
+    del calls[:]
+    with mir_eval.util.validate_once():
+        validate(values)
+        validate(values)
+        validate(other_values)
+        # Nested contexts share the validated inputs
+        with mir_eval.util.validate_once():
+            validate(values)
+        nose.tools.assert_raises(ValueError, validate, -values)
+    assert len(calls) == 3
+    validate(values)
+    assert len(calls) == 4
+
+    # Within trusted_inputs, never
+    del calls[:]
+    with mir_eval.util.trusted_inputs():
+        validate(-values)
+        with mir_eval.util.validate_once():
+            validate(-values)
+    assert calls == []
+
+    # Both can decorate functions
+    @mir_eval.util.validate_once()
+    def metric(values):
+        validate(values)
+        validate(values)
+    metric(values)
+    assert len(calls) == 1
+    nose.tools.assert_raises(ValueError, metric, -values)
+    mir_eval.util.trusted_inputs()(metric)(-values)
+
+
+def test_evaluate_validates_once():
+    # The evaluate functions validate their inputs once, but still raise
+    # errors on invalid inputs
+    calls = []
+    validate = mir_eval.beat.validate
+
+    @mir_eval.util.validator
+    def counting_validate(*args):
+        calls.append(args)
+        validate(*args)
+
+    reference_beats = np.arange(10, 20, .5)
+    estimated_beats = reference_beats + .01
+    mir_eval.beat.validate = counting_validate
+    try:
+        mir_eval.beat.evaluate(reference_beats, estimated_beats)
+        assert len(calls) == 1
+        mir_eval.beat.f_measure(reference_beats, estimated_beats)
+        mir_eval.beat.f_measure(reference_beats, estimated_beats)
+        assert len(calls) == 3
+    finally:
+        mir_eval.beat.validate = validate
+    nose.tools.assert_raises(ValueError, mir_eval.beat.evaluate,
+                             reference_beats[::-1], estimated_beats)